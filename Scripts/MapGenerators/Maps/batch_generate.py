@@ -0,0 +1,54 @@
+r"""
+Batch Map Generator - Entry Point
+Generates several maps inside ONE editor session, so the 2-3 minute editor startup is paid once.
+
+Each map's generate/ folder is imported in turn (see map_job.py for how the maps
+are kept isolated from each other).
+
+Usage:
+    Command Line:
+        "D:\UnrealEngine570\Engine\Binaries\Win64\UnrealEditor-Cmd.exe" ^
+          "D:\001xm\shijiewuxian\shijiewuxian.uproject" ^
+          -ExecCmds="py D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/batch_generate.py cosmos_002_training_world other_map" ^
+          -stdout -unattended -nopause -nosplash
+    
+    Launcher:
+        python Tools/launch_generator/batch_main.py cosmos_002_training_world other_map
+
+Markers (parsed by launch_generator/trace_parser.py to attribute results per map):
+    [CHECKPOINT:line:timestamp] BATCH_MAP_START:<map>
+    [CHECKPOINT:line:timestamp] BATCH_MAP_END:<map>:<success|error>
+    [CHECKPOINT:line:timestamp] BATCH_COMPLETE:<succeeded>/<total>
+
+The maps' result manifests are written after BATCH_COMPLETE: the launcher stops UE5
+as soon as they all exist.
+"""
+
+import sys
+from pathlib import Path
+
+# Shared helpers live next to this script (UE5 does not add the script folder to sys.path)
+sys.path.insert(0, str(Path(__file__).parent.resolve()))
+
+from map_job import log_marker, run_marked_map, write_results
+
+
+def main(map_names):
+    """Generate every map in map_names within this editor session"""
+    print("="*60)
+    print(f"BATCH MAP GENERATOR: {len(map_names)} map(s)")
+    print("="*60, flush=True)
+    
+    succeeded = 0
+    for map_name in map_names:
+        if run_marked_map(map_name) == 0:
+            succeeded += 1
+    
+    log_marker(f"BATCH_COMPLETE:{succeeded}/{len(map_names)}")
+    write_results()
+    return 0 if succeeded == len(map_names) else 1
+
+
+# Always run when this script is executed
+# (UE5's -ExecCmds doesn't set __name__ to "__main__"; `py script.py a b` sets sys.argv)
+exit(main(sys.argv[1:]))
@@ -0,0 +1,129 @@
+"""
+Microbenchmark for trace.log_auto (runs outside UE5 with a mock unreal module)
+Compares the cached fast path, unbuffered and buffered, with the previous
+implementation (inspect.currentframe + filename split + keyword scan on every call).
+
+Usage:
+    python bench_trace.py [-n 100000] [--sink file|null]
+"""
+
+import argparse
+import inspect
+import sys
+import os
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Mock unreal module (no-op log calls: only the tracing overhead is measured)
+class MockUnreal:
+    @staticmethod
+    def log(msg):
+        pass
+    
+    @staticmethod
+    def log_warning(msg):
+        pass
+
+sys.modules['unreal'] = MockUnreal()
+
+import trace
+from trace import log_auto, infer_status, VALID_STATUSES
+
+_start_time = time.time()
+
+
+class NullOutput:
+    """stdout replacement - print/flush cost without terminal I/O"""
+    
+    def write(self, text):
+        return len(text)
+    
+    def flush(self):
+        pass
+
+
+def log_auto_inspect(context="", status=None):
+    """log_auto as it was before the caches (reference for the benchmark)"""
+    frame = inspect.currentframe().f_back
+    filename = frame.f_code.co_filename
+    module_name = filename.split('/')[-1].split('\\')[-1].replace('.py', '')
+    line_num = frame.f_lineno
+    elapsed_ms = int((time.time() - _start_time) * 1000)
+    if status is not None:
+        if status not in VALID_STATUSES:
+            warning_msg = f"Invalid status '{status}', defaulting to 'info'"
+            trace.unreal.log_warning(warning_msg)
+            print(f"WARNING: {warning_msg}", flush=True)
+            status = "info"
+    else:
+        status = infer_status(context)
+    marker = f"[TRACE:{module_name}:{line_num}:{elapsed_ms}:{status}]"
+    if context:
+        marker += f" {context}"
+    trace.unreal.log(marker)
+    print(marker, flush=True)
+
+
+# Mix of generate/ call sites: fixed contexts plus one per-actor f-string
+CONTEXTS = ["开始准备Level", "地图加载成功", "警告：获取World设置失败", "步骤2: 构建训练室", "创建墙壁"]
+
+
+def place_actors(log, count):
+    """Simulated per-actor generation loop"""
+    for i in range(count):
+        log(CONTEXTS[i % len(CONTEXTS)])
+        if i % 10 == 0:
+            log(f"放置成功: Wall_{i}")
+
+
+def measure(log, count, output):
+    """
+    Returns:
+        float: Microseconds per log call (buffered markers written before the clock stops)
+    """
+    calls = count + (count + 9) // 10
+    stdout = sys.stdout
+    sys.stdout = output
+    try:
+        start = time.perf_counter()
+        place_actors(log, count)
+        trace.flush_trace()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+    return elapsed / calls * 1e6
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    parser = argparse.ArgumentParser(description="log_auto microbenchmark")
+    parser.add_argument('-n', '--count', type=int, default=100000, help="Simulated actors (default: 100000)")
+    parser.add_argument('--sink', choices=['file', 'null'], default='file',
+                        help="stdout target: a real file (every flush is a write call) or a no-op writer")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    
+    with tempfile.TemporaryFile('w', encoding='utf-8') as sink:
+        output = sink if args.sink == 'file' else NullOutput()
+        
+        # Warm up both paths (caches, allocator)
+        measure(log_auto_inspect, 1000, output)
+        measure(log_auto, 1000, output)
+        
+        before = measure(log_auto_inspect, args.count, output)
+        trace.TRACE_BUFFERED = False
+        cached = measure(log_auto, args.count, output)
+        trace.TRACE_BUFFERED = True
+        buffered = measure(log_auto, args.count, output)
+    
+    print(f"log_auto (inspect):          {before:.2f} µs/call")
+    print(f"log_auto (cached):           {cached:.2f} µs/call  ({before / cached:.2f}x)")
+    print(f"log_auto (cached, buffered): {buffered:.2f} µs/call  ({before / buffered:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
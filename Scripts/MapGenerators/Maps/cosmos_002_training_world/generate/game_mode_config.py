@@ -4,7 +4,7 @@ GameMode configuration module
 
 import unreal
 import sys
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span
 
 
 class GameModeConfigurator:
@@ -13,6 +13,7 @@ class GameModeConfigurator:
     def __init__(self):
         log_auto("GameModeConfigurator初始化")
     
+    @span("config_gamemode")
     def configure_game_mode(self, world):
         """Configure map's GameMode"""
         log_auto("开始配置GameMode")
@@ -4,7 +4,7 @@ Main map generator orchestrator
 
 import unreal
 import sys
-from trace import log_auto, log_checkpoint
+from trace import log_auto, log_checkpoint, span, set_span_attributes
 from level_manager import LevelManager
 from room_builder import RoomBuilder
 from player_spawner import PlayerSpawner
@@ -16,10 +16,12 @@ from map_saver import MapSaver
 class TrainingMapGenerator:
     """Main generator that orchestrates all components"""
     
+    DEFAULT_MAP_NAME = "Cosmos_002_Training_World"
+    
     def __init__(self, map_name=None):
         log_auto("TrainingMapGenerator初始化")
         
-        self.map_name = map_name or "Cosmos_002_Training_World"
+        self.map_name = map_name or self.DEFAULT_MAP_NAME
         self.map_path = "/Game/Maps/"
         
         log_auto("创建子系统管理器")
@@ -37,6 +39,7 @@ class TrainingMapGenerator:
         
         log_auto("TrainingMapGenerator初始化完成")
     
+    @span("generate_map")
     def generate_map(self):
         """Main generation function"""
         log_auto("开始生成地图")
@@ -108,6 +111,7 @@ class TrainingMapGenerator:
             print(f"{'='*60}")
             sys.stdout.flush()
             
+            set_span_attributes(actors=len(self.created_actors))
             log_checkpoint("GENERATION_COMPLETE")
             
         except Exception as e:
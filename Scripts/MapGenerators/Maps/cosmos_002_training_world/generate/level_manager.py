@@ -4,7 +4,7 @@ Level creation and management module
 
 import unreal
 import sys
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span
 
 
 class LevelManager:
@@ -20,6 +20,7 @@ class LevelManager:
         self.unreal_editor_subsystem = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem)
         self.editor_asset_subsystem = unreal.get_editor_subsystem(unreal.EditorAssetSubsystem)
     
+    @span("create_level")
     def create_or_load_level(self):
         """Create new level or load existing one"""
         log_auto("开始准备Level")
@@ -31,7 +32,7 @@ class LevelManager:
         exists = self.editor_asset_subsystem.does_asset_exist(full_path)
         
         if exists:
-            log_auto("地图已存在，加载中")
+            log_auto("地图已存在，加载中", flush=True)
             unreal.log(f"Map exists, loading: {full_path}")
             print(f"  Map exists, loading: {full_path}")
             sys.stdout.flush()
@@ -67,7 +68,7 @@ class LevelManager:
             print(f"  ✓ Old actors cleared")
             sys.stdout.flush()
         else:
-            log_auto("创建新地图")
+            log_auto("创建新地图", flush=True)
             unreal.log(f"Creating new map: {full_path}")
             print(f"  Creating new map: {full_path}")
             sys.stdout.flush()
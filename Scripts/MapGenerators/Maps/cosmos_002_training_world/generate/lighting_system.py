@@ -4,7 +4,7 @@ Lighting system setup module
 
 import unreal
 import sys
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span
 
 
 class LightingSystem:
@@ -14,6 +14,7 @@ class LightingSystem:
         log_auto("LightingSystem初始化")
         self.created_actors = []
     
+    @span("setup_lighting")
     def setup_lighting(self, world):
         """Setup complete lighting system"""
         log_auto("开始设置光照系统")
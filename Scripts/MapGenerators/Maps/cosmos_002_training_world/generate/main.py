@@ -6,6 +6,7 @@ import unreal
 import sys
 from trace import log_auto, log_checkpoint
 from generator import TrainingMapGenerator
+from result_writer import write_result
 
 
 def main():
@@ -23,6 +24,7 @@ def main():
     
     log_auto("创建生成器实例")
     
+    generator = None
     try:
         # Create generator
         log_checkpoint("BEFORE_GENERATOR_INIT")
@@ -49,7 +51,10 @@ def main():
         print("="*60 + "\n")
         sys.stdout.flush()
         
+        # Manifest last: the launcher shuts UE5 down as soon as it appears
+        # (a checkpoint writes the buffered markers, so SCRIPT_SUCCESS is in the log before it)
         log_checkpoint("SCRIPT_SUCCESS")
+        write_result("success", generator.map_name, generator.get_full_map_path())
         return 0
         
     except Exception as e:
@@ -61,6 +66,10 @@ def main():
         traceback.print_exc()
         sys.stdout.flush()
         
+        # Manifest last, after the traceback
+        map_name = generator.map_name if generator else TrainingMapGenerator.DEFAULT_MAP_NAME
+        write_result("error", map_name, f"/Game/Maps/{map_name}", error=str(e))
+        
         return 1
 
 
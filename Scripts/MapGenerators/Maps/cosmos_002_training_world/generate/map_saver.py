@@ -5,7 +5,7 @@ Map saving module
 import unreal
 import sys
 from pathlib import Path
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span
 
 
 class MapSaver:
@@ -16,6 +16,7 @@ class MapSaver:
         self.map_name = map_name
         self.editor_asset_subsystem = editor_asset_subsystem
     
+    @span("save_map")
     def save_map(self, world, full_path):
         """Save map and show file size comparison"""
         log_auto("开始保存地图")
@@ -35,7 +36,7 @@ class MapSaver:
             print(f"  Previous map size: {old_size:,} bytes ({old_size/1024:.2f} KB)")
         
         # Save current level
-        log_auto("保存地图文件")
+        log_auto("保存地图文件", flush=True)
         success = unreal.EditorLoadingAndSavingUtils.save_map(world, full_path)
         
         if not success:
@@ -4,7 +4,7 @@ Player start placement module
 
 import unreal
 import sys
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span
 
 
 class PlayerSpawner:
@@ -14,6 +14,7 @@ class PlayerSpawner:
         log_auto("PlayerSpawner初始化")
         self.created_actors = []
     
+    @span("place_player")
     def place_player_start(self, world):
         """Place PlayerStart actor"""
         log_auto("开始放置PlayerStart")
@@ -0,0 +1,123 @@
+"""
+Result manifest module
+Writes Saved/MapGenerators/<map folder>.result.json when the generator finishes,
+so the launcher can stop UE5 immediately and verify the saved map exactly
+
+Run by Maps/map_job.py (batch / daemon), the manifest is held back in pending_result:
+map_job writes it with save_result() after its own BATCH_* markers have been logged.
+"""
+
+import hashlib
+import json
+import os
+import time
+import unreal
+from pathlib import Path
+from trace import log_auto, get_checkpoints, get_elapsed_ms
+
+
+# Manifest is named after the Maps/<map> folder (same name the launcher uses)
+MAP_FOLDER_NAME = Path(__file__).resolve().parent.parent.name
+
+# Bytes per read when hashing the saved .umap
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Set by Maps/map_job.py while it runs this map
+DEFER_RESULT_ENV = 'MAPGEN_DEFER_RESULT'
+
+# (result_file, result) held back while DEFER_RESULT_ENV is set
+pending_result = None
+
+
+def get_result_file():
+    """Absolute path of this map's result manifest"""
+    project_dir = unreal.SystemLibrary.get_project_directory()
+    return Path(project_dir) / "Saved" / "MapGenerators" / f"{MAP_FOLDER_NAME}.result.json"
+
+
+def get_step_timings(checkpoints):
+    """
+    Pair BEFORE_<STEP>/AFTER_<STEP> checkpoints into step durations
+    
+    Returns:
+        dict: {step_name: duration_ms} in execution order
+    """
+    started = {}
+    timings = {}
+    for name, elapsed_ms in checkpoints:
+        if name.startswith("BEFORE_"):
+            started[name[len("BEFORE_"):]] = elapsed_ms
+        elif name.startswith("AFTER_") and name[len("AFTER_"):] in started:
+            step = name[len("AFTER_"):]
+            timings[step] = round(elapsed_ms - started.pop(step), 3)
+    return timings
+
+
+def hash_file(path):
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_result(result_file, result):
+    """Write a manifest atomically (temp file + rename) - raises OSError"""
+    result_file = Path(result_file)
+    result_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = result_file.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, result_file)
+
+
+def write_result(status, map_name, map_path, error=None):
+    """
+    Write the result manifest (atomically: temp file + rename)
+    
+    Under map_job.py (DEFER_RESULT_ENV set) it is only stored in pending_result.
+    
+    Args:
+        status: "success" or "error"
+        map_name: UE5 map name (e.g. Cosmos_002_Training_World)
+        map_path: Asset path (e.g. /Game/Maps/Cosmos_002_Training_World)
+        error: Error message when status is "error"
+    
+    Returns:
+        Path: Manifest path (None if it could not be written)
+    """
+    global pending_result
+    project_dir = unreal.SystemLibrary.get_project_directory()
+    map_file = Path(project_dir) / "Content" / "Maps" / f"{map_name}.umap"
+    
+    result = {
+        'status': status,
+        'map_name': map_name,
+        'map_path': map_path,
+        'map_file': str(map_file),
+        'size': None,
+        'sha256': None,
+        'steps': get_step_timings(get_checkpoints()),
+        'total_ms': round(get_elapsed_ms(), 3),
+        'error': error,
+        'written_at': time.time(),
+    }
+    
+    if status == "success" and map_file.exists():
+        result['size'] = map_file.stat().st_size
+        result['sha256'] = hash_file(map_file)
+    
+    result_file = get_result_file()
+    if os.environ.get(DEFER_RESULT_ENV):
+        pending_result = (result_file, result)
+        return result_file
+    
+    try:
+        save_result(result_file, result)
+    except OSError as e:
+        log_auto(f"警告：结果清单写入失败: {e}", status="warning")
+        return None
+    
+    log_auto("结果清单已保存")
+    return result_file
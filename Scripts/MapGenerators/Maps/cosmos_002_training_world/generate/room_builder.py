@@ -4,7 +4,7 @@ Training room geometry builder module
 
 import unreal
 import sys
-from trace import log_auto, log_step, log_checkpoint
+from trace import log_auto, log_step, log_checkpoint, span, set_span_attributes
 
 
 class RoomBuilder:
@@ -15,13 +15,14 @@ class RoomBuilder:
         self.editor_asset_subsystem = editor_asset_subsystem
         self.created_actors = []
     
+    @span("build_room")
     def build_training_room(self, world):
         """Create training room geometry"""
         log_auto("开始构建训练室")
         log_step(2, 6, "Creating training room geometry...")
         
         # Load assets
-        log_auto("加载网格和材质")
+        log_auto("加载网格和材质", flush=True)
         print("  Loading assets...")
         
         cube_mesh = self.editor_asset_subsystem.load_asset("/Game/LevelPrototyping/Meshes/SM_Cube")
@@ -130,9 +131,11 @@ class RoomBuilder:
                                          unreal.Rotator(0, 90, 0),
                                          unreal.Vector(18.0, 4.0, 1.0))
         
+        set_span_attributes(actors=len(self.created_actors))
         log_auto("训练室构建完成")
         print(f"  ✓ Training room geometry created (3 rooms with transparent partitions)")
     
+    @span("create_static_mesh")
     def create_static_mesh(self, name, mesh, material, location, rotation, scale):
         """Create a static mesh actor"""
         log_auto(f"创建静态网格: {name}")
@@ -164,6 +167,7 @@ class RoomBuilder:
         
         return actor
     
+    @span("create_transparent_partition")
     def create_transparent_partition(self, name, mesh, base_material, location, rotation, scale):
         """Create a transparent partition"""
         log_auto(f"创建透明隔断: {name}")
@@ -26,6 +26,9 @@ class MockUnreal:
 
 sys.modules['unreal'] = MockUnreal()
 
+# Markers written as each call happens (the buffered emitter has its own tests)
+os.environ['MAPGEN_TRACE_BUFFERED'] = '0'
+
 # Import modules
 from trace import log_auto
 from trace_parser import TraceInfo, _parse_trace_marker
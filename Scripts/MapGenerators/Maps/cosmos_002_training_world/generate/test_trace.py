@@ -20,6 +20,9 @@ class MockUnreal:
 
 sys.modules['unreal'] = MockUnreal()
 
+# Markers written as each call happens (the buffered emitter has its own tests)
+os.environ['MAPGEN_TRACE_BUFFERED'] = '0'
+
 # Now import trace module
 from trace import infer_status, ERROR_KEYWORDS, WARNING_KEYWORDS, SUCCESS_KEYWORDS
 
@@ -242,7 +245,7 @@ def test_log_auto_status_persistence():
         assert f":{status}]" in output, f"Expected ':{status}]' in output, got: {output}"
         
         # Check format: [TRACE:module:line:timestamp:status] context
-        pattern = r'\[TRACE:\w+:\d+:\d+:' + status + r'\]'
+        pattern = r'\[TRACE:\w+:\d+:\d+\.\d{3}:' + status + r'\]'
         assert re.search(pattern, output), f"TRACE format incorrect for status '{status}': {output}"
     
     print("✓ Status persistence passed")
@@ -318,12 +321,280 @@ def test_log_auto_trace_format():
     output = f.getvalue()
     
     # Check format: [TRACE:module:line:timestamp:status] context
-    pattern = r'\[TRACE:\w+:\d+:\d+:success\] 测试格式'
+    pattern = r'\[TRACE:\w+:\d+:\d+\.\d{3}:success\] 测试格式'
     assert re.search(pattern, output), f"TRACE format incorrect: {output}"
     
     print("✓ TRACE format passed")
 
 
+def test_log_auto_caches():
+    """
+    Test that the cached fast path reports the caller's module and line, and that
+    memoized statuses match infer_status
+    """
+    print("Testing log_auto caches...")
+    
+    import io
+    import trace
+    from contextlib import redirect_stdout
+    
+    for _ in range(2):  # Second round is served from the caches
+        f = io.StringIO()
+        with redirect_stdout(f):
+            line = sys._getframe().f_lineno + 1
+            log_auto("资源加载成功")
+            log_auto("资源加载成功", status="warning")
+            log_auto("")
+        
+        output = f.getvalue().splitlines()
+        assert output[0].startswith(f"[TRACE:test_trace:{line}:"), f"Wrong caller position: {output[0]}"
+        assert output[0].endswith(":success] 资源加载成功"), output[0]
+        assert output[1].endswith(":warning] 资源加载成功"), "Explicit status bypasses the status cache"
+        assert re.fullmatch(r'\[TRACE:test_trace:\d+:\d+\.\d{3}:info\]', output[2]), output[2]
+    
+    assert trace._statuses["资源加载成功"] == infer_status("资源加载成功")
+    
+    # Per-actor contexts must not grow the status cache without bound
+    f = io.StringIO()
+    with redirect_stdout(f):
+        for i in range(trace.STATUS_CACHE_SIZE + 10):
+            log_auto(f"放置失败: Wall_{i}")
+    assert len(trace._statuses) <= trace.STATUS_CACHE_SIZE
+    assert f.getvalue().splitlines()[-1].endswith(":error] 放置失败: Wall_" + str(trace.STATUS_CACHE_SIZE + 9))
+    
+    print("✓ log_auto caches passed")
+
+
+def test_buffered_emission():
+    """
+    Test the buffered emitter: one block per checkpoint, size / time / error flushes
+    """
+    print("Testing buffered trace emission...")
+    
+    import io
+    import trace
+    from contextlib import redirect_stdout
+    from trace import flush_trace, log_checkpoint, log_step
+    
+    logged = []
+    saved = (trace.TRACE_BUFFERED, trace.TRACE_FLUSH_LINES, trace.TRACE_FLUSH_SECONDS, trace.unreal.log)
+    trace.TRACE_BUFFERED = True
+    trace.TRACE_FLUSH_SECONDS = 3600
+    trace.unreal.log = logged.append
+    try:
+        f = io.StringIO()
+        with redirect_stdout(f):
+            log_auto("开始处理")
+            log_step(1, 6, "创建Level")
+            assert f.getvalue() == "" and logged == [], "Markers are buffered"
+            log_checkpoint("AFTER_CREATE_LEVEL")
+        
+        assert len(logged) == 1, "Checkpoint writes the buffer as one block"
+        lines = f.getvalue().splitlines()
+        assert logged[0].split("\n") == lines
+        assert re.fullmatch(r'\[TRACE:test_trace:\d+:\d+\.\d{3}:info\] 开始处理', lines[0]), lines[0]
+        assert lines[1] == "[1/6] 创建Level"
+        assert re.fullmatch(r'\[CHECKPOINT:\d+:\d+\.\d{3}\] AFTER_CREATE_LEVEL', lines[2]), lines[2]
+        
+        # Error markers are not held back
+        with redirect_stdout(io.StringIO()) as f:
+            log_auto("开始处理")
+            log_auto("资源加载失败")
+        assert len(f.getvalue().splitlines()) == 2
+        
+        # Explicit flush before a blocking UE5 call (no timer writes a stalled buffer)
+        with redirect_stdout(io.StringIO()) as f:
+            log_auto("处理")
+            log_auto("保存地图文件", flush=True)
+        assert len(f.getvalue().splitlines()) == 2
+        
+        # Size threshold
+        trace.TRACE_FLUSH_LINES = 3
+        with redirect_stdout(io.StringIO()) as f:
+            for i in range(7):
+                log_auto(f"处理 {i}")
+            assert len(f.getvalue().splitlines()) == 6
+            flush_trace()
+            flush_trace()  # Empty buffer: no output
+        assert len(f.getvalue().splitlines()) == 7
+        
+        # Time threshold
+        trace.TRACE_FLUSH_SECONDS = 0
+        with redirect_stdout(io.StringIO()) as f:
+            log_auto("处理")
+        assert f.getvalue() != ""
+        
+        # Unbuffered setting: every marker at once
+        trace.TRACE_BUFFERED = False
+        trace.TRACE_FLUSH_SECONDS = 3600
+        logged.clear()
+        with redirect_stdout(io.StringIO()) as f:
+            log_auto("处理")
+            log_step(2, 6, "构建训练室")
+        assert len(logged) == 2 and len(f.getvalue().splitlines()) == 2
+    finally:
+        trace.TRACE_BUFFERED, trace.TRACE_FLUSH_LINES, trace.TRACE_FLUSH_SECONDS, trace.unreal.log = saved
+    
+    print("✓ Buffered trace emission passed")
+
+
+def test_event_file():
+    """
+    Test the structured event file: one JSON line per TRACE / CHECKPOINT, written before the text
+    """
+    print("Testing trace event file...")
+    
+    import atexit
+    import io
+    import json
+    import tempfile
+    import trace
+    from contextlib import redirect_stdout
+    from unittest.mock import patch
+    from trace import log_checkpoint, log_step
+    
+    saved = (trace.TRACE_BUFFERED, trace._events)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "map.trace.jsonl")
+        trace._events = trace._open_events(path)
+        trace.TRACE_BUFFERED = True
+        try:
+            with redirect_stdout(io.StringIO()) as f:
+                log_auto('放置成功: "Wall_1" [x:1]')
+                log_step(1, 6, "创建Level")
+                log_auto("处理", status="warning")
+                log_checkpoint("AFTER_CREATE_LEVEL")
+            with open(path, encoding='utf-8') as events_file:
+                events = [json.loads(line) for line in events_file]
+            
+            assert [e['type'] for e in events] == ['trace', 'trace', 'checkpoint'], "log_step writes no event"
+            assert events[0]['module'] == 'test_trace' and events[0]['status'] == 'success'
+            assert events[0]['context'] == '放置成功: "Wall_1" [x:1]', "Context survives delimiters and quotes"
+            assert events[1]['status'] == 'warning'
+            assert events[2]['name'] == 'AFTER_CREATE_LEVEL'
+            assert events[0]['ns'] <= events[1]['ns'] <= events[2]['ns']
+            
+            # Same line and timestamp as the text markers
+            markers = [line for line in f.getvalue().splitlines() if line.startswith('[TRACE') or line.startswith('[CHECKPOINT')]
+            assert markers[0].startswith(f"[TRACE:test_trace:{events[0]['line']}:{events[0]['ms']:.3f}:success]")
+            assert markers[2] == f"[CHECKPOINT:{events[2]['line']}:{events[2]['ms']:.3f}] AFTER_CREATE_LEVEL"
+            
+            # close_events (map_job.py, after every map) writes what is buffered and releases the handle
+            events_file = trace._events
+            unregistered = []
+            with redirect_stdout(io.StringIO()) as f, patch.object(atexit, 'unregister', unregistered.append):
+                log_auto("关闭前")
+                trace.close_events()
+                log_auto("关闭后")  # Text marker only
+                trace.flush_trace()
+            assert events_file.closed and trace._events is None
+            assert unregistered == [trace.flush_trace], "Exit flush unregistered (re-imports don't pile up handlers)"
+            assert "关闭前" in f.getvalue() and "关闭后" in f.getvalue()
+            with open(path, encoding='utf-8') as events_file:
+                assert json.loads(events_file.readlines()[-1]).get('context') == "关闭前"
+            os.remove(path)  # Windows refuses this while a handle is open
+        finally:
+            if trace._events is not None:
+                trace._events.close()
+            trace.TRACE_BUFFERED, trace._events = saved
+    
+    assert trace._open_events(None) is None
+    with redirect_stdout(io.StringIO()):
+        assert trace._open_events(os.path.join(tmp, "missing", "x.jsonl")) is None, "Unwritable path disables events"
+    
+    print("✓ Trace event file passed")
+
+
+def test_high_resolution_clock():
+    """
+    Test marker timestamps: 3 decimals, non-decreasing, independent of the wall clock
+    """
+    print("Testing high-resolution marker clock...")
+    
+    import io
+    import time
+    import trace
+    from contextlib import redirect_stdout
+    from trace import log_checkpoint, get_elapsed_ms
+    
+    wall_clock = time.time
+    time.time = lambda: 0.0  # System clock set back: markers must not notice
+    try:
+        with redirect_stdout(io.StringIO()) as f:
+            for i in range(50):
+                log_auto(f"放置成功: Wall_{i}")
+            log_checkpoint("AFTER_PLACE_WALLS")
+    finally:
+        time.time = wall_clock
+    
+    lines = f.getvalue().splitlines()
+    stamps = [re.fullmatch(r'\[TRACE:test_trace:\d+:(\d+\.\d{3}):success\] .*', line).group(1) for line in lines[:-1]]
+    values = [float(stamp) for stamp in stamps]
+    assert values == sorted(values), "Timestamps never go backwards"
+    assert values[-1] - values[0] < 1000, "50 markers take well under a second"
+    assert len(set(values)) > 1, "Consecutive markers are told apart below 1 ms"
+    assert re.fullmatch(r'\[CHECKPOINT:\d+:\d+\.\d{3}\] AFTER_PLACE_WALLS', lines[-1]), lines[-1]
+    
+    elapsed = get_elapsed_ms()
+    assert type(elapsed) is float and elapsed >= values[-1]
+    assert trace.get_checkpoints()[-1][1] >= values[-1]
+    
+    print("✓ High-resolution marker clock passed")
+
+
+def test_span():
+    """
+    Test span as context manager and decorator: nesting, attributes, errors, markers
+    """
+    print("Testing spans...")
+    
+    import io
+    import json
+    import trace
+    from contextlib import redirect_stdout
+    from trace import span, set_span_attributes, get_spans
+    
+    @span("create_static_mesh", kind="wall")
+    def create_static_mesh(name):
+        return name
+    
+    @span("save_map")
+    def save_map():
+        raise RuntimeError("保存失败")
+    
+    finished = len(get_spans())
+    with redirect_stdout(io.StringIO()) as f:
+        with span("build_room", rooms=3) as room:
+            assert create_static_mesh("BackWall") == "BackWall"
+            create_static_mesh("LeftWall")
+            set_span_attributes(actors=2)
+        try:
+            save_map()
+            assert False, "Exception must propagate"
+        except RuntimeError:
+            pass
+    
+    spans = get_spans()[finished:]
+    assert [entry['name'] for entry in spans] == ['create_static_mesh', 'create_static_mesh', 'build_room', 'save_map']
+    mesh, _, built, saved = spans
+    assert mesh['parent'] == room.id and built['parent'] == 0 and saved['parent'] == 0
+    assert mesh['attributes'] == {'kind': 'wall'}
+    assert built['attributes'] == {'rooms': 3, 'actors': 2}
+    assert built['start_ms'] <= mesh['start_ms'] <= mesh['end_ms'] <= built['end_ms']
+    assert built['duration_ns'] >= mesh['duration_ns'] >= 0
+    assert built['status'] == 'success' and saved['status'] == 'error'
+    assert not trace._span_stack, "Every span closed"
+    
+    lines = f.getvalue().splitlines()
+    assert lines[0] == f"[SPAN_BEGIN:{room.id}:0:{built['start_ms']:.3f}] build_room"
+    assert lines[1].startswith(f"[SPAN_BEGIN:{mesh['id']}:{room.id}:")
+    end = [line for line in lines if line.startswith(f"[SPAN_END:{room.id}:")][0]
+    assert json.loads(end.split("] build_room ", 1)[1]) == {'rooms': 3, 'actors': 2}
+    assert lines[-1] == f"[SPAN_END:{saved['id']}:{saved['end_ms']:.3f}:error] save_map"
+    
+    print("✓ Spans passed")
+
+
 def run_log_auto_tests():
     """Run all log_auto tests"""
     print("\n" + "="*60)
@@ -336,6 +607,11 @@ def run_log_auto_tests():
         test_log_auto_invalid_status_handling()
         test_log_auto_inferred_status()
         test_log_auto_trace_format()
+        test_log_auto_caches()
+        test_buffered_emission()
+        test_event_file()
+        test_high_resolution_clock()
+        test_span()
         
         print("\n" + "="*60)
         print("✓ ALL LOG_AUTO TESTS PASSED")
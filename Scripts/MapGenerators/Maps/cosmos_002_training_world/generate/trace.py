@@ -1,16 +1,56 @@
 """
-UE5-compatible execution tracing module (Auto-tracing with inspect)
+UE5-compatible execution tracing module (Auto-tracing with frame introspection)
 Automatically captures module name, line number, and timestamp
 No need to hardcode line numbers!
+
+log_auto runs once per traced statement (per actor in procedural maps), so its
+per-call work is cached: module names per code object, statuses per context string.
+
+Markers are buffered and written as one block (one unreal.log + one stdout write)
+at every checkpoint, every TRACE_FLUSH_LINES markers, after TRACE_FLUSH_SECONDS,
+on error markers, before UE5 calls that can block for long (log_auto(..., flush=True))
+and at exit. Each marker keeps its own timestamp; only its position relative to
+other (unbuffered) output can move by up to one block. The age check only runs when
+a marker is logged - there is no timer (no threads in the editor's Python), so the
+markers before a long load / save are written explicitly: a hung editor that the
+launcher kills has still logged them.
+MAPGEN_TRACE_BUFFERED=0 (launcher: config.TRACE_BUFFERED = False) writes every
+marker immediately, as before.
+
+When the launcher names a file in MAPGEN_TRACE_EVENTS, every TRACE / CHECKPOINT / SPAN
+marker is also appended to it as one JSON line (format: launch_generator/trace_events.py).
+The file is opened at import, before the first marker, and flushed before each block;
+close_events() closes it and drops the atexit handler (map_job.py calls it after every
+map - each map re-imports this module into the same long-lived editor).
+
+Timestamps come from time.perf_counter_ns() (monotonic, sub-microsecond) relative
+to the module import and are printed as milliseconds with 3 decimals (2450.113).
+Launchers read both this and the older integer format.
+
+span("build_room") times a generation phase as a context manager or decorator.
+Spans nest (each records its parent), so the launcher reports inclusive and
+exclusive time per phase instead of the gap between consecutive TRACE markers.
 """
 
+import atexit
+import functools
+import json
+import os
 import unreal
-import inspect
+import sys
 import time
 
 
-# Global variable: script start time
-_start_time = time.time()
+# Global variable: script start (time.perf_counter_ns), the origin of every marker timestamp
+_start_ns = time.perf_counter_ns()
+
+# Checkpoints logged so far as (name, elapsed_ms) - used for the result manifest step timings
+_checkpoints = []
+
+# Spans: open ones innermost last, finished ones in completion order (see span)
+_span_stack = []
+_spans = []
+_next_span_id = 1
 
 
 # Status keywords for automatic inference
@@ -22,6 +62,20 @@ SUCCESS_KEYWORDS = ["成功", "完成", "创建", "生成", "保存",
 # Valid status values
 VALID_STATUSES = ["success", "warning", "error", "info"]
 
+# Buffered emission (see module docstring)
+TRACE_BUFFERED = os.environ.get('MAPGEN_TRACE_BUFFERED', '1') != '0'
+TRACE_FLUSH_LINES = 200
+TRACE_FLUSH_SECONDS = 1.0
+
+_pending = []          # Buffered markers
+_pending_since = None  # Clock (ns since start) of the oldest buffered marker
+
+# Caches for log_auto
+_module_names = {}    # Code object -> module name
+_statuses = {}        # Context string -> inferred status
+_json_strings = {}    # Context / module string -> JSON string literal (event file only)
+STATUS_CACHE_SIZE = 4096  # Contexts built per actor (f-strings) would otherwise grow them without bound
+
 
 def infer_status(context):
     """
@@ -62,7 +116,116 @@ def infer_status(context):
     return "info"
 
 
-def log_auto(context="", status=None):
+def _module_name(code):
+    """Module name of a code object ('/x/room_builder.py' -> 'room_builder'), computed once per code object"""
+    name = _module_names.get(code)
+    if name is None:
+        name = code.co_filename.split('/')[-1].split('\\')[-1].replace('.py', '')
+        _module_names[code] = name
+    return name
+
+
+def _cached_status(context):
+    """infer_status memoized per context string"""
+    if type(context) is not str:
+        return infer_status(context)
+    status = _statuses.get(context)
+    if status is None:
+        if len(_statuses) >= STATUS_CACHE_SIZE:
+            _statuses.clear()
+        status = _statuses[context] = infer_status(context)
+    return status
+
+
+def _json_string(text):
+    """json.dumps(text) memoized per string"""
+    if type(text) is not str:
+        text = str(text)
+    encoded = _json_strings.get(text)
+    if encoded is None:
+        if len(_json_strings) >= STATUS_CACHE_SIZE:
+            _json_strings.clear()
+        encoded = _json_strings[text] = json.dumps(text, ensure_ascii=False)
+    return encoded
+
+
+def _open_events(path):
+    """Event file opened for appending (None when disabled or not writable)"""
+    if not path:
+        return None
+    try:
+        return open(path, 'a', encoding='utf-8')
+    except OSError as e:
+        print(f"WARNING: Cannot open trace event file {path}: {e}", flush=True)
+        return None
+
+
+# Structured event sidecar (see module docstring)
+TRACE_EVENTS_FILE = os.environ.get('MAPGEN_TRACE_EVENTS')
+_events = _open_events(TRACE_EVENTS_FILE)
+
+
+def _write(text):
+    """One marker or block to the UE5 log and stdout"""
+    unreal.log(text)
+    stdout = sys.stdout
+    stdout.write(text + "\n")
+    stdout.flush()
+
+
+def flush_trace():
+    """Write the buffered markers as one block"""
+    global _pending_since
+    if _events is not None:
+        _events.flush()  # Events before their text markers (the launcher prefers events)
+    if not _pending:
+        return
+    block = "\n".join(_pending)
+    _pending.clear()
+    _pending_since = None
+    _write(block)
+
+
+def close_events():
+    """Write the buffered markers, close the event file and unregister the exit flush (end of this import)"""
+    global _events
+    flush_trace()
+    atexit.unregister(flush_trace)  # Would keep this purged module alive until the editor exits
+    if _events is not None:
+        _events.close()
+        _events = None
+
+
+def _emit(marker, now, flush=False, event=None):
+    """
+    Output one marker (buffered unless TRACE_BUFFERED is off)
+    
+    Args:
+        marker: Marker line
+        now: Clock of the marker (ns since start)
+        flush: Write the buffer, this marker included, right away
+        event: JSON line for the event file (only built when it is open)
+    """
+    global _pending_since
+    if event is not None:
+        _events.write(event)
+    if not TRACE_BUFFERED:
+        if event is not None:
+            _events.flush()
+        _write(marker)
+        return
+    _pending.append(marker)
+    if _pending_since is None:
+        _pending_since = now
+    if flush or len(_pending) >= TRACE_FLUSH_LINES or now - _pending_since >= TRACE_FLUSH_SECONDS * 1000000000:
+        flush_trace()
+
+
+# Unhandled exception or early exit: buffered markers still reach the log
+atexit.register(flush_trace)
+
+
+def log_auto(context="", status=None, flush=False):
     """
     Automatically log current execution position (Enhanced with status support)
     
@@ -70,46 +233,56 @@ def log_auto(context="", status=None):
         context: Optional context description (e.g., "创建墙壁")
         status: Optional explicit status ("success", "warning", "error", "info")
                 If None, will be inferred from context
+        flush: Write the buffered markers now - pass it right before a UE5 call that
+               can block for long (level load/save, asset loads compiling shaders)
     
     Output format:
         [TRACE:module_name:line_number:timestamp_ms:status] context
     
     Example:
-        [TRACE:room_builder:25:2450:success] 创建地板
-        [TRACE:room_builder:30:2500:error] 错误：资源加载失败
+        [TRACE:room_builder:25:2450.113:success] 创建地板
+        [TRACE:room_builder:30:2500.042:error] 错误：资源加载失败
     """
     # Get caller's stack frame
-    frame = inspect.currentframe().f_back
+    frame = sys._getframe(1)
     
-    # Auto-get module name (extract from filename)
-    filename = frame.f_code.co_filename
-    module_name = filename.split('/')[-1].split('\\')[-1].replace('.py', '')
+    # Auto-get module name (cached per code object)
+    module_name = _module_name(frame.f_code)
     
     # Auto-get line number
     line_num = frame.f_lineno
     
     # Get timestamp (relative to script start, in milliseconds)
-    elapsed_ms = int((time.time() - _start_time) * 1000)
+    now = time.perf_counter_ns() - _start_ns
+    elapsed_ms = f"{now / 1000000:.3f}"
     
     # Determine status
     if status is not None:
         # Validate explicit status
         if status not in VALID_STATUSES:
             warning_msg = f"Invalid status '{status}', defaulting to 'info'"
+            flush_trace()  # Keep the warning after the markers before it
             unreal.log_warning(warning_msg)
             print(f"WARNING: {warning_msg}", flush=True)
             status = "info"
     else:
         # Infer status from context
-        status = infer_status(context)
+        status = _cached_status(context)
     
     # Output trace marker (enhanced format with status)
-    marker = f"[TRACE:{module_name}:{line_num}:{elapsed_ms}:{status}]"
     if context:
-        marker += f" {context}"
+        marker = f"[TRACE:{module_name}:{line_num}:{elapsed_ms}:{status}] {context}"
+    else:
+        marker = f"[TRACE:{module_name}:{line_num}:{elapsed_ms}:{status}]"
     
-    unreal.log(marker)
-    print(marker, flush=True)
+    event = None
+    if _events is not None:
+        event = (f'{{"type":"trace","module":{_json_string(module_name)},"line":{line_num},'
+                 f'"ms":{elapsed_ms},"ns":{now},"status":"{status}",'
+                 f'"context":{_json_string(context)}}}\n')
+    
+    # Errors are written at once: the launcher may stop UE5 right after them
+    _emit(marker, now, flush=flush or status == "error", event=event)
 
 
 def log_step(step_num, total_steps, description):
@@ -122,24 +295,150 @@ def log_step(step_num, total_steps, description):
         description: Step description
     """
     marker = f"[{step_num}/{total_steps}] {description}"
-    unreal.log(marker)
-    print(marker)
-    
-    import sys
-    sys.stdout.flush()
+    _emit(marker, time.perf_counter_ns() - _start_ns)
 
 
 def log_checkpoint(checkpoint_name):
     """
-    Log checkpoint (auto-get line number)
+    Log checkpoint (auto-get line number) and write the buffered markers
     
     Args:
         checkpoint_name: Checkpoint name
     """
-    frame = inspect.currentframe().f_back
-    line_num = frame.f_lineno
-    elapsed_ms = int((time.time() - _start_time) * 1000)
+    line_num = sys._getframe(1).f_lineno
+    now = time.perf_counter_ns() - _start_ns
+    elapsed_ms = f"{now / 1000000:.3f}"
+    
+    _checkpoints.append((checkpoint_name, now / 1000000))
     
     marker = f"[CHECKPOINT:{line_num}:{elapsed_ms}] {checkpoint_name}"
-    unreal.log(marker)
-    print(marker, flush=True)
+    event = None
+    if _events is not None:
+        event = (f'{{"type":"checkpoint","line":{line_num},"ms":{elapsed_ms},'
+                 f'"ns":{now},"name":{_json_string(checkpoint_name)}}}\n')
+    _emit(marker, now, flush=True, event=event)
+
+
+class span:
+    """
+    Timed generation phase - context manager and decorator
+    
+    Args:
+        name: Phase name (e.g. "build_room")
+        **attributes: Values reported with the phase (JSON-serializable)
+    
+    Output format:
+        [SPAN_BEGIN:id:parent_id:timestamp_ms] name
+        [SPAN_END:id:timestamp_ms:status] name {"attribute": value}
+    parent_id is 0 for a top-level span; status is "error" when the block raised.
+    
+    Example:
+        @span("build_room")
+        def build_training_room(self, world): ...
+        
+        with span("place_wall", index=i):
+            ...
+    """
+    
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.id = None
+        self.parent = 0
+        self.start_ms = None
+        self.start_ns = None
+    
+    def __call__(self, func):
+        """Decorator: every call runs in a span of its own"""
+        name, attributes = self.name, self.attributes
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    def __enter__(self):
+        global _next_span_id
+        self.id = _next_span_id
+        _next_span_id += 1
+        self.parent = _span_stack[-1].id if _span_stack else 0
+        
+        self.start_ns = time.perf_counter_ns() - _start_ns
+        self.start_ms = self.start_ns / 1000000
+        _span_stack.append(self)
+        
+        marker = f"[SPAN_BEGIN:{self.id}:{self.parent}:{self.start_ms:.3f}] {self.name}"
+        event = None
+        if _events is not None:
+            event = (f'{{"type":"span_begin","id":{self.id},"parent":{self.parent},"ms":{self.start_ms:.3f},'
+                     f'"ns":{self.start_ns},"name":{_json_string(self.name)}}}\n')
+        _emit(marker, self.start_ns, event=event)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns() - _start_ns
+        end_ms = end_ns / 1000000
+        status = "error" if exc_type is not None else "success"
+        
+        if _span_stack and _span_stack[-1] is self:
+            _span_stack.pop()
+        elif self in _span_stack:
+            _span_stack.remove(self)
+        _spans.append({
+            'id': self.id,
+            'parent': self.parent,
+            'name': self.name,
+            'start_ms': self.start_ms,
+            'end_ms': end_ms,
+            'duration_ns': end_ns - self.start_ns,
+            'status': status,
+            'attributes': dict(self.attributes),
+        })
+        
+        attributes = json.dumps(self.attributes, ensure_ascii=False, default=str) if self.attributes else ""
+        marker = f"[SPAN_END:{self.id}:{end_ms:.3f}:{status}] {self.name}"
+        if attributes:
+            marker += f" {attributes}"
+        event = None
+        if _events is not None:
+            event = (f'{{"type":"span_end","id":{self.id},"ms":{end_ms:.3f},"ns":{end_ns},"status":"{status}",'
+                     f'"name":{_json_string(self.name)},"attributes":{attributes or "{}"}}}\n')
+        _emit(marker, end_ns, flush=(status == "error"), event=event)
+        return False
+
+
+def set_span_attributes(**attributes):
+    """
+    Add attributes to the innermost open span (reported with its SPAN_END)
+    
+    Example:
+        set_span_attributes(actors=len(self.created_actors))
+    """
+    if _span_stack:
+        _span_stack[-1].attributes.update(attributes)
+
+
+def get_spans():
+    """
+    Get finished spans
+    
+    Returns:
+        list: Dicts (id, parent, name, start_ms, end_ms, duration_ns, status, attributes) in completion order
+    """
+    return [dict(entry) for entry in _spans]
+
+
+def get_checkpoints():
+    """
+    Get checkpoints logged so far
+    
+    Returns:
+        list: (checkpoint_name, elapsed_ms) tuples in logging order (elapsed_ms is a float)
+    """
+    return list(_checkpoints)
+
+
+def get_elapsed_ms():
+    """Milliseconds since script start (same clock as the markers, float)"""
+    return (time.perf_counter_ns() - _start_ns) / 1000000
@@ -0,0 +1,170 @@
+"""
+Map Job - shared in-editor helpers for running one map generator
+
+Used by batch_generate.py (one editor session, several maps in a row) and by the
+launcher's warm editor daemon (jobs submitted over remote execution, see
+Tools/launch_generator/editor_daemon.py). Importing this module has no side effects.
+
+Each map's generate/ folder is imported in turn. Its modules (main, trace, generator, ...)
+share names with every other map, so they are removed from sys.modules before and after
+each map to keep the maps isolated - and so edited generator code is picked up by the next job.
+
+Markers (parsed by launch_generator/trace_parser.py):
+    [CHECKPOINT:line:timestamp] BATCH_MAP_START:<map>
+    [CHECKPOINT:line:timestamp] BATCH_MAP_END:<map>:<success|error>
+They are also appended as checkpoint events to the MAPGEN_TRACE_EVENTS file, like
+generate/trace.py does (see launch_generator/trace_events.py).
+
+The launcher stops UE5 as soon as every result manifest exists, so the maps' manifests
+are held back (generate/result_writer.py, MAPGEN_DEFER_RESULT) and written by
+write_results() once the last marker is in the log.
+"""
+
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import unreal
+
+
+MAPS_DIR = Path(__file__).parent.resolve()
+
+# Marker timestamps are relative to this (time.perf_counter_ns, reset per batch / per daemon job)
+_start_ns = time.perf_counter_ns()
+
+TRACE_EVENTS_ENV = 'MAPGEN_TRACE_EVENTS'
+DEFER_RESULT_ENV = 'MAPGEN_DEFER_RESULT'
+
+# Manifests of the maps run so far: [(save_result, result_file, result), ...]
+_pending_results = []
+
+
+def reset_clock():
+    """Restart marker timestamps at 0 (each daemon job reports its own timeline)"""
+    global _start_ns
+    _start_ns = time.perf_counter_ns()
+
+
+def log_marker(name):
+    """Emit a CHECKPOINT marker in the same format as trace.log_checkpoint"""
+    line_num = inspect.currentframe().f_back.f_lineno
+    elapsed_ns = time.perf_counter_ns() - _start_ns
+    elapsed_ms = round(elapsed_ns / 1000000, 3)
+    
+    # Event first: the launcher reads the event file instead of the text once it exists
+    events_path = os.environ.get(TRACE_EVENTS_ENV)
+    if events_path:
+        event = {'type': 'checkpoint', 'line': line_num, 'ms': elapsed_ms, 'ns': elapsed_ns, 'name': name}
+        try:
+            with open(events_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+    
+    marker = f"[CHECKPOINT:{line_num}:{elapsed_ms:.3f}] {name}"
+    unreal.log(marker)
+    print(marker, flush=True)
+
+
+def write_results():
+    """Write the held-back result manifests - call it after the last marker"""
+    while _pending_results:
+        save_result, result_file, result = _pending_results.pop(0)
+        try:
+            save_result(result_file, result)
+        except OSError as e:
+            print(f"WARNING: Cannot write result manifest {result_file}: {e}", flush=True)
+
+
+def purge_map_modules():
+    """Remove every module loaded from a Maps/<map>/generate folder"""
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if not module_file:
+            continue
+        try:
+            relative = Path(module_file).resolve().relative_to(MAPS_DIR)
+        except ValueError:
+            continue
+        # Only <map>/generate/*.py - never the batch/job helpers themselves
+        if len(relative.parts) >= 3 and relative.parts[1] == "generate":
+            del sys.modules[name]
+
+
+def run_map(map_name):
+    """
+    Import and run one map's generate/main.py
+    
+    Returns:
+        int: main() return code (1 if the map could not be imported)
+    """
+    generate_folder = MAPS_DIR / map_name / "generate"
+    if not (generate_folder / "main.py").exists():
+        print(f"ERROR: Map generator not found: {generate_folder / 'main.py'}", flush=True)
+        return 1
+    
+    purge_map_modules()
+    sys.path.insert(0, str(generate_folder))
+    os.environ[DEFER_RESULT_ENV] = "1"
+    try:
+        map_main = importlib.import_module("main")
+        return map_main.main()
+    except Exception as e:
+        print(f"ERROR: Map '{map_name}' failed: {e}", flush=True)
+        traceback.print_exc()
+        sys.stdout.flush()
+        return 1
+    finally:
+        # Markers the map's trace module still buffers (main() raised before a checkpoint),
+        # and its event file handle - the next map imports a fresh trace module
+        trace_module = sys.modules.get("trace")
+        close_events = getattr(trace_module, 'close_events', None)
+        flush_trace = getattr(trace_module, 'flush_trace', None)
+        if close_events is not None:
+            close_events()
+        elif flush_trace is not None:
+            flush_trace()
+        # The manifest main() prepared, written by write_results() after the markers
+        writer = sys.modules.get("result_writer")
+        pending = getattr(writer, 'pending_result', None)
+        if pending is not None:
+            _pending_results.append((writer.save_result, *pending))
+        os.environ.pop(DEFER_RESULT_ENV, None)
+        sys.path.remove(str(generate_folder))
+        purge_map_modules()
+
+
+def run_marked_map(map_name):
+    """
+    Run one map wrapped in BATCH_MAP_START/END markers (its manifest waits for write_results())
+    
+    Returns:
+        int: 0 on success, 1 on failure
+    """
+    log_marker(f"BATCH_MAP_START:{map_name}")
+    result = run_map(map_name)
+    status = "success" if result == 0 else "error"
+    log_marker(f"BATCH_MAP_END:{map_name}:{status}")
+    return 0 if result == 0 else 1
+
+
+def run_job(map_name, trace_events=None):
+    """
+    Daemon job entry point - evaluated by the launcher over remote execution
+    
+    Args:
+        trace_events: This job's trace event file (the editor's environment is shared by all jobs)
+    """
+    reset_clock()
+    if trace_events:
+        os.environ[TRACE_EVENTS_ENV] = trace_events
+    else:
+        os.environ.pop(TRACE_EVENTS_ENV, None)
+    result = run_marked_map(map_name)
+    write_results()
+    return result
@@ -0,0 +1,236 @@
+"""
+Async runner module - supervises several UE5 map generations concurrently
+Each generation gets its own process, OutputMonitor and TraceInfo; a semaphore caps how many editors run at once
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from config import DEBUG_MODE, TIMEOUT_SECONDS, CHECK_INTERVAL, MAX_ATTEMPTS, RETRY_DELAY, LOG_WAIT_TIMEOUT
+from log_tailer import LineSplitter
+from output_monitor import OutputMonitor
+from trace_parser import TraceInfo
+from process_runner import build_ue5_command, build_ue5_env, export_session_timeline, handle_line, open_trace_events, read_trace_events
+from stdout_reader import PIPE_CHUNK_SIZE
+from summary_generator import get_compressed_summary, get_new_lines_summary
+from log_saver import save_logs
+from result_analyzer import analyze_result, print_log_activity, print_progress_stats, print_trace_info
+from result_manifest import clear_result_files, results_ready, read_manifest
+from fatal_detector import FatalDetector
+from phase_budget import PhaseBudgets
+from timeout_monitor import POLL_INTERVAL, get_phase_timeout
+from run_history import record_attempt
+
+
+# Seconds to keep draining stdout after the editor exited (helper processes may hold the pipe)
+DRAIN_TIMEOUT = 5
+
+
+async def _read_stdout(process, monitor, trace_info, label):
+    """Read the child's stdout pipe until EOF and feed complete lines to the monitor"""
+    splitter = LineSplitter()
+    detector = FatalDetector()
+    
+    def feed(lines):
+        # Lines after a fatal match still reach the summary and full log (until the pipe closes)
+        for line in lines:
+            handle_line(line, monitor, trace_info, detector, label)
+    
+    while True:
+        data = await process.stdout.read(PIPE_CHUNK_SIZE)
+        if not data:
+            break
+        feed(splitter.feed(data))
+        if trace_info.fatal_match:
+            await _terminate(process)
+    feed(splitter.flush())
+
+
+async def _terminate(process):
+    """Terminate the editor, escalating to kill after 5 seconds"""
+    if process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=5)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+async def _watch_timeout(process, monitor, label, trace_info=None, budgets=None):
+    """Async counterpart of monitor_timeout - periodic summary and per-phase silence timeout for one editor"""
+    last_summary = time.time()
+    while monitor.is_running:
+        await asyncio.sleep(min(POLL_INTERVAL, CHECK_INTERVAL))
+        
+        # Show new output summary (silent mode)
+        if not DEBUG_MODE and time.time() - last_summary >= CHECK_INTERVAL:
+            last_summary = time.time()
+            summary = get_new_lines_summary(monitor)
+            if summary:
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] [{label}]")
+                print(summary)
+        
+        silence = monitor.get_silence_duration()
+        phase_timeout, phase = get_phase_timeout(TIMEOUT_SECONDS, trace_info, budgets)
+        if monitor.has_output and silence > phase_timeout:
+            phase_text = f"阶段 {phase} " if phase else ""
+            print(f"\n[{label}] {phase_text}{silence:.1f}秒无新输出 (预算 {phase_timeout:.1f}秒)，自动停止 (总输出行数: {len(monitor.lines)})")
+            monitor.stop()
+            await _terminate(process)
+            break
+
+
+async def _watch_result(process, monitor, result_file, label, trace_info=None):
+    """Shut the editor down as soon as the generator wrote its result manifest (and follow its trace events)"""
+    while monitor.is_running:
+        await asyncio.sleep(LOG_WAIT_TIMEOUT)
+        if trace_info is not None:
+            read_trace_events(trace_info)
+        if results_ready([result_file]):
+            print(f"[{label}] 检测到结果清单，立即关闭UE5")
+            monitor.stop()
+            await _terminate(process)
+            break
+
+
+async def run_generation_attempt_async(settings, attempt_num, semaphore, old_size, old_mtime, budgets=None):
+    """
+    Run one generation attempt for one map once a concurrency slot is free
+    
+    Args:
+        settings: Per-map settings from config.get_map_settings()
+        attempt_num: Attempt number (1-based)
+        semaphore: asyncio.Semaphore enforcing the global concurrency limit
+        old_size, old_mtime: Previous .umap stats for result comparison
+        budgets: Optional PhaseBudgets for per-phase silence timeouts (updated on success)
+    
+    Returns:
+        tuple: (result_code, reason_message) - same contract as run_generation_attempt
+    """
+    label = settings['map_name']
+    
+    async with semaphore:
+        # Separate log file per editor so concurrent instances never share Saved/Logs/shijiewuxian.log
+        ue5_log_file = settings['ue5_log_file']
+        ue5_log_file.parent.mkdir(parents=True, exist_ok=True)
+        cmd = build_ue5_command(settings['script_path'], [f'-ABSLOG={ue5_log_file.absolute()}'])
+        clear_result_files([settings['result_file']])
+        trace_events = open_trace_events(settings['trace_events_file'])
+        
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] [{label}] 启动UE5 (第 {attempt_num} 次尝试)...")
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=build_ue5_env(trace_events)
+        )
+        if DEBUG_MODE:
+            print(f"[DEBUG] [{label}] 进程PID: {process.pid}")
+        
+        monitor = OutputMonitor(log_file=settings['log_file'], full_log_file=settings['full_log_file'])
+        trace_info = TraceInfo()
+        trace_info.trace_events = trace_events
+        reader = asyncio.create_task(_read_stdout(process, monitor, trace_info, label))
+        watchdog = asyncio.create_task(_watch_timeout(process, monitor, label, trace_info, budgets))
+        result_watch = asyncio.create_task(_watch_result(process, monitor, settings['result_file'], label, trace_info))
+        
+        try:
+            await process.wait()
+            try:
+                await asyncio.wait_for(reader, timeout=DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        except asyncio.CancelledError:
+            await _terminate(process)
+            raise
+        finally:
+            monitor.stop()
+            watchdog.cancel()
+            result_watch.cancel()
+            reader.cancel()
+            read_trace_events(trace_info, final=True)
+            if trace_events is not None:
+                trace_events.close()
+    
+    # Report outside the semaphore so the next editor can start meanwhile
+    print("\n" + "="*60)
+    print(f"  执行摘要 (压缩) - {label}")
+    print("="*60)
+    print(get_compressed_summary(monitor))
+    print_progress_stats(trace_info)
+    print_log_activity(monitor.record_store)
+    print_trace_info(trace_info)
+    print("="*60)
+    save_logs(monitor)
+    export_session_timeline(trace_info, monitor, settings['timeline_file'])
+    
+    result = analyze_result(trace_info, old_size, old_mtime, settings['map_path'], read_manifest(settings['result_file']))
+    record_attempt(label, "parallel", attempt_num, result, trace_info, monitor)
+    if result[0] == 0 and budgets is not None:
+        budgets.record_run(trace_info.checkpoints)
+    return result
+
+
+async def generate_map_async(settings, semaphore):
+    """
+    Generate one map with the same retry policy as main.py
+    
+    Returns:
+        dict: map_name, result, reason, attempts, elapsed
+    """
+    start = time.time()
+    attempt = 1
+    budgets = PhaseBudgets.load(settings['map_name'])
+    
+    while True:
+        old_size = 0
+        old_mtime = None
+        if settings['map_path'].exists():
+            old_stat = settings['map_path'].stat()
+            old_size = old_stat.st_size
+            old_mtime = old_stat.st_mtime
+        
+        result, reason = await run_generation_attempt_async(settings, attempt, semaphore, old_size, old_mtime, budgets)
+        if result == 0:
+            budgets.save()
+        
+        if result == 2 and attempt < MAX_ATTEMPTS:
+            print(f"\n⚠ [{settings['map_name']}] 需要重试: {reason}，等待 {RETRY_DELAY} 秒...")
+            attempt += 1
+            await asyncio.sleep(RETRY_DELAY)
+            continue
+        
+        return {
+            'map_name': settings['map_name'],
+            'result': result,
+            'reason': reason,
+            'attempts': attempt,
+            'elapsed': time.time() - start
+        }
+
+
+async def run_maps_concurrently(map_settings, max_concurrent):
+    """
+    Generate several maps with at most max_concurrent editors alive at once
+    
+    Returns:
+        list: Result dicts in the order of map_settings
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    tasks = [generate_map_async(settings, semaphore) for settings in map_settings]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    outcomes = []
+    for settings, result in zip(map_settings, results):
+        if isinstance(result, BaseException):
+            result = {
+                'map_name': settings['map_name'],
+                'result': 1,
+                'reason': f"启动器异常: {result}",
+                'attempts': 0,
+                'elapsed': 0.0
+            }
+        outcomes.append(result)
+    return outcomes
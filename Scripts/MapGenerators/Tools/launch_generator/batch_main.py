@@ -0,0 +1,121 @@
+"""
+Batch entry point - generates several maps inside ONE UE5 editor session
+
+The editor starts once and runs Maps/batch_generate.py, which imports each map's
+generate/main.py in turn. Results are attributed per map from the BATCH_MAP_* checkpoints.
+
+Usage:
+    python batch_main.py [map_name ...]
+    
+    Without map names, every Maps/<map>/generate.py is regenerated.
+"""
+
+import sys
+import time
+from config import BATCH_SCRIPT_PATH, BATCH_LOG_FILE, BATCH_TRACE_EVENTS_FILE, BATCH_TIMELINE_FILE, FULL_LOG_FILE, MAX_ATTEMPTS, RETRY_DELAY, get_map_settings, discover_maps
+from path_setup import setup_paths
+from process_runner import run_ue5_session
+from result_analyzer import analyze_batch_result
+from result_manifest import read_manifest
+from fatal_detector import FatalDetector
+from run_history import record_attempt
+
+
+def get_old_stats(map_settings):
+    """Record each target .umap's size/mtime before the run"""
+    old_stats = {}
+    for settings in map_settings:
+        if settings['map_path'].exists():
+            old_stat = settings['map_path'].stat()
+            old_stats[settings['map_name']] = (old_stat.st_size, old_stat.st_mtime)
+        else:
+            old_stats[settings['map_name']] = (0, None)
+    return old_stats
+
+
+def print_results(results):
+    """Print per-map result table"""
+    print(f"\n{'='*60}")
+    print("  批量生成结果 (单编辑器会话)")
+    print(f"{'='*60}")
+    for map_name, (result, reason) in results.items():
+        icon = "✓" if result == 0 else "✗"
+        print(f"  {icon} {map_name:<32} {reason}")
+    succeeded = sum(1 for result, _ in results.values() if result == 0)
+    print(f"\n  成功: {succeeded}/{len(results)}")
+    print(f"{'='*60}")
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    map_names = list(sys.argv[1:] if argv is None else argv)
+    
+    # Setup paths
+    if not setup_paths():
+        return 1
+    
+    map_names = map_names or discover_maps()
+    if not map_names:
+        print("✗ 未找到任何地图 (Maps/<map>/generate.py)")
+        return 1
+    
+    print("\n" + "="*60)
+    print("  地图生成器 (批量模式: 单个UE5会话)")
+    print("="*60)
+    print(f"地图数量: {len(map_names)}")
+    print(f"地图列表: {', '.join(map_names)}")
+    print("="*60 + "\n")
+    
+    results = {}
+    pending = map_names
+    attempt = 1
+    
+    while pending:
+        map_settings = [get_map_settings(name) for name in pending]
+        old_stats = get_old_stats(map_settings)
+        
+        try:
+            monitor, trace_info = run_ue5_session(
+                f"{BATCH_SCRIPT_PATH} {' '.join(pending)}",
+                BATCH_LOG_FILE,
+                FULL_LOG_FILE,
+                [settings['result_file'] for settings in map_settings],
+                FatalDetector(include_per_map=False),
+                trace_events_file=BATCH_TRACE_EVENTS_FILE,
+                timeline_file=BATCH_TIMELINE_FILE
+            )
+        except KeyboardInterrupt:
+            for name in pending:
+                results[name] = (1, "用户中断")
+            break
+        
+        manifests = {settings['map_name']: read_manifest(settings['result_file']) for settings in map_settings}
+        results.update(analyze_batch_result(trace_info, map_settings, old_stats, manifests))
+        for name in pending:
+            # Only this map's slice of the session (empty window if it never started)
+            window = trace_info.batch_maps.get(name) or {'traces': (0, 0), 'checkpoints': (0, 0)}
+            record_attempt(name, "batch", attempt, results[name], trace_info, monitor, window)
+        
+        # Retry only the maps that hit an editor-side problem (compilation not finished)
+        pending = [name for name in pending if results[name][0] == 2]
+        if not pending or attempt >= MAX_ATTEMPTS:
+            break
+        
+        print(f"\n⚠ {len(pending)} 个地图需要重试: {', '.join(pending)}")
+        print(f"  等待 {RETRY_DELAY} 秒后重试...")
+        attempt += 1
+        time.sleep(RETRY_DELAY)
+    
+    print_results({name: results[name] for name in map_names})
+    
+    return 0 if all(result == 0 for result, _ in results.values()) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"FATAL ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,280 @@
+"""
+Chrome trace module - exports one attempt's timeline as Chrome Trace Event JSON
+Open the file in chrome://tracing or https://ui.perfetto.dev to read the whole run as a flame chart:
+
+    Generator (pid 1)   spans as nested slices, TRACE markers and checkpoints as instants
+    UE5 (pid 2)         engine phases inferred from the log categories (startup, asset registry,
+                        shader compile, Python, save, shutdown), one track per phase
+
+Generator times are milliseconds since trace.py was imported, engine times come from the
+UE5 log timestamps. The two clocks are aligned on the CHECKPOINT markers, which the generator
+writes at once (the buffered TRACE block is flushed at every checkpoint) - so the log timestamp
+of a checkpoint line is the wall-clock time of its generator ms.
+"""
+
+import json
+import math
+import os
+import re
+from pathlib import Path
+from config import COMPILE_CATEGORIES
+
+
+# Engine phases: log categories whose records make up each phase (track order = dict order)
+PHASE_CATEGORIES = {
+    'startup': ['LogInit', 'LogPluginManager', 'LogConfig', 'LogModuleManager', 'LogSlate', 'LogStreaming'],
+    'asset_registry': ['LogAssetRegistry'],
+    'shader_compile': COMPILE_CATEGORIES,
+    'python': ['LogPython'],
+    'save': ['LogSavePackage', 'LogFileHelpers'],
+    'shutdown': ['LogExit', 'LogContentValidation'],
+}
+
+# Records of one phase closer together than this (seconds) form one slice
+PHASE_GAP = 2.0
+
+GENERATOR_PID = 1
+ENGINE_PID = 2
+SPAN_TID = 1
+TRACE_TID = 2
+BATCH_TID = 3
+SESSION_TID = 0
+
+CHECKPOINT_MARKER = re.compile(r'\[CHECKPOINT:\d+:(\d+(?:\.\d+)?)\] (\S+)')
+BATCH_PREFIX = 'BATCH_MAP_'
+
+
+def checkpoint_anchors(record_store):
+    """
+    CHECKPOINT markers found in the log with the wall-clock time of their line
+    
+    Returns:
+        list: [(name, generator_ms, epoch_seconds), ...] in log order, repeats removed
+    """
+    anchors = []
+    # OutputMonitor keeps the text of CHECKPOINT lines only
+    for index, message in sorted(record_store.messages.items()):
+        timestamp = record_store.timestamps[index]
+        if math.isnan(timestamp):
+            continue
+        match = CHECKPOINT_MARKER.search(message)
+        if match is None:
+            continue
+        anchor = (match.group(2), float(match.group(1)), timestamp)
+        # Same marker logged twice (unreal.log + print)
+        if anchors and anchors[-1][:2] == anchor[:2]:
+            continue
+        anchors.append(anchor)
+    return anchors
+
+
+def clock_origins(anchors):
+    """
+    Wall-clock time of generator ms 0, per generator run
+    
+    The generator clock restarts with every map of a batch session: a checkpoint with a
+    smaller ms than the one before starts the next run. BATCH_MAP_* markers come from
+    Maps/map_job.py, which keeps one clock for the whole session.
+    
+    Returns:
+        tuple: ([origin_seconds per generator run], batch_origin_seconds or None)
+    """
+    origins = []
+    batch_origin = None
+    previous = None
+    for name, ms, timestamp in anchors:
+        # Log lines can only be later than the marker: the earliest estimate is the best one
+        origin = timestamp - ms / 1000
+        if name.startswith(BATCH_PREFIX):
+            batch_origin = origin if batch_origin is None else min(batch_origin, origin)
+            continue
+        if previous is None or ms < previous:
+            origins.append(origin)
+        else:
+            origins[-1] = min(origins[-1], origin)
+        previous = ms
+    return origins, batch_origin
+
+
+def _runs(timestamps):
+    """Generator run index of each timestamp (a timestamp below the previous one starts a new run)"""
+    run = 0
+    previous = None
+    for timestamp in timestamps:
+        if previous is not None and timestamp < previous:
+            run += 1
+        previous = timestamp
+        yield run
+
+
+def engine_phases(record_store, gap=PHASE_GAP):
+    """
+    Slices of the engine phases from the log categories
+    
+    Returns:
+        list: [(phase, start_seconds, end_seconds, records), ...] ordered by phase, then start
+    """
+    phase_of = {}
+    for phase, categories in PHASE_CATEGORIES.items():
+        for category in categories:
+            phase_of[category] = phase
+    code_phase = [phase_of.get(name) for name in record_store.category_names]
+    
+    open_slices = {}  # phase -> [start, end, records]
+    slices = []
+    for timestamp, code in zip(record_store.timestamps, record_store.categories):
+        phase = code_phase[code]
+        if phase is None or math.isnan(timestamp):
+            continue
+        current = open_slices.get(phase)
+        if current is not None and timestamp - current[1] <= gap:
+            current[1] = max(current[1], timestamp)
+            current[2] += 1
+            continue
+        if current is not None:
+            slices.append((phase, *current))
+        open_slices[phase] = [timestamp, timestamp, 1]
+    slices.extend((phase, *current) for phase, current in open_slices.items())
+    
+    order = list(PHASE_CATEGORIES)
+    slices.sort(key=lambda entry: (order.index(entry[0]), entry[1]))
+    return slices
+
+
+def _metadata(pid, tid, kind, **args):
+    """Metadata event (kind: process_name / thread_name / *_sort_index)"""
+    return {'ph': 'M', 'pid': pid, 'tid': tid, 'name': kind, 'args': args}
+
+
+def build_chrome_trace(trace_info, record_store):
+    """
+    Chrome Trace Event document of one attempt
+    
+    Args:
+        trace_info: TraceInfo of the attempt (spans, module_history, checkpoints, batch_maps)
+        record_store: RecordStore of the attempt's UE5 log (OutputMonitor.record_store)
+    
+    Returns:
+        dict: {"traceEvents": [...], "displayTimeUnit": "ms", "otherData": {...}}
+    """
+    start = record_store.start_time()
+    anchors = checkpoint_anchors(record_store) if start is not None else []
+    origins, batch_origin = clock_origins(anchors)
+    if start is None:
+        start = 0.0
+    fallback = origins[0] if origins else start  # No checkpoint in the log: ms 0 = first log line
+    
+    def generator_us(ms, run):
+        origin = origins[min(run, len(origins) - 1)] if origins else fallback
+        return round((origin - start) * 1000000 + ms * 1000, 3)
+    
+    events = [
+        _metadata(GENERATOR_PID, 0, 'process_name', name="Generator"),
+        _metadata(GENERATOR_PID, 0, 'process_sort_index', sort_index=0),
+        _metadata(GENERATOR_PID, SPAN_TID, 'thread_name', name="spans"),
+        _metadata(GENERATOR_PID, TRACE_TID, 'thread_name', name="trace markers"),
+        _metadata(ENGINE_PID, 0, 'process_name', name="UE5"),
+        _metadata(ENGINE_PID, 0, 'process_sort_index', sort_index=1),
+    ]
+    
+    # Generator runs: end of each run's clock for spans that never ended (crash, kill)
+    trace_runs = list(_runs(entry['timestamp'] for entry in trace_info.module_history))
+    span_runs = list(_runs(entry['start'] for entry in trace_info.spans))
+    run_end = {}
+    for entry, run in zip(trace_info.module_history, trace_runs):
+        run_end[run] = max(run_end.get(run, entry['timestamp']), entry['timestamp'])
+    for entry, run in zip(trace_info.spans, span_runs):
+        last = entry['end'] if entry['end'] is not None else entry['start']
+        run_end[run] = max(run_end.get(run, last), last)
+    
+    for entry, run in zip(trace_info.spans, span_runs):
+        end = entry['end'] if entry['end'] is not None else run_end[run]
+        args = dict(entry['attributes'])
+        args['status'] = entry['status'] or "open"
+        events.append({
+            'ph': 'X', 'pid': GENERATOR_PID, 'tid': SPAN_TID, 'cat': "span", 'name': entry['name'],
+            'ts': generator_us(entry['start'], run),
+            'dur': round((end - entry['start']) * 1000, 3),
+            'args': args,
+        })
+    
+    for entry, run in zip(trace_info.module_history, trace_runs):
+        events.append({
+            'ph': 'i', 's': 't', 'pid': GENERATOR_PID, 'tid': TRACE_TID, 'cat': "trace",
+            'name': f"{entry['module']}:{entry['line']}",
+            'ts': generator_us(entry['timestamp'], run),
+            'args': {'status': entry['status'], 'context': entry['context']},
+        })
+    
+    generator_checkpoints = [entry for entry in trace_info.checkpoints if not entry['name'].startswith(BATCH_PREFIX)]
+    checkpoint_runs = _runs(entry['timestamp'] for entry in generator_checkpoints)
+    for entry, run in zip(generator_checkpoints, checkpoint_runs):
+        events.append({
+            'ph': 'i', 's': 'p', 'pid': GENERATOR_PID, 'tid': SPAN_TID, 'cat': "checkpoint",
+            'name': entry['name'], 'ts': generator_us(entry['timestamp'], run), 'args': {'line': entry['line']},
+        })
+    
+    # Batch sessions: one slice per map on the map_job clock
+    if trace_info.batch_maps:
+        events.append(_metadata(GENERATOR_PID, BATCH_TID, 'thread_name', name="batch maps"))
+        origin = batch_origin if batch_origin is not None else fallback
+        for map_name, entry in trace_info.batch_maps.items():
+            end = entry['end'] if entry['end'] is not None else entry['start']
+            events.append({
+                'ph': 'X', 'pid': GENERATOR_PID, 'tid': BATCH_TID, 'cat': "batch", 'name': map_name,
+                'ts': round((origin - start) * 1000000 + entry['start'] * 1000, 3),
+                'dur': round((end - entry['start']) * 1000, 3),
+                'args': {'status': entry['status']},
+            })
+    
+    # Engine: whole session plus one track per phase
+    timed = [timestamp for timestamp in record_store.timestamps if not math.isnan(timestamp)]
+    if timed:
+        events.append(_metadata(ENGINE_PID, SESSION_TID, 'thread_name', name="session"))
+        events.append({
+            'ph': 'X', 'pid': ENGINE_PID, 'tid': SESSION_TID, 'cat': "engine", 'name': "UE5",
+            'ts': 0, 'dur': round((max(timed) - start) * 1000000, 3), 'args': {'records': len(record_store)},
+        })
+    for tid, phase in enumerate(PHASE_CATEGORIES, start=1):
+        events.append(_metadata(ENGINE_PID, tid, 'thread_name', name=phase))
+        events.append(_metadata(ENGINE_PID, tid, 'thread_sort_index', sort_index=tid))
+    tids = {phase: tid for tid, phase in enumerate(PHASE_CATEGORIES, start=1)}
+    for phase, phase_start, phase_end, records in engine_phases(record_store):
+        events.append({
+            'ph': 'X', 'pid': ENGINE_PID, 'tid': tids[phase], 'cat': "phase", 'name': phase,
+            'ts': round((phase_start - start) * 1000000, 3),
+            'dur': round((phase_end - phase_start) * 1000000, 3),
+            'args': {'records': records},
+        })
+    
+    return {
+        'traceEvents': events,
+        'displayTimeUnit': "ms",
+        'otherData': {'start_time': start, 'clock_anchors': len(anchors)},
+    }
+
+
+def write_chrome_trace(path, document):
+    """Write a trace document atomically (temporary file + rename)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    os.replace(temp_file, path)
+
+
+def export_timeline(trace_info, record_store, path):
+    """
+    Build and write one attempt's timeline
+    
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        write_chrome_trace(path, build_chrome_trace(trace_info, record_store))
+    except OSError as e:
+        print(f"[警告] 导出时间线失败: {e}")
+        return False
+    print(f"✓ 时间线已导出: {path} (chrome://tracing / ui.perfetto.dev)")
+    return True
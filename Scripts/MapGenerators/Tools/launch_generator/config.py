@@ -2,16 +2,26 @@
 Configuration module - paths and settings
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Engine and project paths
-ENGINE_PATH = r"D:\UnrealEngine570\Engine\Binaries\Win64\UnrealEditor-Cmd.exe"
-PROJECT_PATH = r"D:\001xm\shijiewuxian\shijiewuxian.uproject"
+# LAUNCH_GENERATOR_ENGINE / LAUNCH_GENERATOR_PROJECT override them (e.g. fake_engine.py on Linux agents)
+ENGINE_PATH = os.environ.get('LAUNCH_GENERATOR_ENGINE', r"D:\UnrealEngine570\Engine\Binaries\Win64\UnrealEditor-Cmd.exe")
+PROJECT_PATH = os.environ.get('LAUNCH_GENERATOR_PROJECT', r"D:\001xm\shijiewuxian\shijiewuxian.uproject")
+
+# Map generator scripts: absolute root passed to UE5, relative dir for discovery (from project root)
+SCRIPT_ROOT = "D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps"
+MAPS_DIR = Path("Scripts/MapGenerators/Maps")
 
 # Get map name from command line
 MAP_NAME = sys.argv[1] if len(sys.argv) > 1 else "cosmos_002_training_world"
-SCRIPT_PATH = f"D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/{MAP_NAME}/generate.py"
+SCRIPT_PATH = f"{SCRIPT_ROOT}/{MAP_NAME}/generate.py"
+
+# Single-session batch generation (batch_main.py): all maps in one editor process
+BATCH_SCRIPT_PATH = f"{SCRIPT_ROOT}/batch_generate.py"
+BATCH_LOG_FILE = MAPS_DIR / "batch_last_run.log"
 
 # Debug mode: True = show all output, False = compressed summary only
 DEBUG_MODE = False
@@ -20,10 +30,64 @@ DEBUG_MODE = False
 TIMEOUT_SECONDS = 10  # Auto-stop after N seconds of silence (after first output)
 CHECK_INTERVAL = 5    # Check every N seconds
 
+# Adaptive per-phase timeouts (phase_budget.py): budgets learned from past successful runs
+# Budget for the phase after a checkpoint = max(MIN_SECONDS, percentile(durations) * MARGIN),
+# TIMEOUT_SECONDS until MIN_SAMPLES runs were recorded
+PHASE_HISTORY_FILE = Path("Saved/MapGenerators/phase_budgets.json")
+PHASE_HISTORY_SIZE = 50         # Durations kept per phase
+PHASE_BUDGET_MIN_SAMPLES = 3
+PHASE_BUDGET_PERCENTILE = 95
+PHASE_BUDGET_MARGIN = 2.0
+PHASE_BUDGET_MIN_SECONDS = 3
+
+# Run history (run_history.py / history_cli.py): every attempt is stored here
+HISTORY_DB = Path("Saved/MapGenerators/run_history.db")
+
+# Output line store (line_store.py): recent lines stay in memory, older ones spill to a temp file
+LINE_STORE_WINDOW = 20000       # Lines kept in memory per attempt
+LINE_STORE_SPILL_DIR = None     # None = system temp directory
+
+# Full UE5 log (log_writer.py): streamed to disk by a background thread while UE5 runs
+# 'auto' = zstd when the zstandard package is installed, else gzip; None = plain text
+# Output goes to <full_log_file>.gz / .zst with a line index sidecar <...>.idx
+FULL_LOG_COMPRESSION = 'auto'
+FULL_LOG_FLUSH_SECONDS = 5          # Buffered lines are written at least this often
+FULL_LOG_FLUSH_BYTES = 1024 * 1024  # ... or once this much is buffered (and at every CHECKPOINT)
+
+# UE5 log categories of shader / asset compilation (log_record.py dispatch):
+# OutputMonitor pauses the silence timeout while they report compiling, TraceInfo.compilation_detected
+COMPILE_CATEGORIES = ['LogShaderCompilers', 'LogShaders', 'LogMaterial', 'LogAssetCompiler', 'LogStaticMesh', 'LogTexture']
+
+# Fatal signatures (fatal_detector.py): a matching line terminates UE5 at once
+#   retry:   result code 2 (retry) instead of 1 (failure)
+#   per_map: error of the current map only - ignored in batch mode, where the next map still runs
+# (SCRIPT_ERROR is not one: the traceback and the error manifest follow it, and the manifest ends the session)
+FATAL_PATTERNS = [
+    {'name': 'required_assets', 'pattern': r'Failed to load required assets',
+     'reason': "必需资源加载失败", 'retry': False, 'per_map': True},
+    {'name': 'python_traceback', 'pattern': r'LogPython: Error: Traceback',
+     'reason': "Python 异常", 'retry': False, 'per_map': True},
+    {'name': 'engine_fatal', 'pattern': r'Fatal error:|=== Critical error: ===',
+     'reason': "UE5 致命错误", 'retry': False, 'per_map': False},
+]
+
 # Retry settings
 MAX_ATTEMPTS = 5      # Maximum retry attempts
 RETRY_DELAY = 3       # Seconds to wait between retries
 
+# Warm editor daemon (daemon_main.py): one editor stays alive, jobs are sent over remote execution
+# Own multicast port (engine default is 6766) so a manually opened editor is never picked up
+DAEMON_MULTICAST_GROUP = ('239.0.0.1', 6767)
+DAEMON_MULTICAST_BIND_ADDRESS = '127.0.0.1'
+DAEMON_COMMAND_ENDPOINT = ('127.0.0.1', 6777)
+DAEMON_STARTUP_TIMEOUT = 900        # Seconds for the editor to boot and answer pings (cold DDC compiles shaders)
+DAEMON_JOB_TIMEOUT = 600            # Seconds per job before the editor is considered hung
+DAEMON_MAX_JOBS = 20                # Recycle the editor after N jobs
+DAEMON_MAX_MEMORY_GROWTH_MB = 2048  # Recycle when editor RSS grew this much since it became ready
+
+# Parallel generation (parallel_main.py): each editor instance keeps several cores busy
+MAX_CONCURRENT_GENERATIONS = max(1, (os.cpu_count() or 1) // 4)
+
 
 def to_ue5_map_name(map_name):
     """Convert cosmos_002_training_world to Cosmos_002_Training_World"""
@@ -31,6 +95,36 @@ def to_ue5_map_name(map_name):
     return '_'.join(word.capitalize() for word in parts)
 
 
+def get_map_settings(map_name):
+    """
+    Per-map paths for launchers that handle several maps in one process
+    
+    Returns:
+        dict: map_name, script_path, ue5_map_name, map_path, log_file,
+              full_log_file, ue5_log_file, result_file, trace_events_file, timeline_file
+    """
+    ue5_map_name = to_ue5_map_name(map_name)
+    return {
+        'map_name': map_name,
+        'script_path': f"{SCRIPT_ROOT}/{map_name}/generate.py",
+        'ue5_map_name': ue5_map_name,
+        'map_path': Path(f"Content/Maps/{ue5_map_name}.umap"),
+        'log_file': MAPS_DIR / map_name / "last_run.log",
+        'full_log_file': MAPS_DIR / map_name / "ue5_full_log.txt",
+        'ue5_log_file': UE5_LOG_DIR / "MapGenerators" / f"{map_name}.log",
+        'result_file': RESULT_DIR / f"{map_name}.result.json",
+        'trace_events_file': RESULT_DIR / f"{map_name}.trace.jsonl",
+        'timeline_file': RESULT_DIR / f"{map_name}.timeline.json",
+    }
+
+
+def discover_maps():
+    """List map names that have a Maps/<map>/generate.py entry point"""
+    if not MAPS_DIR.exists():
+        return []
+    return sorted(p.parent.name for p in MAPS_DIR.glob("*/generate.py"))
+
+
 # Derived paths
 UE5_MAP_NAME = to_ue5_map_name(MAP_NAME)
 MAP_PATH = Path(f"Content/Maps/{UE5_MAP_NAME}.umap")
@@ -38,4 +132,34 @@ LOG_FILE = Path(f"Scripts/MapGenerators/Maps/{MAP_NAME}/last_run.log")
 FULL_LOG_FILE = Path(f"Scripts/MapGenerators/ue5_full_log.txt")
 # UE5 log file - will be determined dynamically
 UE5_LOG_DIR = Path("Saved/Logs")
+UE5_LOG_PATTERN = "shijiewuxian*.log"
 UE5_LOG_FILE = None  # Will be set by get_latest_ue5_log()
+DAEMON_UE5_LOG_FILE = UE5_LOG_DIR / "MapGenerators" / "editor_daemon.log"
+
+# Result manifests written by the generator (generate/result_writer.py) when it finishes
+RESULT_DIR = Path("Saved/MapGenerators")
+RESULT_FILE = RESULT_DIR / f"{MAP_NAME}.result.json"
+
+# Generator TRACE markers (generate/trace.py): buffered and written as one block per checkpoint
+# False = every marker is written immediately (passed to UE5 as MAPGEN_TRACE_BUFFERED)
+TRACE_BUFFERED = True
+
+# Structured trace events (trace_events.py): the generator also appends every TRACE/CHECKPOINT
+# marker as JSON to <map>.trace.jsonl (passed as MAPGEN_TRACE_EVENTS), which the launcher tails
+# instead of parsing the markers out of the UE5 log. False = parse the text markers
+TRACE_EVENTS = True
+TRACE_EVENTS_FILE = RESULT_DIR / f"{MAP_NAME}.trace.jsonl"
+BATCH_TRACE_EVENTS_FILE = RESULT_DIR / "batch.trace.jsonl"
+
+# Timeline export (chrome_trace.py): each attempt's spans, TRACE markers, checkpoints and the
+# engine phases inferred from the log categories, as Chrome Trace Event JSON
+# (open in chrome://tracing or ui.perfetto.dev). Overwritten by every attempt
+TIMELINE_EXPORT = True
+TIMELINE_FILE = RESULT_DIR / f"{MAP_NAME}.timeline.json"
+BATCH_TIMELINE_FILE = RESULT_DIR / "batch.timeline.json"
+
+# Output source: True = stream UE5 -stdout through a pipe, False = tail Saved/Logs (fallback)
+STREAM_STDOUT = False
+
+# Log watching: max seconds between process liveness checks while waiting for log events
+LOG_WAIT_TIMEOUT = 0.5
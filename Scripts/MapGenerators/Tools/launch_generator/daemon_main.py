@@ -0,0 +1,100 @@
+"""
+Daemon entry point - keeps one UE5 editor warm and regenerates maps on request
+
+Usage:
+    python daemon_main.py [map_name ...] [--exit]
+    
+    Maps given on the command line run first. Afterwards each entered map name
+    is submitted as a job; an empty line repeats the last job, q quits.
+"""
+
+import argparse
+import sys
+from config import DAEMON_MAX_JOBS, DAEMON_MAX_MEMORY_GROWTH_MB, get_map_settings, discover_maps
+from path_setup import setup_paths
+from editor_daemon import EditorDaemon
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="常驻UE5编辑器，按需生成地图")
+    parser.add_argument('maps', nargs='*', help="启动后立即生成的地图")
+    parser.add_argument('--exit', action='store_true', help="生成完命令行中的地图后退出")
+    parser.add_argument('--max-jobs', type=int, default=DAEMON_MAX_JOBS,
+                        help=f"运行N个任务后重启编辑器 (默认: {DAEMON_MAX_JOBS})")
+    parser.add_argument('--max-memory-growth', type=int, default=DAEMON_MAX_MEMORY_GROWTH_MB,
+                        help=f"内存增长超过N MB后重启编辑器 (默认: {DAEMON_MAX_MEMORY_GROWTH_MB})")
+    return parser.parse_args(argv)
+
+
+def run_job(daemon, map_name):
+    """Run one job and print its result line"""
+    result, reason = daemon.run_job(get_map_settings(map_name))
+    icon = "✓" if result == 0 else "✗"
+    print(f"\n{icon} {map_name}: {reason}\n")
+    return result
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    
+    # Setup paths
+    if not setup_paths():
+        return 1
+    
+    known_maps = discover_maps()
+    
+    print("\n" + "="*60)
+    print("  地图生成器 (守护模式: 常驻UE5编辑器)")
+    print("="*60)
+    print(f"可用地图: {', '.join(known_maps) or '(无)'}")
+    print(f"回收策略: {args.max_jobs} 个任务 / 内存增长 {args.max_memory_growth}MB")
+    print("="*60 + "\n")
+    
+    daemon = EditorDaemon(max_jobs=args.max_jobs, max_memory_growth_mb=args.max_memory_growth)
+    last_map = None
+    exit_code = 0
+    try:
+        for map_name in args.maps:
+            exit_code |= run_job(daemon, map_name)
+            last_map = map_name
+        
+        if args.exit:
+            return 1 if exit_code else 0
+        
+        if not daemon.is_running and not daemon.start():
+            return 1
+        
+        while True:
+            try:
+                entry = input(f"地图名称 (回车=重复 {last_map or '-'}, q=退出): ").strip()
+            except EOFError:
+                break
+            if entry.lower() in ('q', 'quit', 'exit'):
+                break
+            map_name = entry or last_map
+            if not map_name:
+                continue
+            if map_name not in known_maps:
+                print(f"✗ 未知地图: {map_name}")
+                continue
+            exit_code = run_job(daemon, map_name)
+            last_map = map_name
+    except KeyboardInterrupt:
+        print("\n[守护] 用户中断")
+    finally:
+        print("[守护] 关闭编辑器...")
+        daemon.stop()
+    
+    return 1 if exit_code else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"FATAL ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,272 @@
+"""
+Editor daemon module - keeps one UE5 editor warm and runs generation jobs in it
+Jobs are sent over PythonScriptPlugin remote execution; the editor is recycled
+after DAEMON_MAX_JOBS jobs or DAEMON_MAX_MEMORY_GROWTH_MB of memory growth
+
+Known limitation: the job's log output only arrives with the command result, so the
+fatal signatures are checked after the job and silence timeouts / phase budgets do not
+apply - a hung job blocks for DAEMON_JOB_TIMEOUT (600 s) before the editor is terminated.
+"""
+
+import socket
+import subprocess
+import time
+from datetime import datetime
+from config import (
+    DEBUG_MODE, SCRIPT_ROOT, DAEMON_MULTICAST_GROUP, DAEMON_MULTICAST_BIND_ADDRESS,
+    DAEMON_COMMAND_ENDPOINT, DAEMON_STARTUP_TIMEOUT, DAEMON_JOB_TIMEOUT, DAEMON_MAX_JOBS,
+    DAEMON_MAX_MEMORY_GROWTH_MB, DAEMON_UE5_LOG_FILE
+)
+from output_monitor import OutputMonitor
+from trace_parser import TraceInfo
+from process_runner import build_ue5_command, build_ue5_env, handle_line, export_session_timeline, open_trace_events, read_trace_events
+from remote_execution import RemoteExecutionClient, RemoteExecutionError, MODE_EXEC_FILE, MODE_EVAL_STATEMENT
+from summary_generator import get_compressed_summary
+from log_saver import save_logs
+from result_analyzer import analyze_batch_result, print_log_activity, print_progress_stats, print_trace_info
+from result_manifest import clear_result_files, read_manifest
+from fatal_detector import FatalDetector
+from run_history import record_attempt
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Log prefixes so captured command output looks like UE5 log lines to parse_line
+OUTPUT_PREFIXES = {
+    'Info': 'LogPython: ',
+    'Warning': 'LogPython: Warning: ',
+    'Error': 'LogPython: Error: ',
+}
+
+# Run once after connecting (MODE_EXEC_FILE: literal multi-line code; MODE_EXEC_STATEMENT takes a single statement)
+SETUP_COMMAND = f"import sys\nif {SCRIPT_ROOT!r} not in sys.path:\n    sys.path.insert(0, {SCRIPT_ROOT!r})"
+QUIT_COMMAND = "import unreal\nunreal.SystemLibrary.quit_editor()"
+
+
+def remote_execution_args():
+    """Command line overrides that enable remote execution on the daemon's own endpoint"""
+    section = '[/Script/PythonScriptPlugin.PythonScriptPluginSettings]'
+    group_ip, group_port = DAEMON_MULTICAST_GROUP
+    return [
+        f'-ini:Engine:{section}:bRemoteExecution=True',
+        f'-ini:Engine:{section}:RemoteExecutionMulticastGroupEndpoint={group_ip}:{group_port}',
+        f'-ini:Engine:{section}:RemoteExecutionMulticastBindAddress={DAEMON_MULTICAST_BIND_ADDRESS}',
+    ]
+
+
+def get_process_memory_mb(pid):
+    """Resident memory of a process in MB (psutil, /proc fallback), None if unavailable"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class EditorDaemon:
+    """
+    One long-lived UE5 editor that runs map generation jobs on request
+    
+    Usage:
+        daemon = EditorDaemon()
+        result, reason = daemon.run_job(get_map_settings("cosmos_002_training_world"))
+        daemon.stop()
+    """
+    
+    def __init__(self, max_jobs=DAEMON_MAX_JOBS, max_memory_growth_mb=DAEMON_MAX_MEMORY_GROWTH_MB):
+        self.max_jobs = max_jobs
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.process = None
+        self.client = None
+        self.jobs_run = 0
+        self.baseline_memory_mb = None
+        self.editors_started = 0
+    
+    @property
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None and self.client is not None
+    
+    def start(self):
+        """
+        Launch the editor and connect to it
+        
+        Returns:
+            bool: True when the editor answers remote execution commands
+        """
+        DAEMON_UE5_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        cmd = build_ue5_command(None, [f'-ABSLOG={DAEMON_UE5_LOG_FILE.absolute()}', *remote_execution_args()])
+        
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] [守护] 启动常驻UE5编辑器...")
+        start = time.time()
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=build_ue5_env()
+        )
+        self.editors_started += 1
+        if DEBUG_MODE:
+            print(f"[DEBUG] [守护] 进程PID: {self.process.pid}")
+        
+        # Editor answers pings only once it finished booting (and compiling shaders)
+        self.client = RemoteExecutionClient(DAEMON_MULTICAST_GROUP, DAEMON_COMMAND_ENDPOINT, DAEMON_MULTICAST_BIND_ADDRESS)
+        node = None
+        while node is None and self.process.poll() is None and time.time() - start < DAEMON_STARTUP_TIMEOUT:
+            node = self.client.discover(timeout=5)
+        
+        try:
+            if node is None:
+                raise RemoteExecutionError(f"{DAEMON_STARTUP_TIMEOUT}秒内未发现编辑器 (进程{'已退出' if self.process.poll() is not None else '无响应'})")
+            self.client.connect(node['node_id'])
+            response = self.client.run_command(SETUP_COMMAND, MODE_EXEC_FILE, timeout=30)
+            if not response.get('success'):
+                raise RemoteExecutionError(f"初始化命令失败: {str(response.get('result', '')).strip()[:200]}")
+        except (RemoteExecutionError, OSError) as e:
+            print(f"[守护] ✗ 无法连接编辑器: {e}")
+            print(f"  请检查: {DAEMON_UE5_LOG_FILE}")
+            self.stop()
+            return False
+        
+        self.jobs_run = 0
+        self.baseline_memory_mb = get_process_memory_mb(self.process.pid)
+        print(f"[守护] ✓ 编辑器就绪 (用时 {time.time() - start:.1f}秒)")
+        return True
+    
+    def stop(self):
+        """Close the connection and shut the editor down"""
+        if self.client is not None:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.client.run_command(QUIT_COMMAND, MODE_EXEC_FILE, timeout=5)
+                except (RemoteExecutionError, OSError):
+                    pass
+            self.client.close()
+            self.client = None
+        
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                    self.process.wait()
+        self.process = None
+    
+    def recycle_reason(self):
+        """Why the editor should be restarted before the next job (None = keep it)"""
+        if self.jobs_run >= self.max_jobs:
+            return f"已运行 {self.jobs_run} 个任务"
+        if self.baseline_memory_mb is not None:
+            memory_mb = get_process_memory_mb(self.process.pid)
+            if memory_mb is not None and memory_mb - self.baseline_memory_mb > self.max_memory_growth_mb:
+                return f"内存增长 {memory_mb - self.baseline_memory_mb:.0f}MB"
+        return None
+    
+    def _collect_output(self, output, monitor, trace_info, detector=None):
+        """Feed the log output captured during the command through the normal line pipeline"""
+        for entry in output:
+            prefix = OUTPUT_PREFIXES.get(entry.get('type'), 'LogPython: ')
+            for line in str(entry.get('output', '')).splitlines():
+                handle_line(f"{prefix}{line}\n", monitor, trace_info, detector)
+    
+    def run_job(self, settings):
+        """
+        Generate one map in the warm editor (starting or recycling it as needed)
+        
+        Args:
+            settings: Per-map settings from config.get_map_settings()
+        
+        Returns:
+            tuple: (result_code, reason_message) - same contract as run_generation_attempt
+        """
+        map_name = settings['map_name']
+        
+        if not self.is_running:
+            if self.process is not None:
+                print("[守护] 编辑器已退出，重新启动")
+                self.stop()
+            if not self.start():
+                return (2, "常驻编辑器启动失败")
+        
+        old_size, old_mtime = 0, None
+        if settings['map_path'].exists():
+            old_stat = settings['map_path'].stat()
+            old_size, old_mtime = old_stat.st_size, old_stat.st_mtime
+        
+        clear_result_files([settings['result_file']])
+        monitor = OutputMonitor(log_file=settings['log_file'], full_log_file=settings['full_log_file'])
+        trace_info = TraceInfo()
+        
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] [守护] 任务 #{self.jobs_run + 1}: {map_name}")
+        start = time.time()
+        failure = None
+        try:
+            # The editor's environment is fixed at startup: the event file is named per job
+            try:
+                trace_info.trace_events = open_trace_events(settings['trace_events_file'])
+            except OSError as e:
+                print(f"[守护] ⚠ 无法准备追踪事件文件，改为解析文本标记: {e}")
+            events_path = str(trace_info.trace_events.path.absolute()) if trace_info.trace_events else None
+            response = self.client.run_command(
+                f"__import__('map_job').run_job({map_name!r}, {events_path!r})",
+                MODE_EVAL_STATEMENT,
+                timeout=DAEMON_JOB_TIMEOUT
+            )
+            # The job already ended: a fatal line classifies its result and recycles the editor
+            detector = FatalDetector(include_per_map=False)
+            self._collect_output(response.get('output') or [], monitor, trace_info, detector)
+            if trace_info.fatal_match:
+                self.stop()
+            elif not response.get('success'):
+                failure = (1, f"编辑器内执行失败: {str(response.get('result', '')).strip()[:200]}")
+        except socket.timeout:
+            print(f"[守护] ✗ 任务超过 {DAEMON_JOB_TIMEOUT} 秒，终止编辑器")
+            failure = (1, f"任务超时 ({DAEMON_JOB_TIMEOUT}秒)")
+            self.stop()
+        except (RemoteExecutionError, OSError) as e:
+            print(f"[守护] ✗ 与编辑器的连接中断: {e}")
+            failure = (2, "任务执行中编辑器退出")
+            self.stop()
+        finally:
+            monitor.stop()
+            read_trace_events(trace_info, final=True)
+            if trace_info.trace_events is not None:
+                trace_info.trace_events.close()
+            self.jobs_run += 1
+        
+        print("\n" + "="*60)
+        print(f"  执行摘要 (压缩) - {map_name} ({time.time() - start:.1f}秒)")
+        print("="*60)
+        print(get_compressed_summary(monitor))
+        print_progress_stats(trace_info)
+        print_log_activity(monitor.record_store)
+        print_trace_info(trace_info)
+        print("="*60)
+        save_logs(monitor)
+        export_session_timeline(trace_info, monitor, settings['timeline_file'])
+        
+        manifests = {map_name: read_manifest(settings['result_file'])}
+        result = failure or analyze_batch_result(trace_info, [settings], {map_name: (old_size, old_mtime)}, manifests)[map_name]
+        record_attempt(map_name, "daemon", 1, result, trace_info, monitor)
+        
+        if self.is_running:
+            reason = self.recycle_reason()
+            if reason:
+                print(f"[守护] 回收编辑器: {reason}")
+                self.stop()
+        
+        return result
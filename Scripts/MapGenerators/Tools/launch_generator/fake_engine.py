@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Fake engine module - UnrealEditor-Cmd stand-in for running the launcher without UE5
+
+Takes the same command line as the real editor (<project> -ExecCmds="py <script> [maps]"
+-stdout -unattended -ABSLOG=...) and writes a realistic log stream into Saved/Logs:
+startup noise, a shader-compile burst, the generator's TRACE/CHECKPOINT markers,
+then the .umap and result manifest - or a hang/crash/Python error on request.
+
+Select it with the engine override (config.ENGINE_PATH):
+    export LAUNCH_GENERATOR_ENGINE=$PWD/Scripts/MapGenerators/Tools/launch_generator/fake_engine.py
+
+Behaviour (environment variables):
+    FAKE_ENGINE_SCENARIO   success | hang | crash | python_error (default: success),
+                           or per map: map_b=hang,map_c=crash (other maps: success)
+    FAKE_ENGINE_FAIL_AT    Step where hang/crash/python_error happens (default: SAVE_MAP)
+    FAKE_ENGINE_SPEED      Time scale, 10 = ten times faster than a real editor (default: 1)
+    FAKE_ENGINE_NOISE      Startup noise lines (default: 300)
+    FAKE_ENGINE_SHADERS    Shaders in the compile burst, 0 = warm DDC (default: 200)
+    FAKE_ENGINE_EXIT       idle = stay open after the script like -ExecCmds does, quit = exit (default: idle)
+
+Batch scripts (batch_generate.py <map> ...) get BATCH_MAP_* markers per map and write
+the manifests after BATCH_COMPLETE, like Maps/map_job.py.
+With MAPGEN_TRACE_EVENTS set, markers are also written as trace events (trace_events.py).
+An editor started without -ExecCmds (editor daemon) only idles - remote execution is not emulated.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from config import to_ue5_map_name
+from run_history import get_step_timings
+from trace_events import trace_events_path, write_event
+
+
+# Generator steps in execution order (names of the BEFORE_/AFTER_ checkpoints)
+MAP_STEPS = ["CREATE_LEVEL", "BUILD_ROOM", "PLACE_PLAYER", "SETUP_LIGHTING", "CONFIG_GAMEMODE", "SAVE_MAP"]
+
+# Seconds per step at speed 1 (everything else takes STEP_SECONDS)
+STEP_SECONDS = 0.3
+STEP_DURATIONS = {"SAVE_MAP": 1.0, "BUILD_ROOM": 0.6}
+
+# Startup noise templates (category, message)
+NOISE_TEMPLATES = [
+    ("LogPluginManager", "Mounting Engine plugin Plugin{n}"),
+    ("LogConfig", "Set CVar [[r.Setting{n}:1]]"),
+    ("LogInit", "Display: Initializing subsystem {n}"),
+    ("LogAssetRegistry", "Display: Asset registry cache read as {n}.1 MiB"),
+    ("LogSlate", "Could not load file for Slate resource: [../../../Engine/Content/Slate/Icon{n}.png]"),
+    ("LogStreaming", "Display: FlushAsyncLoading({n}): 1 QueuedPackages, 0 AsyncPackages"),
+]
+
+
+class FakeEditor:
+    """Writes UE5-formatted log lines to the log file (and stdout with -stdout)"""
+    
+    def __init__(self, log_path, echo_stdout, speed):
+        self.log_path = log_path
+        self.echo_stdout = echo_stdout
+        self.speed = speed
+        self.frame = 0
+        self.start = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.span_ids = []  # Open spans, innermost last
+        self.next_span_id = 1
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log = open(log_path, 'w', encoding='utf-8')
+        # Created up front like generate/trace.py does at import
+        self.events = trace_events_path()
+        if self.events is not None:
+            try:
+                self.events.touch()
+            except OSError:
+                self.events = None
+    
+    def sleep(self, seconds):
+        if self.speed > 0:
+            time.sleep(seconds / self.speed)
+    
+    def elapsed_ms(self):
+        """Generator clock in ms (3 decimals, like generate/trace.py), scaled like every other duration"""
+        return round((time.perf_counter() - self.start) * 1000 * (self.speed if self.speed > 0 else 1), 3)
+    
+    def raw(self, text):
+        self.log.write(text + "\n")
+        self.log.flush()
+        if self.echo_stdout:
+            print(text, flush=True)
+    
+    def emit(self, category, message):
+        # Log timestamps follow the scaled clock too, so they line up with the marker ms
+        now = self.started_at + timedelta(milliseconds=self.elapsed_ms())
+        self.raw(f"[{now.strftime('%Y.%m.%d-%H.%M.%S')}:{now.microsecond // 1000:03d}][{self.frame:3d}]{category}: {message}")
+    
+    def python(self, message, twice=False):
+        """LogPython line - markers appear twice (unreal.log + print)"""
+        for _ in range(2 if twice else 1):
+            self.emit("LogPython", message)
+    
+    def checkpoint(self, name, line=1):
+        elapsed_ms = self.elapsed_ms()
+        if self.events is not None:
+            write_event(self.events, {'type': 'checkpoint', 'line': line, 'ms': elapsed_ms,
+                                      'ns': round(elapsed_ms * 1000000), 'name': name})
+        self.python(f"[CHECKPOINT:{line}:{elapsed_ms:.3f}] {name}", twice=True)
+    
+    def trace(self, module, line, context, status="success"):
+        elapsed_ms = self.elapsed_ms()
+        if self.events is not None:
+            write_event(self.events, {'type': 'trace', 'module': module, 'line': line, 'ms': elapsed_ms,
+                                      'ns': round(elapsed_ms * 1000000), 'status': status, 'context': context})
+        self.python(f"[TRACE:{module}:{line}:{elapsed_ms:.3f}:{status}] {context}", twice=True)
+    
+    def begin_span(self, name):
+        elapsed_ms = self.elapsed_ms()
+        span_id, parent = self.next_span_id, (self.span_ids[-1] if self.span_ids else 0)
+        self.next_span_id += 1
+        self.span_ids.append(span_id)
+        if self.events is not None:
+            write_event(self.events, {'type': 'span_begin', 'id': span_id, 'parent': parent, 'ms': elapsed_ms,
+                                      'ns': round(elapsed_ms * 1000000), 'name': name})
+        self.python(f"[SPAN_BEGIN:{span_id}:{parent}:{elapsed_ms:.3f}] {name}", twice=True)
+    
+    def end_span(self, name, status="success", attributes=None):
+        """Close the innermost span (name as passed to begin_span)"""
+        elapsed_ms = self.elapsed_ms()
+        span_id = self.span_ids.pop()
+        if self.events is not None:
+            write_event(self.events, {'type': 'span_end', 'id': span_id, 'ms': elapsed_ms, 'ns': round(elapsed_ms * 1000000),
+                                      'status': status, 'name': name, 'attributes': attributes or {}})
+        suffix = f" {json.dumps(attributes, ensure_ascii=False)}" if attributes else ""
+        self.python(f"[SPAN_END:{span_id}:{elapsed_ms:.3f}:{status}] {name}{suffix}", twice=True)
+    
+    def close(self):
+        self.log.close()
+
+
+def get_scenario(setting, map_folder):
+    """Scenario of one map from FAKE_ENGINE_SCENARIO (one for all maps, or map=scenario pairs)"""
+    if '=' not in setting:
+        return setting
+    pairs = dict(entry.split('=', 1) for entry in setting.split(',') if '=' in entry)
+    return pairs.get(map_folder, 'success')
+
+
+def parse_command_line(argv):
+    """
+    Pick the arguments the fake engine cares about
+    
+    Returns:
+        dict: project, script, script_args, abslog, stdout
+    """
+    options = {'project': argv[0] if argv else '', 'script': None, 'script_args': [], 'abslog': None, 'stdout': False}
+    for arg in argv[1:]:
+        if arg.startswith('-ExecCmds='):
+            command = arg[len('-ExecCmds='):].strip('"').split()
+            if len(command) >= 2 and command[0] == 'py':
+                options['script'] = command[1]
+                options['script_args'] = command[2:]
+        elif arg.startswith('-ABSLOG='):
+            options['abslog'] = arg[len('-ABSLOG='):]
+        elif arg.lower() == '-stdout':
+            options['stdout'] = True
+    return options
+
+
+def get_project_dir(project):
+    """Folder of the .uproject when it exists here, else the working directory (launcher runs from the project root)"""
+    path = Path(project)
+    return path.parent if path.is_file() else Path.cwd()
+
+
+def get_project_name(project):
+    """Project name from a Windows or POSIX .uproject path"""
+    return re.split(r'[\\/]', project)[-1].rsplit('.', 1)[0] or "UnrealEditor"
+
+
+def get_maps(script, script_args):
+    """Maps generated by the -ExecCmds script: batch_generate.py <maps> or Maps/<map>/generate.py"""
+    parts = re.split(r'[\\/]', script)
+    if parts[-1] == "batch_generate.py":
+        return list(script_args), True
+    return [parts[-2] if len(parts) >= 2 else "unknown_map"], False
+
+
+def write_manifest(project_dir, map_folder, ue5_map_name, status, checkpoints, total_ms, error=None):
+    """Result manifest in the generator's format (generate/result_writer.py), written atomically"""
+    map_file = project_dir / "Content" / "Maps" / f"{ue5_map_name}.umap"
+    result = {
+        'status': status,
+        'map_name': ue5_map_name,
+        'map_path': f"/Game/Maps/{ue5_map_name}",
+        'map_file': str(map_file),
+        'size': None,
+        'sha256': None,
+        'steps': get_step_timings(checkpoints),
+        'total_ms': total_ms,
+        'error': error,
+        'written_at': time.time(),
+    }
+    if status == "success":
+        data = map_file.read_bytes()
+        result['size'] = len(data)
+        result['sha256'] = hashlib.sha256(data).hexdigest()
+    
+    result_file = project_dir / "Saved" / "MapGenerators" / f"{map_folder}.result.json"
+    result_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = result_file.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, result_file)
+
+
+def startup(editor, noise_lines, shaders):
+    """Engine boot: noise, then a shader-compile burst"""
+    editor.raw(f"Log file open, {datetime.now().strftime('%m/%d/%y %H:%M:%S')}")
+    for n in range(noise_lines):
+        category, message = NOISE_TEMPLATES[n % len(NOISE_TEMPLATES)]
+        editor.emit(category, message.format(n=n))
+        editor.sleep(2.0 / max(noise_lines, 1))
+    
+    if shaders:
+        editor.emit("LogShaderCompilers", "Display: Compiling shader autogen file: ../../../Intermediate/ShaderAutogen/PCD3D_SM6/AutogenShaderHeaders.ush")
+        done = 0
+        while done < shaders:
+            batch = min(random.randint(10, 40), shaders - done)
+            done += batch
+            editor.frame += 1
+            editor.emit("LogShaderCompilers", f"Display: Worker (1/8): shaders left to compile {shaders - done}")
+            editor.sleep(3.0 * batch / shaders)
+        editor.emit("LogShaderCompilers", f"Display: Shader compilation finished: {shaders} jobs")
+    editor.emit("LogInit", "Display: Engine is initialized. Leaving FEngineLoop::Init()")
+
+
+def fail(editor, scenario, step):
+    """
+    Inject the requested failure at step
+    
+    Returns:
+        str: Error message (python_error), the process exits/hangs for the other scenarios
+    """
+    if scenario == "hang":
+        editor.emit("LogStreaming", f"Display: Waiting for package {step.lower()} to finish loading...")
+        while True:
+            time.sleep(60)
+    if scenario == "crash":
+        editor.emit("LogWindows", "Error: === Critical error: ===")
+        editor.emit("LogWindows", f"Error: Fatal error: [File:FakeEngine.cpp] [Line: 42] Access violation during {step}")
+        editor.close()
+        os._exit(3)
+    return f"{step} failed: simulated Python error"
+
+
+def generate_map(editor, project_dir, map_folder, scenario, fail_at, manifests):
+    """
+    Emit one generator run (generate/main.py) and save the .umap
+    
+    Args:
+        manifests: List the run's write_manifest() arguments are appended to - the caller
+                   writes them after its last marker
+    
+    Returns:
+        bool: True when the map was generated
+    """
+    ue5_map_name = to_ue5_map_name(map_folder)
+    checkpoints = []
+    
+    def checkpoint(name, line=1):
+        checkpoints.append((name, editor.elapsed_ms()))
+        editor.checkpoint(name, line)
+    
+    checkpoint("SCRIPT_START", 13)
+    editor.python("STARTING MAP GENERATOR")
+    editor.trace("main", 24, "创建生成器实例")
+    checkpoint("BEFORE_GENERATOR_INIT", 28)
+    editor.trace("generator", 20, "TrainingMapGenerator初始化")
+    editor.sleep(STEP_SECONDS)
+    checkpoint("AFTER_GENERATOR_INIT", 30)
+    checkpoint("BEFORE_GENERATE_MAP", 33)
+    editor.begin_span("generate_map")
+    
+    error = None
+    for index, step in enumerate(MAP_STEPS):
+        checkpoint(f"BEFORE_{step}", 50 + index * 6)
+        editor.trace("generator", 51 + index * 6, f"步骤{index + 1}: {step}", status="start")
+        editor.begin_span(step.lower())
+        if scenario != "success" and step == fail_at:
+            error = fail(editor, scenario, step)
+            editor.end_span(step.lower(), status="error")
+            break
+        editor.sleep(STEP_DURATIONS.get(step, STEP_SECONDS))
+        if step == "SAVE_MAP":
+            map_file = project_dir / "Content" / "Maps" / f"{ue5_map_name}.umap"
+            map_file.parent.mkdir(parents=True, exist_ok=True)
+            map_file.write_bytes(os.urandom(random.randint(32, 128) * 1024))
+            editor.emit("LogSavePackage", f"Display: Moving '{map_file}.tmp' to '{map_file}'")
+        editor.end_span(step.lower())
+        editor.trace("generator", 53 + index * 6, f"步骤{index + 1}完成")
+        checkpoint(f"AFTER_{step}", 54 + index * 6)
+    
+    if error:
+        editor.end_span("generate_map", status="error")
+        editor.trace("main", 48, f"错误: {error}", status="error")
+        checkpoint("SCRIPT_ERROR", 49)
+        editor.emit("LogPython", "Error: Traceback (most recent call last):")
+        editor.emit("LogPython", f"Error:   File \"{map_folder}/generate/generator.py\", line 87, in generate_map")
+        editor.emit("LogPython", f"Error: RuntimeError: {error}")
+        manifests.append((project_dir, map_folder, ue5_map_name, "error", checkpoints, editor.elapsed_ms(), error))
+        return False
+    
+    checkpoint("GENERATION_COMPLETE", 90)
+    editor.end_span("generate_map")
+    checkpoint("AFTER_GENERATE_MAP", 35)
+    editor.trace("main", 38, "生成成功")
+    checkpoint("SCRIPT_SUCCESS", 55)
+    manifests.append((project_dir, map_folder, ue5_map_name, "success", checkpoints, editor.elapsed_ms()))
+    return True
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    options = parse_command_line(sys.argv[1:] if argv is None else argv)
+    scenario = os.environ.get('FAKE_ENGINE_SCENARIO', 'success')
+    fail_at = os.environ.get('FAKE_ENGINE_FAIL_AT', 'SAVE_MAP')
+    speed = float(os.environ.get('FAKE_ENGINE_SPEED', '1'))
+    noise_lines = int(os.environ.get('FAKE_ENGINE_NOISE', '300'))
+    shaders = int(os.environ.get('FAKE_ENGINE_SHADERS', '200'))
+    stay_idle = os.environ.get('FAKE_ENGINE_EXIT', 'idle') == 'idle'
+    
+    project_dir = get_project_dir(options['project'])
+    log_path = Path(options['abslog']) if options['abslog'] else \
+        project_dir / "Saved" / "Logs" / f"{get_project_name(options['project'])}.log"
+    editor = FakeEditor(log_path, options['stdout'], speed)
+    
+    startup(editor, noise_lines, shaders)
+    
+    exit_code = 0
+    if options['script']:
+        editor.emit("Cmd", f"py {' '.join([options['script'], *options['script_args']])}")
+        maps, batch = get_maps(options['script'], options['script_args'])
+        succeeded = 0
+        manifests = []
+        for map_folder in maps:
+            if batch:
+                editor.checkpoint(f"BATCH_MAP_START:{map_folder}")
+            ok = generate_map(editor, project_dir, map_folder, get_scenario(scenario, map_folder), fail_at, manifests)
+            succeeded += ok
+            if batch:
+                editor.checkpoint(f"BATCH_MAP_END:{map_folder}:{'success' if ok else 'error'}")
+        if batch:
+            editor.checkpoint(f"BATCH_COMPLETE:{succeeded}/{len(maps)}")
+        # Manifests last: the launcher stops the editor once they exist
+        for manifest in manifests:
+            write_manifest(*manifest)
+        exit_code = 0 if succeeded == len(maps) else 1
+    
+    # UnrealEditor-Cmd keeps running after -ExecCmds until it is closed
+    if stay_idle:
+        editor.emit("LogPlayLevel", "Display: Destroying online subsystem :Context_1")
+        while True:
+            time.sleep(60)
+    editor.emit("LogExit", "Exiting.")
+    editor.close()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
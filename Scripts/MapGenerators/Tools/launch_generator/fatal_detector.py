@@ -0,0 +1,73 @@
+"""
+Fatal detector module - matches unrecoverable error signatures as each line arrives
+A match stops monitoring at once so the editor is terminated instead of idling until the silence timeout
+"""
+
+import re
+from config import FATAL_PATTERNS
+
+
+class FatalDetector:
+    """
+    Evaluates FATAL_PATTERNS against every UE5 output line
+    
+    All patterns are combined into one alternation with a named group per rule,
+    so each line costs a single regex search.
+    
+    Usage:
+        detector = FatalDetector()
+        if detector.check(line, trace_info):
+            ...  # trace_info.fatal_match is set
+    """
+    
+    def __init__(self, patterns=FATAL_PATTERNS, include_per_map=True):
+        """
+        Args:
+            patterns: Rule dicts (name, pattern, reason, retry, per_map)
+            include_per_map: False in batch mode - a failing map does not stop the other maps
+        """
+        self.rules = {}
+        alternatives = []
+        for index, rule in enumerate(patterns):
+            if rule.get('per_map') and not include_per_map:
+                continue
+            group = f"rule{index}"
+            self.rules[group] = rule
+            alternatives.append(f"(?P<{group}>{rule['pattern']})")
+        self._regex = re.compile('|'.join(alternatives)) if alternatives else None
+    
+    def check(self, line, trace_info):
+        """
+        Match one line against the fatal signatures
+        
+        Returns:
+            dict: Match (name, reason, retry, line) when the line is fatal, else None
+        """
+        if self._regex is None:
+            return None
+        found = self._regex.search(line)
+        if not found:
+            return None
+        
+        rule = self.rules[found.lastgroup]
+        match = {
+            'name': rule['name'],
+            'reason': rule['reason'],
+            'retry': rule.get('retry', False),
+            'line': line.strip(),
+        }
+        # Keep the first fatal line - later ones are usually consequences of it
+        if trace_info.fatal_match is None:
+            trace_info.fatal_match = match
+        return match
+
+
+def classify_fatal(fatal_match):
+    """
+    Result for a run that was stopped by the fatal detector
+    
+    Returns:
+        tuple: (result_code, reason_message) - 2 for retryable rules, else 1
+    """
+    result_code = 2 if fatal_match['retry'] else 1
+    return (result_code, f"{fatal_match['reason']}: {fatal_match['line'][:100]}")
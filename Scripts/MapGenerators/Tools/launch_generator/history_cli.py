@@ -0,0 +1,161 @@
+"""
+Run history CLI - trend, percentile and regression reports over run_history.db
+
+Usage:
+    python history_cli.py list [map_name] [-n 20]
+    python history_cli.py trend map_name [-n 20]
+    python history_cli.py percentile map_name [-n 50] [-p 50 90 95]
+    python history_cli.py regression map_name [--baseline 10] [--recent 5] [--threshold 20]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from config import HISTORY_DB
+from path_setup import setup_paths
+from phase_budget import percentile
+from run_history import RunHistory
+
+
+# Pseudo-step for the whole attempt (wall time, seconds -> ms)
+TOTAL_STEP = "TOTAL"
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="地图生成运行历史报告")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    list_parser = commands.add_parser('list', help="最近的运行记录")
+    list_parser.add_argument('map_name', nargs='?', help="地图名称 (默认: 全部)")
+    list_parser.add_argument('-n', '--limit', type=int, default=20)
+    
+    trend_parser = commands.add_parser('trend', help="各步骤耗时趋势 (成功运行)")
+    trend_parser.add_argument('map_name')
+    trend_parser.add_argument('-n', '--limit', type=int, default=20)
+    
+    percentile_parser = commands.add_parser('percentile', help="各步骤耗时百分位")
+    percentile_parser.add_argument('map_name')
+    percentile_parser.add_argument('-n', '--limit', type=int, default=50)
+    percentile_parser.add_argument('-p', '--percentiles', type=float, nargs='+', default=[50, 90, 95])
+    
+    regression_parser = commands.add_parser('regression', help="最近运行与基线对比")
+    regression_parser.add_argument('map_name')
+    regression_parser.add_argument('--baseline', type=int, default=10, help="基线运行数 (默认: 10)")
+    regression_parser.add_argument('--recent', type=int, default=5, help="最近运行数 (默认: 5)")
+    regression_parser.add_argument('--threshold', type=float, default=20, help="变慢超过N%%视为回归 (默认: 20)")
+    return parser.parse_args(argv)
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _step_samples(series):
+    """{step: [duration_ms, ...]} over a step series, including TOTAL wall time"""
+    samples = {}
+    for run, steps in series:
+        samples.setdefault(TOTAL_STEP, []).append(run['wall_seconds'] * 1000)
+        for step, duration_ms in steps.items():
+            samples.setdefault(step, []).append(duration_ms)
+    return samples
+
+
+def cmd_list(history, args):
+    """Print recent runs"""
+    runs = history.get_runs(args.map_name, args.limit)
+    if not runs:
+        print("(无运行记录)")
+        return 0
+    print(f"{'时间':<20} {'地图':<28} {'模式':<9} {'尝试':>4} {'结果':>4} {'耗时':>9} {'行数':>7}  原因")
+    for run in runs:
+        print(f"{_format_time(run['started_at']):<20} {run['map_name']:<28} {run['mode']:<9} "
+              f"{run['attempt']:>4} {run['result_code']:>4} {run['wall_seconds']:>8.1f}s {run['line_count']:>7}  {run['reason'] or ''}")
+    return 0
+
+
+def cmd_trend(history, args):
+    """Print step durations run by run"""
+    series = history.get_step_series(args.map_name, args.limit)
+    if not series:
+        print(f"(无成功运行记录: {args.map_name})")
+        return 0
+    steps = list(_step_samples(series))
+    print(f"{'时间':<20} " + " ".join(f"{step:>16}" for step in steps))
+    for run, timings in series:
+        values = dict(timings, **{TOTAL_STEP: run['wall_seconds'] * 1000})
+        cells = [f"{values[step] / 1000:>15.2f}s" if step in values else f"{'-':>16}" for step in steps]
+        print(f"{_format_time(run['started_at']):<20} " + " ".join(cells))
+    return 0
+
+
+def cmd_percentile(history, args):
+    """Print per-step percentiles"""
+    series = history.get_step_series(args.map_name, args.limit)
+    if not series:
+        print(f"(无成功运行记录: {args.map_name})")
+        return 0
+    print(f"{args.map_name}: 最近 {len(series)} 次成功运行")
+    print(f"{'步骤':<20} {'样本':>4} " + " ".join(f"{'p' + format(p, 'g'):>10}" for p in args.percentiles))
+    for step, values in _step_samples(series).items():
+        cells = [f"{percentile(values, p) / 1000:>9.2f}s" for p in args.percentiles]
+        print(f"{step:<20} {len(values):>4} " + " ".join(cells))
+    return 0
+
+
+def cmd_regression(history, args):
+    """
+    Compare the median of the most recent runs against the median of the runs before them
+    
+    Returns:
+        int: 1 when any step regressed beyond the threshold (usable as a CI gate)
+    """
+    series = history.get_step_series(args.map_name, args.baseline + args.recent)
+    if len(series) <= args.recent:
+        print(f"(成功运行记录不足: 需要超过 {args.recent} 次，当前 {len(series)} 次)")
+        return 0
+    baseline = _step_samples(series[:-args.recent])
+    recent = _step_samples(series[-args.recent:])
+    
+    regressed = False
+    print(f"{args.map_name}: 最近 {args.recent} 次 vs 之前 {len(series) - args.recent} 次 (中位数)")
+    print(f"{'步骤':<20} {'基线':>10} {'最近':>10} {'变化':>9}")
+    for step, recent_values in recent.items():
+        if step not in baseline:
+            continue
+        before = percentile(baseline[step], 50)
+        after = percentile(recent_values, 50)
+        change = (after - before) / before * 100 if before > 0 else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  ✗ 回归"
+            regressed = True
+        print(f"{step:<20} {before / 1000:>9.2f}s {after / 1000:>9.2f}s {change:>+8.1f}%{flag}")
+    return 1 if regressed else 0
+
+
+COMMANDS = {
+    'list': cmd_list,
+    'trend': cmd_trend,
+    'percentile': cmd_percentile,
+    'regression': cmd_regression,
+}
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    
+    # Setup paths (database path is relative to the project root)
+    if not setup_paths():
+        return 1
+    if not HISTORY_DB.exists():
+        print(f"✗ 运行历史不存在: {HISTORY_DB}")
+        return 1
+    
+    with RunHistory() as history:
+        return COMMANDS[args.command](history, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Line classifier module - one scan per UE5 line for every substring the launcher looks for
+OutputMonitor, parse_line and SummaryAggregator read the resulting bitset instead of
+searching the line themselves
+
+Patterns are combined into one precompiled alternation (longest first). A match also
+sets every pattern contained in the matched text, and patterns that could start inside the
+match and run past its end are checked at exactly those positions, so the result equals
+`any(pattern in line)` per signal.
+
+Usage:
+    python line_classifier.py <recorded_log> [--repeat 20]    (throughput benchmark)
+"""
+
+import re
+import sys
+import time
+
+
+# Signals (bits of the classification result)
+LOG_PYTHON = 1 << 0
+TRACE_MARKER = 1 << 1
+CHECKPOINT_MARKER = 1 << 2
+SCRIPT_START = 1 << 3
+COMPILE_ACTIVITY = 1 << 4       # trace_parser: compilation detected
+PYTHON_ERROR_WORD = 1 << 5      # 'ERROR' / 'Exception'
+ERROR_WORD = 1 << 6             # 'ERROR' / 'Failed' / 'Error' (periodic summary)
+UPPER_ERROR = 1 << 7            # 'ERROR'
+FAILED_TO_LOAD = 1 << 8
+GENERATOR_ACTOR = 1 << 9        # 'TrainingRoom' / 'PlayerStart'
+SUCCESS_WORD = 1 << 10
+SUCCESS_BANNER = 1 << 11        # 'SUCCESS!'
+PROGRESS_STEP = 1 << 12         # '[1/6]' ... '[6/6]'
+STEP_MARKER = 1 << 13           # STEP_MARKERS
+FUNCTION_MARKER = 1 << 14       # FUNCTION_MARKERS
+ACTOR_MARKER = 1 << 15          # ACTOR_MARKERS
+COMPILING_NOCASE = 1 << 16      # OutputMonitor shader compile start/end (case-insensitive)
+SHADER_NOCASE = 1 << 17
+DONE_NOCASE = 1 << 18           # 'compiled' / 'complete' / 'finished'
+SPAN_MARKER = 1 << 19           # '[SPAN_BEGIN:' / '[SPAN_END:'
+
+# Periodic summary keywords: keyword -> (bit, substrings)
+KEYWORD_PATTERNS = {
+    '编译': ['Compiling', 'LogShaderCompilers'],
+    '着色器': ['Shader', 'Shading'],
+    '加载': ['Loading', 'Loaded', 'LogStreaming'],
+    '保存': ['Saving', 'Saved'],
+    '构建': ['Building', 'Build'],
+    '材质': ['Material'],
+    '纹理': ['Texture'],
+    '音频': ['Audio', 'LogAudio'],
+    '初始化': ['Initializing', 'Initialize'],
+    '挂载': ['Mounted', 'Pak', 'LogPakFile'],
+    '处理': ['Processing', 'Generating', 'Creating'],
+    '注册': ['Registered', 'Register'],
+    '插件': ['Plugin'],
+    '动画': ['Animation', 'Anim'],
+    '配置': ['Config', 'LogConfig'],
+    '网络': ['Messaging', 'Network'],
+    '警告': ['Warning'],
+    '刷新': ['Flushing', 'Flush'],
+    '元数据': ['Metadata'],
+    '设备': ['Device', 'Driver']
+}
+KEYWORD_BITS = {keyword: 1 << (32 + index) for index, keyword in enumerate(KEYWORD_PATTERNS)}
+
+# Detail tables - consumers only look them up when the matching signal is set
+PROGRESS_STEPS = ['[1/6]', '[2/6]', '[3/6]', '[4/6]', '[5/6]', '[6/6]']
+# Final summary: substring -> completed step (summary_aggregator)
+STEP_MARKERS = [
+    ('STARTING MAP GENERATOR', "✓ 脚本启动"),
+    ('[1/6] Preparing level', "✓ [1/6] 准备Level"),
+    ('[2/6] Placing TrainingRoom', "✓ [2/6] 放置TrainingRoom"),
+    ('[3/6] Placing PlayerStart', "✓ [3/6] 放置PlayerStart"),
+    ('[4/6] Setting up lighting', "✓ [4/6] 设置照明"),
+    ('[5/6] Configuring GameMode', "✓ [5/6] 配置GameMode"),
+    ('[6/6] Saving map', "✓ [6/6] 保存地图"),
+    ('Map generation completed successfully', "✓ 地图生成完成"),
+]
+# Last executed generator function: substring -> description (trace_parser)
+FUNCTION_MARKERS = {
+    'Preparing level': "create_new_level() - 准备Level",
+    'Map exists, loading': "create_new_level() - 加载现有地图",
+    'Getting world reference': "create_new_level() - 获取World引用",
+    'Map loaded, will regenerate': "create_new_level() - 地图加载完成",
+    'Level ready': "create_new_level() - Level准备完成",
+    'Creating training room': "place_training_room() - 开始创建训练室",
+    'Loading cube mesh': "place_training_room() - 加载Cube网格",
+    'Loading plane mesh': "place_training_room() - 加载Plane网格",
+    'Training room geometry created': "place_training_room() - 训练室创建完成",
+    'Placing PlayerStart': "place_player_start() - 放置PlayerStart",
+    'PlayerStart placed': "place_player_start() - PlayerStart放置完成",
+    'Setting up lighting': "setup_lighting() - 设置照明",
+    'Lighting system configured': "setup_lighting() - 照明系统配置完成",
+    'Configuring GameMode': "configure_game_mode() - 配置GameMode",
+    'GameMode set to': "configure_game_mode() - GameMode设置完成",
+    'Saving map': "save_map() - 保存地图",
+    'Map saved successfully': "save_map() - 地图保存成功",
+    'Map generation completed': "generate_map() - 地图生成完成",
+    'STARTING MAP GENERATOR': "main() - 脚本启动"
+}
+# Every substring trace_parser._track_actors looks for
+ACTOR_MARKERS = [
+    'Created:', 'Created transparent partition:', 'light created:', 'PlayerStart placed', 'Total actors created:',
+    'Dynamic material created', '动态材质创建成功', 'Failed to create dynamic material', '创建动态材质失败',
+    'Asset loaded:', '资源加载成功', 'Failed to load asset', '资源加载失败',
+]
+
+# Signal -> (substrings, ignore_case)
+SIGNAL_PATTERNS = {
+    LOG_PYTHON: (['LogPython'], False),
+    TRACE_MARKER: (['[TRACE:'], False),
+    CHECKPOINT_MARKER: (['[CHECKPOINT:'], False),
+    SPAN_MARKER: (['[SPAN_BEGIN:', '[SPAN_END:'], False),
+    SCRIPT_START: (['STARTING MAP GENERATOR'], False),
+    COMPILE_ACTIVITY: (['Compiling', 'Building', 'Shader'], False),
+    PYTHON_ERROR_WORD: (['ERROR', 'Exception'], False),
+    ERROR_WORD: (['ERROR', 'Failed', 'Error'], False),
+    UPPER_ERROR: (['ERROR'], False),
+    FAILED_TO_LOAD: (['Failed to load'], False),
+    GENERATOR_ACTOR: (['TrainingRoom', 'PlayerStart'], False),
+    SUCCESS_WORD: (['SUCCESS'], False),
+    SUCCESS_BANNER: (['SUCCESS!'], False),
+    PROGRESS_STEP: (PROGRESS_STEPS, False),
+    STEP_MARKER: ([marker for marker, _ in STEP_MARKERS], False),
+    FUNCTION_MARKER: (list(FUNCTION_MARKERS), False),
+    ACTOR_MARKER: (ACTOR_MARKERS, False),
+    COMPILING_NOCASE: (['compiling'], True),
+    SHADER_NOCASE: (['shader'], True),
+    DONE_NOCASE: (['compiled', 'complete', 'finished'], True),
+}
+for _keyword, _patterns in KEYWORD_PATTERNS.items():
+    SIGNAL_PATTERNS[KEYWORD_BITS[_keyword]] = (_patterns, False)
+
+
+class _PatternScan:
+    """One alternation over a set of patterns, exact for overlapping matches"""
+    
+    def __init__(self, patterns):
+        self.patterns = patterns  # Pattern -> signal bits
+        self.regex = re.compile('|'.join(re.escape(pattern) for pattern in sorted(patterns, key=len, reverse=True)))
+        self.matches = {}  # Matched text -> (bits of every pattern inside it, overlapping continuations)
+    
+    def _analyze(self, text):
+        """
+        Bits of all patterns contained in a matched text, plus the patterns that may
+        start inside it and continue past its end: [(chars_before_end, pattern), ...]
+        """
+        bits = 0
+        continuations = []
+        for pattern, pattern_bits in self.patterns.items():
+            if pattern in text:
+                bits |= pattern_bits
+            for size in range(1, min(len(text), len(pattern))):
+                if text.endswith(pattern[:size]):
+                    continuations.append((size, pattern))
+        self.matches[text] = (bits, continuations)
+        return bits, continuations
+    
+    def scan(self, line):
+        signals = 0
+        matches = self.matches
+        for found in self.regex.finditer(line):
+            text = found.group()
+            bits, continuations = matches.get(text) or self._analyze(text)
+            signals |= bits
+            for size, pattern in continuations:
+                start = found.end() - size
+                if line.startswith(pattern, start):
+                    signals |= (matches.get(pattern) or self._analyze(pattern))[0]
+        return signals
+
+
+class LineClassifier:
+    """
+    Precompiled multi-pattern matcher
+    
+    Usage:
+        classifier = LineClassifier()
+        signals = classifier.classify(line)
+        if signals & LOG_PYTHON:
+            ...
+    """
+    
+    def __init__(self, signal_patterns=SIGNAL_PATTERNS):
+        exact = {}
+        folded = {}
+        for bit, (patterns, ignore_case) in signal_patterns.items():
+            table = folded if ignore_case else exact
+            for pattern in patterns:
+                pattern = pattern.lower() if ignore_case else pattern
+                table[pattern] = table.get(pattern, 0) | bit
+        # Case-insensitive patterns are matched against line.lower(): an IGNORECASE
+        # alternation is several times slower than lowering the line once
+        self._exact = _PatternScan(exact)
+        self._folded = _PatternScan(folded) if folded else None
+    
+    def classify(self, line):
+        """
+        Returns:
+            int: OR of the signal bits whose substrings occur in line
+        """
+        signals = self._exact.scan(line)
+        if self._folded is not None:
+            signals |= self._folded.scan(line.lower())
+        return signals
+
+
+def classify_naive(line, signal_patterns=SIGNAL_PATTERNS):
+    """Reference implementation: one substring search per pattern"""
+    signals = 0
+    lowered = line.lower()
+    for bit, (patterns, ignore_case) in signal_patterns.items():
+        haystack = lowered if ignore_case else line
+        if any(pattern in haystack for pattern in patterns):
+            signals |= bit
+    return signals
+
+
+# Shared instance - building the regex once per process
+classifier = LineClassifier()
+classify = classifier.classify
+
+
+def benchmark(lines):
+    """
+    Lines per second: naive per-pattern search vs. the combined classifier,
+    and the monitor + trace parser pipeline fed by the classifier
+    
+    Returns:
+        dict: naive, classifier, pipeline (lines per second)
+    """
+    import io
+    import contextlib
+    from output_monitor import OutputMonitor
+    from trace_parser import TraceInfo, parse_line
+    
+    def rate(run):
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return len(lines) / best
+    
+    def pipeline():
+        monitor = OutputMonitor()
+        trace_info = TraceInfo()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for line in lines:
+                signals = classify(line)
+                record = monitor.records.parse(line)
+                monitor.add_line(line, signals, record)
+                parse_line(line, trace_info, signals, record)
+    
+    return {
+        'naive': rate(lambda: [classify_naive(line) for line in lines]),
+        'classifier': rate(lambda: [classify(line) for line in lines]),
+        'pipeline': rate(pipeline),
+    }
+
+
+def main(argv=None):
+    """Benchmark entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="行分类器吞吐量基准 (行/秒)")
+    parser.add_argument('recording', help="录制的日志 (例如 Scripts/MapGenerators/ue5_full_log.txt)")
+    parser.add_argument('--repeat', type=int, default=20, help="日志重复次数 (默认: 20)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    
+    with open(args.recording, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.readlines() * args.repeat
+    mismatches = sum(1 for line in lines[:len(lines) // args.repeat] if classify(line) != classify_naive(line))
+    
+    rates = benchmark(lines)
+    print(f"行数: {len(lines)} (不一致: {mismatches})")
+    print(f"逐个子串搜索:  {rates['naive']:>12,.0f} 行/秒")
+    print(f"组合分类器:    {rates['classifier']:>12,.0f} 行/秒 ({rates['classifier'] / rates['naive']:.1f}x)")
+    print(f"监控+解析流程: {rates['pipeline']:>12,.0f} 行/秒")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Line store module - bounded-memory list of UE5 output lines
+Keeps the most recent lines in memory and spills older ones to an append-only
+temporary file with an offset index, so OutputMonitor memory stays flat.
+With spill=False older lines are only counted (OutputMonitor streams the full log
+to disk already - see log_writer.py - so spilling would write every line twice)
+"""
+
+import tempfile
+import threading
+from array import array
+from collections import deque
+from itertools import islice
+from config import LINE_STORE_WINDOW, LINE_STORE_SPILL_DIR
+
+
+# Lines read from the spill file per batch while iterating
+READ_BATCH = 4096
+
+
+class LineStore:
+    """
+    Append-only sequence of lines: list-like len(), indexing, slicing and iteration
+    
+    Usage:
+        lines = LineStore(window=20000)
+        lines.append("[...]LogPython: ...\\n")
+        last = lines[-1]
+        new = lines[last_index:]
+    
+    Without spilling, indexing a line that left the window raises IndexError and
+    slices start at the oldest line still held.
+    """
+    
+    def __init__(self, window=LINE_STORE_WINDOW, spill_dir=LINE_STORE_SPILL_DIR, spill=True):
+        self.window = max(1, window)
+        self.spill_dir = spill_dir
+        self.spill = spill
+        self.dropped = 0            # Lines discarded from the window (spill=False)
+        self._recent = deque()
+        self._offsets = array('Q')  # Byte offset of every spilled line (8 bytes per line)
+        self._spill = None          # Opened on first spill, deleted on close
+        self._spill_size = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def spilled(self):
+        """Number of lines moved to disk"""
+        return len(self._offsets)
+    
+    def __len__(self):
+        return self.dropped + len(self._offsets) + len(self._recent)
+    
+    def append(self, line):
+        """Add one line, spilling (or dropping) the oldest in-memory line when the window is full"""
+        with self._lock:
+            self._recent.append(line)
+            if len(self._recent) > self.window:
+                oldest = self._recent.popleft()
+                if self.spill:
+                    self._spill_line(oldest)
+                else:
+                    self.dropped += 1
+    
+    def _spill_line(self, line):
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="ue5_lines_", dir=self.spill_dir)
+        data = line.encode('utf-8', errors='replace')
+        self._spill.seek(self._spill_size)
+        self._spill.write(data)
+        self._offsets.append(self._spill_size)
+        self._spill_size += len(data)
+    
+    def _read_spilled(self, start, stop):
+        """Spilled lines [start, stop) - one read for the whole range"""
+        if start >= stop:
+            return []
+        end = self._offsets[stop] if stop < len(self._offsets) else self._spill_size
+        base = self._offsets[start]
+        self._spill.seek(base)
+        data = self._spill.read(end - base)
+        bounds = list(self._offsets[start:stop]) + [end]
+        return [data[bounds[i] - base:bounds[i + 1] - base].decode('utf-8', errors='replace')
+                for i in range(stop - start)]
+    
+    def _slice(self, start, stop):
+        """Lines [start, stop) across disk and memory (caller holds the lock)"""
+        start = max(start, self.dropped)
+        spilled = len(self._offsets)  # 0 when lines are dropped instead
+        lines = self._read_spilled(start, min(stop, spilled))
+        first_recent = self.dropped + spilled
+        if stop > first_recent:
+            lines.extend(islice(self._recent, max(start - first_recent, 0), stop - first_recent))
+        return lines
+    
+    def __getitem__(self, index):
+        with self._lock:
+            length = len(self)
+            if isinstance(index, slice):
+                wanted = range(*index.indices(length))
+                if not wanted:
+                    return []
+                if wanted.step == 1:
+                    return self._slice(wanted.start, wanted.stop)
+                low = min(wanted[0], wanted[-1])
+                lines = self._slice(low, max(wanted[0], wanted[-1]) + 1)
+                return [lines[i - low] for i in wanted]
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("LineStore index out of range")
+            if index < self.dropped:
+                raise IndexError("Line left the in-memory window (read it from the full log)")
+            return self._slice(index, index + 1)[0]
+    
+    def __iter__(self):
+        """Iterate over the lines present when iteration started, in batches"""
+        length = len(self)
+        for start in range(0, length, READ_BATCH):
+            yield from self[start:min(start + READ_BATCH, length)]
+    
+    def close(self):
+        """Delete the spill file"""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
@@ -0,0 +1,272 @@
+"""
+Log index module - line, category, error and marker positions of a saved UE5 log
+Built once per log (one pass), stored next to it as <log>.lineidx and reloaded in
+milliseconds; queries then slice the memory-mapped log (plain text) or decompress only
+the needed members of a streamed .gz / .zst log (log_writer.IndexedLogReader).
+
+Sidecar layout: one JSON header line, then the binary columns
+    offsets (Q, lines + 1, plain text only), categories (H), errors (Q), traces (Q)
+"""
+
+import io
+import json
+import mmap
+import os
+import re
+from array import array
+from pathlib import Path
+from log_record import VERBOSITIES
+from log_writer import FULL_LOG_HEADER, FULL_LOG_TRAILER, IndexedLogReader, has_index, open_full_log
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+INDEX_SUFFIX = '.lineidx'
+INDEX_VERSION = 1
+
+# Same shape as log_record.RECORD_PREFIX, on bytes
+RECORD_PREFIX = re.compile(
+    rb'(?:\[[^\]]*\]\[ *\d+\])?([A-Za-z_][A-Za-z0-9_]*): (?:(' + '|'.join(VERBOSITIES).encode() + rb'): )?'
+)
+ERROR_VERBOSITIES = (b'Error', b'Fatal')
+PYTHON_ERROR_WORDS = (b'ERROR', b'Exception')  # LogPython lines trace_parser counts as script errors
+CHECKPOINT = re.compile(rb'\[CHECKPOINT:[^\]]*\]\s*(.*?)\s*$')
+
+
+def index_path(log_path):
+    return Path(str(log_path) + INDEX_SUFFIX)
+
+
+def _is_compressed(log_path):
+    return Path(log_path).suffix in ('.gz', '.zst')
+
+
+def _source_stamp(log_path):
+    stat = os.stat(log_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class LogIndex:
+    """
+    Index of one saved log (line numbers are 0-based text lines, header included)
+    
+    Usage:
+        with LogIndex.open("ue5_full_log.txt.zst") as index:
+            line = index.errors[0]
+            text = index.lines(line - 20, line + 21)
+            start, stop = index.between('LEVEL_READY', 'MAP_SAVED')
+    """
+    
+    def __init__(self, log_path, header, offsets, categories, errors, traces):
+        self.log_path = Path(log_path)
+        self.header = header
+        self.category_names = header['categories']
+        self.checkpoints = header['checkpoints']  # [[line, name], ...]
+        self.offsets = offsets
+        self.categories = categories
+        self.errors = errors
+        self.traces = traces
+        self._map = None
+        self._reader = None
+        self._all_lines = None  # Compressed log without member index: decompressed once
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self):
+        return self.header['lines']
+    
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+    
+    # ------------------------------------------------------------ build / load
+    
+    @classmethod
+    def open(cls, log_path, rebuild=False):
+        """Load the sidecar index, (re)building it when missing or older than the log"""
+        if not rebuild:
+            index = cls.load(log_path)
+            if index is not None:
+                return index
+        index = cls.build(log_path)
+        try:
+            index.save()
+        except OSError:
+            pass  # Read-only location: the index still works, it is just rebuilt next time
+        return index
+    
+    @classmethod
+    def build(cls, log_path):
+        """One pass over the log"""
+        compressed = _is_compressed(log_path)
+        offsets = array('Q', [0])
+        categories = array('H')
+        errors = array('Q')
+        traces = array('Q')
+        names = [None]
+        codes = {None: 0}
+        checkpoints = []
+        category = 0
+        offset = 0
+        
+        with open_full_log(log_path, binary=True) as f:
+            for number, line in enumerate(f):
+                offset += len(line)
+                offsets.append(offset)
+                match = RECORD_PREFIX.match(line)
+                verbosity = None
+                if match is not None:
+                    name = match.group(1).decode('ascii')
+                    category = codes.get(name)
+                    if category is None:
+                        category = codes[name] = len(names)
+                        names.append(name)
+                    verbosity = match.group(2)
+                categories.append(category)  # Continuation lines keep the previous category
+                
+                python = names[category] == 'LogPython'
+                if match is not None and (verbosity in ERROR_VERBOSITIES or (
+                        python and any(word in line for word in PYTHON_ERROR_WORDS))):
+                    errors.append(number)  # Records only - a traceback is one error, not one per line
+                if python and b'[' in line:
+                    if b'[TRACE:' in line:
+                        traces.append(number)
+                    elif b'[CHECKPOINT:' in line:
+                        marker = CHECKPOINT.search(line)
+                        if marker is not None:
+                            checkpoints.append([number, marker.group(1).decode('utf-8', errors='replace')])
+        
+        header = dict(_source_stamp(log_path), version=INDEX_VERSION, lines=len(categories),
+                      compressed=compressed, categories=names, checkpoints=checkpoints)
+        return cls(log_path, header, array('Q') if compressed else offsets, categories, errors, traces)
+    
+    def save(self):
+        """Write <log>.lineidx"""
+        header = dict(self.header, offsets=len(self.offsets), errors=len(self.errors), traces=len(self.traces))
+        with open(index_path(self.log_path), 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            for column in (self.offsets, self.categories, self.errors, self.traces):
+                column.tofile(f)
+    
+    @classmethod
+    def load(cls, log_path):
+        """Sidecar index if it matches the log's size and mtime, else None"""
+        try:
+            with open(index_path(log_path), 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('version') != INDEX_VERSION or any(
+                        header.get(key) != value for key, value in _source_stamp(log_path).items()):
+                    return None
+                columns = []
+                for typecode, count in (('Q', header['offsets']), ('H', header['lines']),
+                                        ('Q', header['errors']), ('Q', header['traces'])):
+                    column = array(typecode)
+                    column.fromfile(f, count)
+                    columns.append(column)
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        return cls(log_path, header, *columns)
+    
+    # ------------------------------------------------------------ line access
+    
+    def lines(self, start, stop):
+        """
+        Returns:
+            list: Text lines [start, stop) with their line endings
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return []
+        if not self.header['compressed']:
+            if self._map is None:
+                with open(self.log_path, 'rb') as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._map[self.offsets[start]:self.offsets[stop]].decode('utf-8', errors='replace')
+            return io.StringIO(data, newline='\n').readlines()
+        if has_index(self.log_path):
+            return self._compressed_lines(start, stop)
+        if self._all_lines is None:
+            with open_full_log(self.log_path) as f:
+                self._all_lines = f.readlines()
+        return self._all_lines[start:stop]
+    
+    def _compressed_lines(self, start, stop):
+        """Header / trailer come from the writer's constants, UE5 lines from the members"""
+        if self._reader is None:
+            self._reader = IndexedLogReader(self.log_path)
+        header = io.StringIO(FULL_LOG_HEADER, newline='\n').readlines()
+        body_start = len(header)
+        body_stop = body_start + self._reader.line_count
+        lines = header[start:min(stop, body_start)]
+        if stop > body_start and start < body_stop:
+            lines += self._reader.read(max(start, body_start) - body_start, min(stop, body_stop) - body_start)
+        if stop > body_stop:
+            lines += io.StringIO(FULL_LOG_TRAILER, newline='\n').readlines()[max(start - body_stop, 0):stop - body_stop]
+        return lines
+    
+    def line(self, number):
+        lines = self.lines(number, number + 1)
+        return lines[0] if lines else None
+    
+    # ------------------------------------------------------------ queries
+    
+    def category_lines(self, category):
+        """Line numbers of every record of a category (continuation lines included)"""
+        try:
+            code = self.category_names.index(category)
+        except ValueError:
+            return []
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.categories, dtype=np.uint16) == code).tolist()
+        return [number for number, value in enumerate(self.categories) if value == code]
+    
+    def checkpoint(self, name):
+        """
+        Line of the first checkpoint called name (exact match first, then substring)
+        
+        Raises:
+            KeyError: no such checkpoint
+        """
+        for line, checkpoint in self.checkpoints:
+            if checkpoint == name:
+                return line
+        for line, checkpoint in self.checkpoints:
+            if name in checkpoint:
+                return line
+        raise KeyError(name)
+    
+    def between(self, first, last):
+        """
+        Returns:
+            tuple: (start, stop) lines from checkpoint first through checkpoint last
+        """
+        start = self.checkpoint(first)
+        end = self.checkpoint(last)
+        if end < start:
+            start, end = end, start
+        return start, end + 1
+    
+    def around_error(self, number=1, context=20):
+        """
+        Args:
+            number: 1 = first error, 2 = second, -1 = last ...
+        
+        Returns:
+            tuple: (error_line, start, stop), None if the log has fewer errors
+        """
+        try:
+            line = self.errors[number - 1 if number > 0 else number]
+        except IndexError:
+            return None
+        return line, max(line - context, 0), min(line + context + 1, len(self))
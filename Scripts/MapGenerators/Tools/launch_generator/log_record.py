@@ -0,0 +1,124 @@
+"""
+Log record module - splits a UE5 log line once into its fields
+`[2025.12.18-11.05.00:728][  0]LogPython: Warning: message`
+    -> timestamp, frame, category (interned), verbosity, message
+
+Consumers register handlers per category on a RecordDispatcher, so e.g. trace
+parsing only ever sees LogPython records instead of searching every line.
+Lines without a category prefix (multi-line messages, tab-indented dumps)
+continue the previous record: same timestamp, frame, category and verbosity.
+"""
+
+import re
+import sys
+
+
+# UE5 ELogVerbosity names as printed in the log ('Log' is not printed)
+VERBOSITIES = ('Fatal', 'Error', 'Warning', 'Display', 'Log', 'Verbose', 'VeryVerbose')
+DEFAULT_VERBOSITY = 'Log'
+
+# [timestamp][frame] (optional - missing before the log timer starts), Category: , Verbosity:
+RECORD_PREFIX = re.compile(
+    r'(?:\[([^\]]*)\]\[ *(\d+)\])?([A-Za-z_][A-Za-z0-9_]*): (?:(' + '|'.join(VERBOSITIES) + r'): )?'
+)
+
+
+class LogRecord:
+    """One parsed UE5 log line"""
+    
+    __slots__ = ('line', 'timestamp', 'frame', 'category', 'verbosity', 'message', 'continuation')
+    
+    def __init__(self, line, timestamp, frame, category, verbosity, message, continuation=False):
+        self.line = line                  # Raw line as received
+        self.timestamp = timestamp        # '2025.12.18-11.05.00:728' or None
+        self.frame = frame                # Engine frame counter or None
+        self.category = category          # Interned 'LogPython', ... or None
+        self.verbosity = verbosity
+        self.message = message            # Text after the prefix, without the line ending
+        self.continuation = continuation  # True = no prefix, fields taken from the previous record
+    
+    def __repr__(self):
+        return (f"LogRecord({self.timestamp!r}, {self.frame!r}, {self.category!r}, "
+                f"{self.verbosity!r}, {self.message!r})")
+
+
+def parse_record(line, previous=None):
+    """
+    Parse one UE5 log line
+    
+    Args:
+        line: Raw line
+        previous: Record of the line before (continuation lines take its fields)
+    
+    Returns:
+        LogRecord
+    """
+    match = RECORD_PREFIX.match(line)
+    if match is None:
+        if previous is None:
+            return LogRecord(line, None, None, None, DEFAULT_VERBOSITY, line.rstrip('\r\n'), True)
+        return LogRecord(line, previous.timestamp, previous.frame, previous.category,
+                         previous.verbosity, line.rstrip('\r\n'), True)
+    
+    timestamp, frame, category, verbosity = match.groups()
+    return LogRecord(
+        line,
+        timestamp,
+        int(frame) if frame is not None else None,
+        sys.intern(category),
+        verbosity or DEFAULT_VERBOSITY,
+        line[match.end():].rstrip('\r\n'),
+    )
+
+
+class LogRecordParser:
+    """
+    Parser for one output stream - remembers the previous record for continuation lines
+    
+    Usage:
+        records = LogRecordParser()
+        record = records.parse(line)
+        if record.category == 'LogPython':
+            ...
+    """
+    
+    def __init__(self):
+        self.previous = None
+    
+    def parse(self, line):
+        """Parse the next line of the stream"""
+        self.previous = parse_record(line, self.previous)
+        return self.previous
+
+
+class RecordDispatcher:
+    """
+    Calls the handlers registered for a record's category
+    
+    Usage:
+        handlers = RecordDispatcher()
+        handlers.register('LogPython', on_python)
+        handlers.register(['LogShaderCompilers', 'LogShaders'], on_compile)
+        handlers.dispatch(record, trace_info)    # on_python(record, trace_info)
+    """
+    
+    def __init__(self):
+        self._handlers = {}  # Category -> [handler, ...]
+    
+    def register(self, categories, handler):
+        """
+        Args:
+            categories: Category name or list of names
+            handler: Called as handler(record, *args) for records of those categories
+        """
+        if isinstance(categories, str):
+            categories = [categories]
+        for category in categories:
+            self._handlers.setdefault(sys.intern(category), []).append(handler)
+    
+    def dispatch(self, record, *args):
+        """Run the handlers of record.category (records without a category have none)"""
+        handlers = self._handlers.get(record.category)
+        if handlers:
+            for handler in handlers:
+                handler(record, *args)
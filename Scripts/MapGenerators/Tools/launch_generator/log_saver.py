@@ -19,17 +19,15 @@ def save_logs(monitor):
         except Exception as e:
             print(f"\n⚠ 保存压缩摘要失败: {e}")
     
-    # Save full log
-    if monitor.full_log_file:
-        try:
-            with open(monitor.full_log_file, 'w', encoding='utf-8') as f:
-                f.write("="*60 + "\n")
-                f.write("  完整输出日志\n")
-                f.write("="*60 + "\n\n")
-                for line in monitor.lines:
-                    f.write(line)
-                f.write("\n")
-            
-            print(f"✓ 完整日志已保存到: {monitor.full_log_file}")
-        except Exception as e:
-            print(f"⚠ 保存完整日志失败: {e}")
+    # Full log was streamed while UE5 ran (log_writer.py) - write the last member and close it
+    writer = monitor.full_log
+    if writer is not None:
+        writer.close()
+        if writer.error is not None:
+            print(f"⚠ 保存完整日志失败: {writer.error}")
+        else:
+            print(f"✓ 完整日志已保存到: {writer.path} "
+                  f"({writer.lines} 行, {writer.raw_bytes / 1024:.0f} KB → {writer.compressed_bytes / 1024:.0f} KB)")
+    
+    # Monitoring is over: delete the line store's spill file now, not at garbage collection
+    monitor.lines.close()
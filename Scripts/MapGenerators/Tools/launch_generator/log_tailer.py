@@ -0,0 +1,165 @@
+"""
+Log tailer module - persistent incremental reader for the UE5 log file
+Keeps the file handle open, reads large binary chunks and decodes UTF-8 incrementally
+"""
+
+import codecs
+import os
+
+
+# Bytes per read() call - multi-MB shader compile logs need only a handful of syscalls
+CHUNK_SIZE = 1024 * 1024
+
+
+class LineSplitter:
+    """
+    Incremental bytes -> lines converter shared by file tailing and pipe streaming
+    
+    - Incremental UTF-8 decoder: multibyte characters split across reads stay intact
+    - Partial-line buffer: only complete lines are returned
+    - Splits on '\n' only and normalizes Windows line endings (UE writes \r\n)
+    """
+    
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._partial = ''
+    
+    def feed(self, data):
+        """Decode a chunk of bytes and return the complete lines it finishes"""
+        return self.feed_text(self._decoder.decode(data))
+    
+    def feed_text(self, text):
+        """Append already-decoded text and return the complete lines it finishes"""
+        if not text:
+            return []
+        parts = (self._partial + text).split('\n')
+        self._partial = parts.pop()
+        return [(part[:-1] if part.endswith('\r') else part) + '\n' for part in parts]
+    
+    def flush(self):
+        """Return any buffered partial line (the writer has finished)"""
+        remaining = self._partial + self._decoder.decode(b'', final=True)
+        self.reset()
+        if remaining.endswith('\r'):
+            remaining = remaining[:-1]
+        return [remaining] if remaining else []
+    
+    def reset(self):
+        """Forget decoder state and partial line"""
+        self._decoder.reset()
+        self._partial = ''
+
+
+class LogTailer:
+    """
+    Long-lived tailer for one log file
+    
+    - Keeps the file open between polls (no reopen + seek per tick)
+    - Incremental decoding and partial-line buffering via LineSplitter
+    - Detects truncation (file shrank) and rotation (path now points to another file)
+    
+    Usage:
+        tailer = LogTailer(Path("Saved/Logs/shijiewuxian.log"))
+        for line in tailer.read_lines():
+            ...
+        tailer.close()
+    """
+    
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.truncations = 0
+        self.rotations = 0
+        self._file = None
+        self._identity = None
+        self._splitter = LineSplitter()
+    
+    def _open(self):
+        """Open the file if it exists; returns True when a handle is available"""
+        if self._file is not None:
+            return True
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            return False
+        st = os.fstat(self._file.fileno())
+        self._identity = (st.st_dev, st.st_ino)
+        self.position = 0
+        return True
+    
+    def _reset_stream(self):
+        """Forget decoder state and partial line (file content was replaced)"""
+        self._splitter.reset()
+        self.position = 0
+    
+    def _check_rotation(self):
+        """Return True if the path now refers to a different file than our handle"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) != self._identity
+    
+    def _read_available(self):
+        """Read everything currently available from the open handle as complete lines"""
+        lines = []
+        while True:
+            data = self._file.read(self.chunk_size)
+            if not data:
+                break
+            self.position += len(data)
+            lines.extend(self._splitter.feed(data))
+        return lines
+    
+    def read_lines(self):
+        """
+        Read all complete lines appended since the last call
+        
+        Returns:
+            list: Lines including their trailing newline
+        """
+        if not self._open():
+            return []
+        
+        # Truncation: file shrank below what we already consumed
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.position:
+            self.truncations += 1
+            self._file.seek(0)
+            self._reset_stream()
+        
+        lines = self._read_available()
+        
+        # Rotation: drain the old handle (done above), then switch to the new file
+        if self._check_rotation():
+            self.rotations += 1
+            self._file.close()
+            self._file = None
+            lines.extend(self._splitter.flush())
+            self._reset_stream()
+            if self._open():
+                lines.extend(self._read_available())
+        
+        return lines
+    
+    def flush(self):
+        """
+        Return any buffered partial line (call once the writer has exited)
+        
+        Returns:
+            list: Zero or one line
+        """
+        return self._splitter.flush()
+    
+    def close(self):
+        """Close the file handle"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
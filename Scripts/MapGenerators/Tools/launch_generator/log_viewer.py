@@ -0,0 +1,194 @@
+"""
+Log viewer CLI - jump to the interesting parts of a saved full UE5 log
+The first query builds the line index (log_index.LogIndex, <log>.lineidx); every
+later query only reads the lines it prints.
+
+Usage:
+    python log_viewer.py error [-n 1] [-C 20] [--log path]
+    python log_viewer.py between CHECKPOINT_A CHECKPOINT_B [--map map_name]
+    python log_viewer.py category LogPython [--limit 200]
+    python log_viewer.py checkpoints
+    python log_viewer.py lines START [END]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from config import FULL_LOG_FILE, get_map_settings
+from log_index import LogIndex
+from log_writer import EXTENSIONS
+from path_setup import setup_paths
+
+
+COMPRESSED_EXTENSIONS = [extension for extension in EXTENSIONS.values() if extension]
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="已保存的完整 UE5 日志快速查看")
+    source = argparse.ArgumentParser(add_help=False)
+    source.add_argument('--log', help="日志文件 (默认: 最近一次运行的完整日志)")
+    source.add_argument('--map', dest='map_name', help="使用该地图目录下的完整日志")
+    source.add_argument('--rebuild', action='store_true', help="重建行索引")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    error_parser = commands.add_parser('error', parents=[source], help="第N个错误前后的内容")
+    error_parser.add_argument('-n', '--number', type=int, default=1, help="第几个错误 (-1 = 最后一个, 默认: 1)")
+    error_parser.add_argument('-C', '--context', type=int, default=20, help="前后行数 (默认: 20)")
+    
+    between_parser = commands.add_parser('between', parents=[source], help="两个检查点之间的内容")
+    between_parser.add_argument('first')
+    between_parser.add_argument('last')
+    
+    category_parser = commands.add_parser('category', parents=[source], help="某个日志类别的全部行")
+    category_parser.add_argument('category')
+    category_parser.add_argument('--limit', type=int, default=0, help="最多显示行数 (默认: 全部)")
+    
+    commands.add_parser('checkpoints', parents=[source], help="列出检查点")
+    
+    lines_parser = commands.add_parser('lines', parents=[source], help="按行号显示 (从1开始)")
+    lines_parser.add_argument('start', type=int)
+    lines_parser.add_argument('end', type=int, nargs='?', help="结束行号 (含, 默认: 同起始行)")
+    return parser.parse_args(argv)
+
+
+def find_full_log(path):
+    """
+    The saved file for a configured full log path: the most recent of
+    path.zst / path.gz (streamed by log_writer) and path itself
+    
+    Returns:
+        Path or None
+    """
+    path = Path(path)
+    if path.suffix in COMPRESSED_EXTENSIONS and path.exists():
+        return path
+    candidates = [Path(str(path) + extension) for extension in EXTENSIONS.values()]
+    candidates = [candidate for candidate in candidates if candidate.exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda candidate: candidate.stat().st_mtime)
+
+
+def print_lines(index, start, stop, mark=None):
+    """Print lines [start, stop) with 1-based line numbers (mark = line to flag)"""
+    width = len(str(stop))
+    for number, line in enumerate(index.lines(start, stop), start):
+        flag = '>' if number == mark else ' '
+        text = line.rstrip('\r\n')
+        print(f"{flag}{number + 1:>{width}} | {text}")
+
+
+def cmd_error(index, args):
+    """Print the context around the Nth error"""
+    found = index.around_error(args.number, args.context)
+    if found is None:
+        print(f"(未找到第 {args.number} 个错误, 共 {len(index.errors)} 个)")
+        return 0
+    line, start, stop = found
+    print(f"错误 {args.number}/{len(index.errors)}: 第 {line + 1} 行")
+    print_lines(index, start, stop, mark=line)
+    return stop - start
+
+
+def cmd_between(index, args):
+    """Print everything from checkpoint first through checkpoint last"""
+    try:
+        start, stop = index.between(args.first, args.last)
+    except KeyError as e:
+        print(f"✗ 未找到检查点: {e.args[0]}")
+        return None
+    print_lines(index, start, stop)
+    return stop - start
+
+
+def cmd_category(index, args):
+    """Print all lines of one category"""
+    numbers = index.category_lines(args.category)
+    if not numbers:
+        known = ', '.join(name for name in index.category_names if name)
+        print(f"(没有 {args.category} 的日志行; 已有类别: {known})")
+        return 0
+    if args.limit:
+        numbers = numbers[:args.limit]
+    width = len(str(numbers[-1] + 1))
+    # Consecutive line numbers are read as one range
+    run_start = previous = numbers[0]
+    for number in numbers[1:] + [None]:
+        if number is not None and number == previous + 1:
+            previous = number
+            continue
+        for line_number, line in enumerate(index.lines(run_start, previous + 1), run_start):
+            text = line.rstrip('\r\n')
+            print(f" {line_number + 1:>{width}} | {text}")
+        run_start = previous = number
+    return len(numbers)
+
+
+def cmd_checkpoints(index, args):
+    """List checkpoints with their line numbers"""
+    if not index.checkpoints:
+        print("(没有检查点)")
+        return 0
+    for line, name in index.checkpoints:
+        print(f"{line + 1:>8}  {name}")
+    return len(index.checkpoints)
+
+
+def cmd_lines(index, args):
+    """Print a range of lines"""
+    end = args.end if args.end is not None else args.start
+    print_lines(index, args.start - 1, end)
+    return max(min(end, len(index)) - max(args.start - 1, 0), 0)
+
+
+COMMANDS = {
+    'error': cmd_error,
+    'between': cmd_between,
+    'category': cmd_category,
+    'checkpoints': cmd_checkpoints,
+    'lines': cmd_lines,
+}
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    log_arg = Path(args.log).resolve() if args.log else None  # Relative to the caller's directory
+    
+    # Setup paths (configured log paths are relative to the project root)
+    if not setup_paths():
+        return 1
+    
+    if log_arg is not None:
+        log_path = log_arg if log_arg.exists() else None
+    elif args.map_name:
+        log_path = find_full_log(get_map_settings(args.map_name)['full_log_file'])
+    else:
+        log_path = find_full_log(FULL_LOG_FILE)
+    if log_path is None:
+        print(f"✗ 完整日志不存在: {args.log or args.map_name or FULL_LOG_FILE}")
+        return 1
+    
+    start = time.perf_counter()
+    try:
+        index = LogIndex.open(log_path, rebuild=args.rebuild)
+    except (OSError, RuntimeError) as e:
+        print(f"✗ 无法读取日志: {e}")
+        return 1
+    indexed = time.perf_counter()
+    
+    with index:
+        shown = COMMANDS[args.command](index, args)
+    if shown is None:
+        return 1
+    
+    done = time.perf_counter()
+    print(f"--- {log_path.name}: {len(index)} 行, 显示 {shown} 行 "
+          f"(索引 {(indexed - start) * 1000:.1f} ms, 查询 {(done - indexed) * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
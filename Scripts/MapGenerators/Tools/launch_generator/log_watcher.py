@@ -0,0 +1,161 @@
+"""
+Log watcher module - event-driven notification of UE5 log file changes
+Uses inotify on Linux, falls back to lightweight directory polling elsewhere
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+
+
+# inotify event masks (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Polling fallback interval (seconds) - one scandir of Saved/Logs per tick
+POLL_INTERVAL = 0.05
+
+
+def _load_libc():
+    """Load libc with inotify support, or None if unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class LogWatcher:
+    """
+    Watches a log directory and reports which matching files changed
+    
+    Usage:
+        watcher = LogWatcher(Path("Saved/Logs"), "shijiewuxian*.log")
+        changed = watcher.wait(0.5)  # set of changed file names ({} on timeout)
+        watcher.close()
+    """
+    
+    def __init__(self, directory, pattern="*", poll_interval=POLL_INTERVAL):
+        self.directory = str(directory)
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.backend = 'polling'
+        self._fd = None
+        self._snapshot = {}
+        
+        libc = _load_libc()
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                wd = libc.inotify_add_watch(fd, os.fsencode(self.directory), WATCH_MASK)
+                if wd >= 0:
+                    self._fd = fd
+                    self.backend = 'inotify'
+                else:
+                    os.close(fd)
+        
+        if self._fd is None:
+            self._snapshot = self._scan()
+    
+    def wait(self, timeout):
+        """
+        Block until a matching file changes or timeout expires
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            set: Names of changed files (empty on timeout)
+        """
+        if self._fd is not None:
+            return self._wait_inotify(timeout)
+        return self._wait_polling(timeout)
+    
+    def _wait_inotify(self, timeout):
+        """Wait for inotify events on the watched directory"""
+        try:
+            readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        except InterruptedError:
+            return set()
+        if not readable:
+            return set()
+        
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += name_len
+                if name and fnmatch.fnmatch(name, self.pattern):
+                    changed.add(name)
+        return changed
+    
+    def _scan(self):
+        """Snapshot matching files as {name: (size, mtime_ns)}"""
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatch(entry.name, self.pattern):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return snapshot
+    
+    def _wait_polling(self, timeout):
+        """Poll the directory until a snapshot difference appears"""
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            current = self._scan()
+            if current != self._snapshot:
+                changed = {name for name in set(current) | set(self._snapshot)
+                           if current.get(name) != self._snapshot.get(name)}
+                self._snapshot = current
+                return changed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.poll_interval, remaining))
+    
+    def close(self):
+        """Release the inotify descriptor"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,299 @@
+"""
+Log writer module - streams the full UE5 log to a compressed file while UE5 runs
+A background thread appends lines as independent gzip members / zstd frames, one per
+flush (CHECKPOINT line, FULL_LOG_FLUSH_BYTES buffered or FULL_LOG_FLUSH_SECONDS elapsed),
+so a launcher crash loses at most the last few seconds and the file is always readable.
+
+Every member gets a line in the index sidecar (<log>.idx):
+    first_line line_count byte_offset byte_size
+read_lines() uses it to decompress only the members holding the requested lines.
+"""
+
+import atexit
+import bisect
+import gzip
+import io
+import queue
+import threading
+import time
+from pathlib import Path
+from config import FULL_LOG_COMPRESSION, FULL_LOG_FLUSH_SECONDS, FULL_LOG_FLUSH_BYTES
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Same header log_saver wrote in front of the plain full log (replay.load_recording skips it)
+FULL_LOG_HEADER = "=" * 60 + "\n  完整输出日志\n" + "=" * 60 + "\n\n"
+FULL_LOG_TRAILER = "\n"
+
+EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', None: ''}
+INDEX_SUFFIX = '.idx'
+GZIP_LEVEL = 6
+READER_CACHE_MEMBERS = 16
+ZSTD_LEVEL = 3
+
+# Queue items besides lines
+_FLUSH = object()
+_CLOSE = object()
+
+
+def resolve_compression(compression=FULL_LOG_COMPRESSION):
+    """'auto' -> 'zstd' when zstandard is installed, else 'gzip'; 'zstd' without zstandard -> 'gzip'"""
+    if compression in ('auto', 'zstd'):
+        return 'zstd' if zstandard is not None else 'gzip'
+    return compression
+
+
+def full_log_path(path, compression=FULL_LOG_COMPRESSION):
+    """File the writer creates for a configured full log path (ue5_full_log.txt -> ue5_full_log.txt.gz)"""
+    return Path(str(path) + EXTENSIONS[resolve_compression(compression)])
+
+
+def _compression_of(path):
+    suffix = Path(path).suffix
+    for compression, extension in EXTENSIONS.items():
+        if extension and suffix == extension:
+            return compression
+    return None
+
+
+def _compress(data, compression):
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def _decompress(data, compression):
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+class FullLogWriter:
+    """
+    Background writer of one full log
+    
+    Usage:
+        writer = FullLogWriter("ue5_full_log.txt")    # creates ue5_full_log.txt.gz (+ .idx)
+        writer.write(line)                            # never blocks on disk I/O
+        writer.write(checkpoint_line, flush=True)
+        writer.close()                                # drains the queue, closes the stream
+    """
+    
+    def __init__(self, path, compression=FULL_LOG_COMPRESSION,
+                 flush_seconds=FULL_LOG_FLUSH_SECONDS, flush_bytes=FULL_LOG_FLUSH_BYTES):
+        self.compression = resolve_compression(compression)
+        self.path = full_log_path(path, self.compression)
+        self.index_path = Path(str(self.path) + INDEX_SUFFIX)
+        self.flush_seconds = flush_seconds
+        self.flush_bytes = flush_bytes
+        self.lines = 0            # Lines written to disk
+        self.raw_bytes = 0        # Uncompressed size on disk
+        self.error = None         # First write error (the thread stops writing after it)
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._index = open(self.index_path, 'w', encoding='utf-8')
+        self._index.write(f"# first_line line_count byte_offset byte_size ({self.compression or 'plain'})\n")
+        self._offset = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._write_member(FULL_LOG_HEADER.encode('utf-8'), 0)
+        
+        self._thread = threading.Thread(target=self._run, name="full-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # Unhandled exception in the launcher: still close the last member
+    
+    @property
+    def compressed_bytes(self):
+        """Size of the log file so far"""
+        return self._offset
+    
+    def write(self, line, flush=False):
+        """Queue one line; flush=True writes everything queued so far as one member"""
+        self._queue.put(line)
+        if flush:
+            self._queue.put(_FLUSH)
+    
+    def flush(self):
+        self._queue.put(_FLUSH)
+    
+    def close(self):
+        """Write the remaining lines and the trailer, then close the files"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_CLOSE)
+        self._thread.join()
+    
+    def _run(self):
+        pending = []
+        pending_bytes = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+            
+            if item is _FLUSH or item is _CLOSE:
+                if pending:
+                    self._write_member(b''.join(pending), len(pending))
+                    pending, pending_bytes, deadline = [], 0, None
+                if item is _CLOSE:
+                    self._write_member(FULL_LOG_TRAILER.encode('utf-8'), 0)
+                    self._file.close()
+                    self._index.close()
+                    return
+                continue
+            
+            # Index line numbers rely on one '\n' per line
+            data = (item if item.endswith('\n') else item + '\n').encode('utf-8', errors='replace')
+            pending.append(data)
+            pending_bytes += len(data)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_seconds
+            if pending_bytes >= self.flush_bytes:
+                self._write_member(b''.join(pending), len(pending))
+                pending, pending_bytes, deadline = [], 0, None
+    
+    def _write_member(self, data, line_count):
+        """Append one independently decompressible member (header / trailer: line_count 0, not indexed)"""
+        if self.error is not None:
+            return
+        try:
+            member = _compress(data, self.compression)
+            self._file.write(member)
+            self._file.flush()
+            if line_count:
+                self._index.write(f"{self.lines} {line_count} {self._offset} {len(member)}\n")
+                self._index.flush()
+            self._offset += len(member)
+            self.lines += line_count
+            self.raw_bytes += len(data)
+        except OSError as e:
+            self.error = e
+
+
+def open_full_log(path, binary=False):
+    """
+    Open a saved full log for reading, whatever its compression
+    
+    Args:
+        binary: Bytes lines instead of text
+    
+    Returns:
+        file object (iterate for lines)
+    """
+    compression = _compression_of(path)
+    if compression == 'gzip':
+        if binary:
+            return gzip.open(path, 'rb')
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("读取 .zst 日志需要安装 zstandard")
+        reader = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True, closefd=True))
+        if binary:
+            return reader
+        return io.TextIOWrapper(reader, encoding='utf-8', errors='replace')
+    if binary:
+        return open(path, 'rb')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def has_index(path):
+    """True when path was written by FullLogWriter (compressed, with its .idx sidecar)"""
+    return _compression_of(path) is not None and Path(str(path) + INDEX_SUFFIX).exists()
+
+
+def load_index(path):
+    """
+    Returns:
+        list: [(first_line, line_count, byte_offset, byte_size), ...] from <path>.idx
+    """
+    entries = []
+    with open(str(path) + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            entries.append(tuple(int(value) for value in line.split()))
+    return entries
+
+
+class IndexedLogReader:
+    """
+    Random access to the UE5 lines of a streamed full log - only the members
+    holding the requested lines are decompressed (line numbers exclude the header)
+    
+    Usage:
+        with IndexedLogReader("ue5_full_log.txt.zst") as reader:
+            lines = reader.read(1200, 1240)
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.compression = _compression_of(path)
+        self.members = load_index(path)
+        self.line_count = self.members[-1][0] + self.members[-1][1] if self.members else 0
+        self._starts = [member[0] for member in self.members]
+        self._cache = {}  # Member number -> decoded lines (consecutive queries reuse them)
+        self._file = open(self.path, 'rb')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        self._file.close()
+    
+    def _member_lines(self, number):
+        lines = self._cache.get(number)
+        if lines is None:
+            _, _, offset, size = self.members[number]
+            self._file.seek(offset)
+            text = _decompress(self._file.read(size), self.compression).decode('utf-8', errors='replace')
+            lines = io.StringIO(text, newline='\n').readlines()  # '\n' only, like the writer
+            if len(self._cache) >= READER_CACHE_MEMBERS:
+                self._cache.clear()
+            self._cache[number] = lines
+        return lines
+    
+    def read(self, start, stop):
+        """
+        Returns:
+            list: Lines [start, stop) with their line endings
+        """
+        start, stop = max(start, 0), min(stop, self.line_count)
+        lines = []
+        number = max(bisect.bisect_right(self._starts, start) - 1, 0)
+        while start < stop and number < len(self.members):
+            first_line = self.members[number][0]
+            member_lines = self._member_lines(number)
+            lines.extend(member_lines[start - first_line:stop - first_line])
+            start = first_line + len(member_lines)
+            number += 1
+        return lines
+
+
+def read_lines(path, start, count=1):
+    """
+    Read UE5 lines [start, start + count) of a streamed full log via its index
+    (line numbers count UE5 output lines, the header is not included)
+    
+    Returns:
+        list: Lines with their line endings
+    """
+    with IndexedLogReader(path) as reader:
+        return reader.read(start, start + count)
@@ -4,50 +4,63 @@ Output monitoring module - tracks and summarizes UE5 output
 
 import time
 from datetime import datetime
+from config import COMPILE_CATEGORIES
+from line_classifier import classify, CHECKPOINT_MARKER, COMPILING_NOCASE, SHADER_NOCASE, DONE_NOCASE
+from line_store import LineStore
+from log_record import LogRecordParser, RecordDispatcher
+from log_writer import FullLogWriter
+from record_store import RecordStore
+from summary_aggregator import SummaryAggregator
 
 
 class OutputMonitor:
     """Monitors and summarizes UE5 output"""
     
     def __init__(self, log_file=None, full_log_file=None):
-        self.lines = []
         self.last_output_time = None  # Will be set on first output
         self.is_running = True
         self.start_time = time.time()
         self.last_summarized_index = 0
         self.log_file = log_file
         self.full_log_file = full_log_file
+        self.full_log = self._open_full_log(full_log_file)  # Streamed to disk as lines arrive
+        # Bounded memory: older lines spill to a temporary file only when no full log has them
+        self.lines = LineStore(spill=self.full_log is None)
         self.summary_log = []
+        self.summary = SummaryAggregator()  # Running aggregates for the compressed summaries
         self.has_output = False  # Track if we've received any output
         self.is_compiling = False  # Track if shader compilation is in progress
         self.timeout_paused = False  # Track if timeout is paused
+        self.records = LogRecordParser()  # Continuation lines need the stream's previous record
+        self.record_store = RecordStore()  # Parsed records as columns (category / error queries)
+        
+        # Compile detector only sees compile categories (start / end) and LogPython (script running = done)
+        self.handlers = RecordDispatcher()
+        self.handlers.register(COMPILE_CATEGORIES, self._track_compile)
+        self.handlers.register('LogPython', self._end_compile)
     
-    def add_line(self, line):
-        """Add a new output line"""
+    def add_line(self, line, signals=None, record=None):
+        """
+        Add a new output line
+        
+        Args:
+            signals: line_classifier.classify(line), when the caller already has it
+            record: self.records.parse(line), when the caller already has it
+        """
+        if signals is None:
+            signals = classify(line)
+        if record is None:
+            record = self.records.parse(line)
         self.lines.append(line)
+        if self.full_log is not None:
+            # Checkpoints close a compressed member: everything up to them is on disk
+            self.full_log.write(line, flush=bool(signals & CHECKPOINT_MARKER))
+        # Checkpoint text anchors the generator clock in the timeline export (chrome_trace.py)
+        self.record_store.append(record, keep_message=bool(signals & CHECKPOINT_MARKER))
+        self.summary.add(line, signals)
+        self.handlers.dispatch(record, signals)
         current_time = time.time()
         
-        # Check for shader compilation keywords
-        line_lower = line.lower()
-        if 'compiling' in line_lower and 'shader' in line_lower:
-            if not self.is_compiling:
-                self.is_compiling = True
-                self.timeout_paused = True
-                print(f"\n[编译] 检测到 Shader 编译，暂停超时检测...")
-        elif self.is_compiling:
-            # Check for compilation completion keywords (more specific)
-            # Only end compilation state when we see specific completion messages
-            if 'logpython' in line_lower:
-                # Python script started - compilation must be done
-                self.is_compiling = False
-                self.timeout_paused = False
-                print(f"[编译] Shader 编译结束，恢复超时检测")
-            elif 'shader' in line_lower and any(keyword in line_lower for keyword in ['compiled', 'complete', 'finished']):
-                # Shader-specific completion message
-                self.is_compiling = False
-                self.timeout_paused = False
-                print(f"[编译] Shader 编译结束，恢复超时检测")
-        
         if not self.has_output:
             # First output - start the timeout timer
             self.has_output = True
@@ -55,6 +68,34 @@ class OutputMonitor:
         else:
             self.last_output_time = current_time
     
+    @staticmethod
+    def _open_full_log(full_log_file):
+        if not full_log_file:
+            return None
+        try:
+            return FullLogWriter(full_log_file)
+        except OSError as e:
+            print(f"⚠ 无法创建完整日志: {e}")
+            return None
+    
+    def _track_compile(self, record, signals):
+        """Shader compilation start / completion (compile categories)"""
+        if signals & COMPILING_NOCASE and signals & SHADER_NOCASE:
+            if not self.is_compiling:
+                self.is_compiling = True
+                self.timeout_paused = True
+                print(f"\n[编译] 检测到 Shader 编译，暂停超时检测...")
+        elif self.is_compiling and signals & SHADER_NOCASE and signals & DONE_NOCASE:
+            # Shader-specific completion message
+            self._end_compile(record, signals)
+    
+    def _end_compile(self, record, signals):
+        """Python script output - compilation must be done"""
+        if self.is_compiling:
+            self.is_compiling = False
+            self.timeout_paused = False
+            print(f"[编译] Shader 编译结束，恢复超时检测")
+    
     def get_elapsed_time(self):
         """Get elapsed time since start"""
         return time.time() - self.start_time
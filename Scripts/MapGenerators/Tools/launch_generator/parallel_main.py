@@ -0,0 +1,76 @@
+"""
+Parallel entry point - regenerates several maps concurrently with asyncio
+
+Usage:
+    python parallel_main.py [map_name ...] [-j N]
+    
+    Without map names, every Maps/<map>/generate.py is regenerated.
+"""
+
+import argparse
+import asyncio
+import sys
+from config import MAX_CONCURRENT_GENERATIONS, get_map_settings, discover_maps
+from path_setup import setup_paths
+from async_runner import run_maps_concurrently
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="并行生成多个地图")
+    parser.add_argument('maps', nargs='*', help="地图名称 (默认: Maps/ 下全部地图)")
+    parser.add_argument('-j', '--jobs', type=int, default=MAX_CONCURRENT_GENERATIONS,
+                        help=f"同时运行的UE5实例数 (默认: {MAX_CONCURRENT_GENERATIONS})")
+    return parser.parse_args(argv)
+
+
+def print_results(outcomes):
+    """Print per-map result table"""
+    print(f"\n{'='*60}")
+    print("  并行生成结果")
+    print(f"{'='*60}")
+    for outcome in outcomes:
+        icon = "✓" if outcome['result'] == 0 else "✗"
+        print(f"  {icon} {outcome['map_name']:<32} 尝试 {outcome['attempts']} 次  {outcome['elapsed']:.1f}秒")
+        if outcome['result'] != 0:
+            print(f"      原因: {outcome['reason']}")
+    succeeded = sum(1 for outcome in outcomes if outcome['result'] == 0)
+    print(f"\n  成功: {succeeded}/{len(outcomes)}")
+    print(f"{'='*60}")
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    
+    # Setup paths
+    if not setup_paths():
+        return 1
+    
+    map_names = args.maps or discover_maps()
+    if not map_names:
+        print("✗ 未找到任何地图 (Maps/<map>/generate.py)")
+        return 1
+    jobs = max(1, args.jobs)
+    
+    print("\n" + "="*60)
+    print("  地图生成器 (并行模式)")
+    print("="*60)
+    print(f"地图数量: {len(map_names)}")
+    print(f"并发上限: {jobs}")
+    print("="*60 + "\n")
+    
+    outcomes = asyncio.run(run_maps_concurrently([get_map_settings(name) for name in map_names], jobs))
+    print_results(outcomes)
+    
+    return 0 if all(outcome['result'] == 0 for outcome in outcomes) else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"FATAL ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
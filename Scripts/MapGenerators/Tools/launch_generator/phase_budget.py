@@ -0,0 +1,100 @@
+"""
+Phase budget module - per-phase silence timeouts learned from past successful runs
+A phase is keyed on the last CHECKPOINT seen (BEFORE_SAVE_MAP, BEFORE_BUILD_ROOM, ...)
+"""
+
+import json
+from config import (
+    TIMEOUT_SECONDS, PHASE_HISTORY_FILE, PHASE_HISTORY_SIZE, PHASE_BUDGET_MIN_SAMPLES,
+    PHASE_BUDGET_PERCENTILE, PHASE_BUDGET_MARGIN, PHASE_BUDGET_MIN_SECONDS
+)
+
+
+def percentile(values, percent):
+    """Linear-interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def get_phase_durations(checkpoints):
+    """
+    Seconds spent after each checkpoint until the next one
+    
+    The phase after the last checkpoint is open-ended (editor idles after the script) and is skipped.
+    
+    Returns:
+        list: (phase_name, seconds) in execution order
+    """
+    durations = []
+    for current, following in zip(checkpoints, checkpoints[1:]):
+        durations.append((current['name'], max(0, following['timestamp'] - current['timestamp']) / 1000))
+    return durations
+
+
+class PhaseBudgets:
+    """
+    Silence budgets for one map, stored in PHASE_HISTORY_FILE
+    
+    Usage:
+        budgets = PhaseBudgets.load("cosmos_002_training_world")
+        timeout = budgets.budget_for(trace_info.last_checkpoint)
+        ...
+        budgets.record_run(trace_info.checkpoints)   # successful runs only
+        budgets.save()
+    """
+    
+    def __init__(self, map_name, history=None, path=PHASE_HISTORY_FILE):
+        self.map_name = map_name
+        self.path = path
+        self.history = history or {}  # {phase_name: [seconds, ...]} most recent last
+    
+    @staticmethod
+    def _read_all(path):
+        """Read {map_name: history} from disk (empty if missing/unreadable)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                all_maps = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return all_maps if isinstance(all_maps, dict) else {}
+    
+    @classmethod
+    def load(cls, map_name, path=PHASE_HISTORY_FILE):
+        """Load stored durations for map_name (empty history if missing/unreadable)"""
+        return cls(map_name, dict(cls._read_all(path).get(map_name) or {}), path)
+    
+    def budget_for(self, phase):
+        """
+        Silence budget in seconds for the phase that started at checkpoint `phase`
+        
+        Returns:
+            float: Percentile-based budget, or TIMEOUT_SECONDS without enough history
+        """
+        samples = self.history.get(phase) if phase else None
+        if not samples or len(samples) < PHASE_BUDGET_MIN_SAMPLES:
+            return TIMEOUT_SECONDS
+        return max(PHASE_BUDGET_MIN_SECONDS, percentile(samples, PHASE_BUDGET_PERCENTILE) * PHASE_BUDGET_MARGIN)
+    
+    def record_run(self, checkpoints):
+        """Add the phase durations of one successful run (keeps the last PHASE_HISTORY_SIZE per phase)"""
+        for phase, seconds in get_phase_durations(checkpoints):
+            samples = self.history.setdefault(phase, [])
+            samples.append(round(seconds, 3))
+            del samples[:-PHASE_HISTORY_SIZE]
+    
+    def save(self):
+        """Write this map's history back, keeping other maps' entries"""
+        # Re-read first: parallel runs save other maps into the same file
+        all_maps = self._read_all(self.path)
+        all_maps[self.map_name] = self.history
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(all_maps, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠ 保存阶段耗时历史失败: {e}")
@@ -2,19 +2,30 @@
 Process running module - runs UE5 process and monitors output
 """
 
+import os
 import subprocess
 import sys
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from config import ENGINE_PATH, PROJECT_PATH, SCRIPT_PATH, DEBUG_MODE, TIMEOUT_SECONDS, CHECK_INTERVAL, UE5_LOG_DIR
+from config import ENGINE_PATH, PROJECT_PATH, MAP_NAME, SCRIPT_PATH, RESULT_FILE, MAP_PATH, DEBUG_MODE, TIMEOUT_SECONDS, CHECK_INTERVAL, UE5_LOG_DIR, UE5_LOG_PATTERN, LOG_WAIT_TIMEOUT, STREAM_STDOUT, TRACE_BUFFERED, TRACE_EVENTS, TRACE_EVENTS_FILE, TIMELINE_EXPORT, TIMELINE_FILE
+from line_classifier import classify
+from log_watcher import LogWatcher
+from log_tailer import LogTailer
+from stdout_reader import StdoutReader
 from output_monitor import OutputMonitor
 from timeout_monitor import monitor_timeout
+from trace_events import TRACE_EVENTS_ENV, TraceEventReader
 from trace_parser import TraceInfo, parse_line
 from summary_generator import get_compressed_summary
 from log_saver import save_logs
-from result_analyzer import analyze_result, print_progress_stats, print_trace_info
+from chrome_trace import export_timeline
+from result_analyzer import analyze_result, print_log_activity, print_progress_stats, print_trace_info
+from result_manifest import clear_result_files, results_ready, read_manifest
+from fatal_detector import FatalDetector
+from phase_budget import PhaseBudgets
+from run_history import record_attempt
 
 
 def get_latest_ue5_log():
@@ -22,7 +33,7 @@ def get_latest_ue5_log():
     if not UE5_LOG_DIR.exists():
         return None
     
-    log_files = list(UE5_LOG_DIR.glob("shijiewuxian*.log"))
+    log_files = list(UE5_LOG_DIR.glob(UE5_LOG_PATTERN))
     if not log_files:
         return None
     
@@ -31,44 +42,237 @@ def get_latest_ue5_log():
     return latest
 
 
-def tail_ue5_log(monitor, trace_info, process, start_pos=0, log_file=None):
+def build_ue5_command(script_path, extra_args=()):
     """
-    Tail UE5 log file and feed lines to monitor
-    Returns tuple: (last_file_position, log_file_path)
+    Build the UnrealEditor-Cmd command line that runs one generator script
+    
+    script_path=None starts an idle editor (editor daemon sends its jobs later)
+    """
+    # ExecCmds format - use quotes for the command
+    exec_args = [f'-ExecCmds=py {script_path}'] if script_path else []
+    
+    return [
+        ENGINE_PATH,
+        PROJECT_PATH,
+        *exec_args,
+        '-stdout',
+        '-unattended',
+        '-nopause',
+        '-nosplash',
+        '-NoCompile',                     # Skip C++ compilation check (Python scripts don't modify C++ source)
+        # Let UE5 auto-launch Zen Server (better performance than file system cache)
+        *extra_args
+    ]
+
+
+def build_ue5_env(trace_events=None):
+    """
+    Environment of a UE5 process: the launcher's own plus the generator trace settings
+    
+    Args:
+        trace_events: TraceEventReader of this session (None = no structured events)
+    """
+    env = os.environ.copy()
+    env['MAPGEN_TRACE_BUFFERED'] = '1' if TRACE_BUFFERED else '0'
+    env.pop(TRACE_EVENTS_ENV, None)
+    if trace_events is not None:
+        env.update(trace_events.environment())
+    return env
+
+
+def open_trace_events(path):
+    """
+    TraceEventReader for a session's event file, old file removed (None when TRACE_EVENTS is off)
+    """
+    if not TRACE_EVENTS or path is None:
+        return None
+    events = TraceEventReader(path)
+    events.clear()
+    return events
+
+
+def read_trace_events(trace_info, final=False):
+    """Apply the structured trace events written since the last call"""
+    if trace_info.trace_events is not None:
+        trace_info.trace_events.read(trace_info, final)
+
+
+def export_session_timeline(trace_info, monitor, timeline_file):
+    """Write the session's timeline as Chrome Trace Event JSON (nothing when TIMELINE_EXPORT is off)"""
+    if TIMELINE_EXPORT and timeline_file is not None:
+        export_timeline(trace_info, monitor.record_store, timeline_file)
+
+
+def handle_line(line, monitor, trace_info, detector=None, label=None):
+    """Feed one UE5 output line to the monitor, trace parser and fatal detector (label: map name prefix in parallel runs)"""
+    prefix = f"[{label}] " if label else ""
+    signals = classify(line)  # One scan, shared by the monitor, its summaries and the parser
+    record = monitor.records.parse(line)  # One split into category / verbosity / message
+    monitor.add_line(line, signals, record)
+    parse_line(line, trace_info, signals, record)
+    
+    # Unrecoverable error: stop monitoring now, the caller terminates the editor
+    if detector is not None and monitor.is_running and detector.check(line, trace_info):
+        print(f"\n{prefix}[致命] {trace_info.fatal_match['reason']}，立即终止UE5")
+        print(f"  {trace_info.fatal_match['line'][:150]}")
+        monitor.stop()
+    
+    # Debug mode: show all output
+    if DEBUG_MODE:
+        print(f"{prefix}{line.rstrip()}")
+        sys.stdout.flush()
+
+
+def tail_ue5_log(monitor, trace_info, tailer, final=False, detector=None):
     """
+    Feed lines appended to the UE5 log since the last call to monitor
+    
+    Args:
+        tailer: LogTailer bound to the current UE5 log file (may be None)
+        final: Also emit a trailing partial line (process has exited)
+        detector: Optional FatalDetector checked on every line
+    
+    Returns:
+        int: Number of lines read
+    """
+    if tailer is None:
+        return 0
+    
     try:
-        # Find latest log file if not provided
-        if log_file is None:
-            log_file = get_latest_ue5_log()
-            if log_file is None:
-                return (start_pos, None)
-        
-        if not log_file.exists():
-            return (start_pos, log_file)
+        lines = tailer.read_lines()
+        if final:
+            lines.extend(tailer.flush())
+    except Exception as e:
+        print(f"[警告] 读取UE5日志失败: {e}")
+        return 0
+    
+    # Lines after a fatal match or a stop still go to the summary and full log (the traceback follows its first line)
+    for line in lines:
+        handle_line(line, monitor, trace_info, detector)
+    lines_read = len(lines)
+    
+    if DEBUG_MODE and lines_read > 0:
+        print(f"[DEBUG] 读取了 {lines_read} 行，位置: {tailer.position}")
+    return lines_read
+
+
+def _results_written(result_files, monitor):
+    """Stop monitoring once every result manifest exists - the generator is done"""
+    if not results_ready(result_files):
+        return False
+    print("[✓] 检测到结果清单，立即关闭UE5")
+    monitor.stop()
+    return True
+
+
+def _stop_if_finished(process, trace_info, result_files):
+    """Editor keeps running after the script finished (or hit a fatal line) - stop it instead of waiting"""
+    if results_ready(result_files) or trace_info.fatal_match:
+        stop_process(process)
+
+
+def _follow_log_file(process, monitor, trace_info, result_files=(), detector=None):
+    """Follow the newest Saved/Logs file until the process exits, monitoring stops or results are written"""
+    # Record that we expect a new log file
+    existing_log_files = set()  # Empty set since old logs were deleted before launch
+    
+    # Watch Saved/Logs for created/appended log files (inotify on Linux, polling elsewhere)
+    UE5_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    watcher = LogWatcher(UE5_LOG_DIR, UE5_LOG_PATTERN)
+    if DEBUG_MODE:
+        print(f"[DEBUG] 日志监听方式: {watcher.backend}")
+    tailer = None  # LogTailer for the current UE5 log file
+    
+    # Monitor UE5 log file instead of stdout
+    try:
+        startup_wait_shown = False
+        ue5_log_file = None
+        log_file_found = False
+        wait_for_new_file_timeout = 60  # Wait up to 60 seconds for new log file
+        start_wait_time = time.time()
+        changed = {None}  # Force an initial directory scan
         
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            f.seek(start_pos)
-            lines_read = 0
-            for line in f:
-                if not monitor.is_running or process.poll() is not None:
-                    break
-                
-                monitor.add_line(line)
-                parse_line(line, trace_info)
-                lines_read += 1
+        while process.poll() is None and monitor.is_running:
+            # Only rescan the directory when a file other than the current log changed
+            if changed and (ue5_log_file is None or any(name != ue5_log_file.name for name in changed)):
+                # Find new log files created after UE5 started
+                current_log_files = set(UE5_LOG_DIR.glob(UE5_LOG_PATTERN))
+                new_log_files = current_log_files - existing_log_files
                 
-                # Debug mode: show all output
-                if DEBUG_MODE:
-                    print(line.rstrip())
-                    sys.stdout.flush()
+                if new_log_files:
+                    # Use the newest log file (ONLY new files)
+                    new_log_file = max(new_log_files, key=lambda p: p.stat().st_mtime)
+                    if new_log_file != ue5_log_file:
+                        print(f"[✓] 检测到新日志文件: {new_log_file.name}")
+                        ue5_log_file = new_log_file
+                        # Start from beginning of new file
+                        if tailer:
+                            tailer.close()
+                        tailer = LogTailer(new_log_file)
+                        log_file_found = True
+                        # Reset monitor's last_output_time to start timeout from now
+                        monitor.last_output_time = None
+                        monitor.has_output = False
             
-            new_pos = f.tell()
-            if DEBUG_MODE and lines_read > 0:
-                print(f"[DEBUG] 读取了 {lines_read} 行，位置: {start_pos} -> {new_pos}")
-            return (new_pos, log_file)
-    except Exception as e:
-        print(f"[警告] 读取UE5日志失败: {e}")
-        return (start_pos, log_file)
+            if not log_file_found and time.time() - start_wait_time > wait_for_new_file_timeout:
+                print(f"\n[错误] {wait_for_new_file_timeout}秒内未检测到新日志文件")
+                print(f"  UE5 可能启动失败或日志文件路径错误")
+                print(f"  请检查: {UE5_LOG_DIR}")
+                monitor.stop()
+                break
+            
+            tail_ue5_log(monitor, trace_info, tailer, detector=detector)
+            read_trace_events(trace_info)
+            
+            if _results_written(result_files, monitor):
+                break
+            
+            # Show startup wait message if no output yet
+            if not log_file_found and not startup_wait_shown:
+                if time.time() - monitor.start_time > 5:
+                    print("[等待] UE5正在启动，等待新日志文件创建...")
+                    startup_wait_shown = True
+            
+            # Block until the log directory changes (or the liveness check is due)
+            changed = watcher.wait(LOG_WAIT_TIMEOUT)
+        
+        # Read any remaining log content - once the editor is gone, so nothing it still writes is cut off
+        _stop_if_finished(process, trace_info, result_files)
+        tail_ue5_log(monitor, trace_info, tailer, final=True, detector=detector)
+    
+    finally:
+        watcher.close()
+        if tailer:
+            tailer.close()
+
+
+def _follow_stdout(process, monitor, trace_info, result_files=(), detector=None):
+    """Stream the child's stdout pipe until the process exits, monitoring stops or results are written"""
+    # Lines after a fatal match still reach the summary and full log, until the drain below ends
+    drained = threading.Event()
+    
+    def on_line(line):
+        if not drained.is_set():
+            handle_line(line, monitor, trace_info, detector)
+    
+    reader = StdoutReader(process.stdout, on_line)
+    reader.start()
+    print("[✓] 直接读取UE5标准输出 (-stdout)")
+    
+    while process.poll() is None and monitor.is_running and reader.is_alive():
+        reader.join(LOG_WAIT_TIMEOUT)
+        read_trace_events(trace_info)
+        if _results_written(result_files, monitor):
+            break
+    
+    # Drain whatever is still in the pipe after exit - the editor holds it open while it lives
+    _stop_if_finished(process, trace_info, result_files)
+    reader.join(timeout=5)
+    drained.set()
+    if reader.error and DEBUG_MODE:
+        print(f"[DEBUG] 标准输出读取错误: {reader.error}")
+    if DEBUG_MODE:
+        print(f"[DEBUG] 从标准输出读取了 {reader.lines_read} 行")
 
 
 def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_mtime):
@@ -80,30 +284,68 @@ def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_m
             result_code: 0=success, 1=failure, 2=needs_retry
             reason_message: detailed reason
     """
+    budgets = PhaseBudgets.load(MAP_NAME)
+    try:
+        monitor, trace_info = run_ue5_session(SCRIPT_PATH, log_file, full_log_file, [RESULT_FILE], FatalDetector(), budgets,
+                                              TRACE_EVENTS_FILE, TIMELINE_FILE)
+    except KeyboardInterrupt:
+        return (1, "用户中断")
+    
+    # Analyze result (manifest gives the exact answer when the generator wrote one)
+    result = analyze_result(trace_info, old_size, old_mtime, MAP_PATH, read_manifest(RESULT_FILE))
+    record_attempt(MAP_NAME, "single", attempt_num, result, trace_info, monitor)
+    
+    # Learn phase budgets from healthy runs only
+    if result[0] == 0:
+        budgets.record_run(trace_info.checkpoints)
+        budgets.save()
+    return result
+
+
+def stop_process(process):
+    """Terminate the editor, escalating to kill after 5 seconds"""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_ue5_session(script_path, log_file, full_log_file, result_files=(), detector=None, budgets=None,
+                    trace_events_file=None, timeline_file=None):
+    """
+    Run one UE5 editor session for script_path, monitor it and print/save the summary
+    
+    Args:
+        script_path: Generator script (plus optional arguments) passed to `py`
+        log_file: Compressed summary log path
+        full_log_file: Full UE5 output log path
+        result_files: Result manifests that end the session as soon as they all exist
+        detector: Optional FatalDetector - a fatal line terminates the editor at once
+        budgets: Optional PhaseBudgets - per-phase silence timeouts instead of TIMEOUT_SECONDS
+        trace_events_file: Structured trace event file the generator writes (see trace_events.py)
+        timeline_file: Chrome Trace Event JSON written after the session (see chrome_trace.py)
+    
+    Returns:
+        tuple: (monitor, trace_info)
+    
+    Raises:
+        KeyboardInterrupt: User interrupted (process already terminated)
+    """
     # Ensure DerivedDataCache directory exists
     ddc_dir = Path("DerivedDataCache")
     if not ddc_dir.exists():
         print(f"[初始化] 创建 DDC 目录: {ddc_dir}")
         ddc_dir.mkdir(parents=True, exist_ok=True)
     
-    # ExecCmds format - use quotes for the command
-    exec_cmd = f'py {SCRIPT_PATH}'
-    
     # Prepare environment variables
-    import os
-    env = os.environ.copy()
+    trace_events = open_trace_events(trace_events_file)
+    env = build_ue5_env(trace_events)
     
-    cmd = [
-        ENGINE_PATH,
-        PROJECT_PATH,
-        f'-ExecCmds={exec_cmd}',
-        '-stdout',
-        '-unattended',
-        '-nopause',
-        '-nosplash',
-        '-NoCompile'                      # Skip C++ compilation check (Python scripts don't modify C++ source)
-        # Let UE5 auto-launch Zen Server (better performance than file system cache)
-    ]
+    cmd = build_ue5_command(script_path)
     
     print(f"[{datetime.now().strftime('%H:%M:%S')}] 启动UE5...")
     if DEBUG_MODE:
@@ -115,39 +357,45 @@ def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_m
     # Delete old log files to ensure UE5 creates a new one
     deleted_count = 0
     if UE5_LOG_DIR.exists():
-        old_log_files = list(UE5_LOG_DIR.glob("shijiewuxian*.log"))
-        for log_file in old_log_files:
+        old_log_files = list(UE5_LOG_DIR.glob(UE5_LOG_PATTERN))
+        for old_log in old_log_files:
             try:
-                log_file.unlink()
+                old_log.unlink()
                 deleted_count += 1
             except Exception as e:
                 if DEBUG_MODE:
-                    print(f"[DEBUG] 无法删除 {log_file.name}: {e}")
+                    print(f"[DEBUG] 无法删除 {old_log.name}: {e}")
     
     if DEBUG_MODE:
         print(f"[DEBUG] 已删除 {deleted_count} 个旧日志文件")
     
-    # Record that we expect a new log file
-    existing_log_files = set()  # Empty set since we deleted all logs
+    # Delete old result manifests so a stale one never ends the session early
+    clear_result_files(result_files)
     
     # Create monitor
     monitor = OutputMonitor(log_file=log_file, full_log_file=full_log_file)
     
     # Create trace info
     trace_info = TraceInfo()
+    trace_info.trace_events = trace_events
     
     # Run process
     if DEBUG_MODE:
         print(f"[DEBUG] 启动命令: {' '.join(cmd[:3])}")
         print(f"[DEBUG] 环境变量: UE-ZenHostName={env.get('UE-ZenHostName')}, UE-ZenPort={env.get('UE-ZenPort')}")
     
-    # Redirect stdout to devnull to avoid pipe blocking and keep output clean
-    # We read from log files instead for monitoring
-    devnull = open(os.devnull, 'w')
+    if STREAM_STDOUT:
+        # Pipe stdout (stderr merged) - a dedicated reader thread keeps it drained
+        output = subprocess.PIPE
+        errors = subprocess.STDOUT
+    else:
+        # Redirect stdout to devnull to avoid pipe blocking and keep output clean
+        # We read from log files instead for monitoring
+        output = errors = open(os.devnull, 'w')
     process = subprocess.Popen(
         cmd,
-        stdout=devnull,  # Redirect to null to avoid blocking
-        stderr=devnull,  # Redirect to null
+        stdout=output,
+        stderr=errors,
         env=env          # Pass environment variables with IPv4 Zen Server config
     )
     if DEBUG_MODE:
@@ -156,80 +404,29 @@ def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_m
     # Start timeout monitor thread
     monitor_thread = threading.Thread(
         target=monitor_timeout,
-        args=(monitor, TIMEOUT_SECONDS, CHECK_INTERVAL, process)
+        args=(monitor, TIMEOUT_SECONDS, CHECK_INTERVAL, process, trace_info, budgets)
     )
     monitor_thread.daemon = True
     monitor_thread.start()
     
-    # Monitor UE5 log file instead of stdout
+    # Follow UE5 output (stdout pipe or Saved/Logs file)
     try:
-        startup_wait_shown = False
-        last_log_check = time.time()
-        ue5_log_file = None
-        log_start_pos = 0
-        log_file_found = False
-        wait_for_new_file_timeout = 60  # Wait up to 60 seconds for new log file
-        start_wait_time = time.time()
-        
-        while process.poll() is None and monitor.is_running:
-            # Check for new log file every 0.5 seconds
-            if not log_file_found or time.time() - last_log_check > 2:
-                # Find new log files created after UE5 started
-                if UE5_LOG_DIR.exists():
-                    current_log_files = set(UE5_LOG_DIR.glob("shijiewuxian*.log"))
-                    new_log_files = current_log_files - existing_log_files
-                    
-                    if DEBUG_MODE and not log_file_found and time.time() - start_wait_time > 10:
-                        # Show debug info every 10 seconds
-                        if int(time.time() - start_wait_time) % 10 == 0:
-                            print(f"[DEBUG] 当前日志文件数: {len(current_log_files)}, 新文件数: {len(new_log_files)}")
-                            if current_log_files:
-                                latest = max(current_log_files, key=lambda p: p.stat().st_mtime)
-                                print(f"[DEBUG] 最新文件: {latest.name}, 修改时间: {latest.stat().st_mtime}")
-                    
-                    if new_log_files:
-                        # Use the newest log file (ONLY new files)
-                        new_log_file = max(new_log_files, key=lambda p: p.stat().st_mtime)
-                        if new_log_file != ue5_log_file:
-                            print(f"[✓] 检测到新日志文件: {new_log_file.name}")
-                            ue5_log_file = new_log_file
-                            log_start_pos = 0  # Start from beginning of new file
-                            log_file_found = True
-                            # Reset monitor's last_output_time to start timeout from now
-                            monitor.last_output_time = None
-                            monitor.has_output = False
-                    elif not log_file_found:
-                        # Check if we've been waiting too long
-                        if time.time() - start_wait_time > wait_for_new_file_timeout:
-                            print(f"\n[错误] {wait_for_new_file_timeout}秒内未检测到新日志文件")
-                            print(f"  UE5 可能启动失败或日志文件路径错误")
-                            print(f"  请检查: {UE5_LOG_DIR}")
-                            monitor.stop()
-                            break
-                
-                last_log_check = time.time()
-            
-            if ue5_log_file:
-                log_start_pos, ue5_log_file = tail_ue5_log(monitor, trace_info, process, log_start_pos, ue5_log_file)
-            
-            # Show startup wait message if no output yet
-            if not log_file_found and not startup_wait_shown:
-                if time.time() - monitor.start_time > 5:
-                    print("[等待] UE5正在启动，等待新日志文件创建...")
-                    startup_wait_shown = True
-            
-            time.sleep(0.5)  # Check every 0.5 seconds
-        
-        # Read any remaining log content
-        tail_ue5_log(monitor, trace_info, process, log_start_pos, ue5_log_file)
-    
+        if STREAM_STDOUT:
+            _follow_stdout(process, monitor, trace_info, result_files, detector)
+        else:
+            _follow_log_file(process, monitor, trace_info, result_files, detector)
     except KeyboardInterrupt:
         print("\n[监控] 用户中断")
         process.terminate()
-        return (1, "用户中断")
+        raise
     
+    # Editor keeps running after the script finished - no need to wait for the silence timeout
+    _stop_if_finished(process, trace_info, result_files)
     process.wait()
     monitor.stop()
+    read_trace_events(trace_info, final=True)
+    if trace_events is not None:
+        trace_events.close()
     
     # Output summary
     print("\n" + "="*60)
@@ -239,6 +436,7 @@ def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_m
     
     # Print progress stats
     print_progress_stats(trace_info)
+    print_log_activity(monitor.record_store)
     
     # Print trace info (now includes module history and performance analysis)
     print_trace_info(trace_info)
@@ -247,6 +445,6 @@ def run_generation_attempt(attempt_num, log_file, full_log_file, old_size, old_m
     
     # Save logs
     save_logs(monitor)
+    export_session_timeline(trace_info, monitor, timeline_file)
     
-    # Analyze result
-    return analyze_result(trace_info, old_size, old_mtime)
+    return monitor, trace_info
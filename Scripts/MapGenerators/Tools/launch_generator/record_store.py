@@ -0,0 +1,224 @@
+"""
+Record store module - columnar storage of parsed UE5 log records
+One typed array per field (timestamp, category code, verbosity code): 11 bytes per line
+instead of a LogRecord object. Message text is not kept - the full log has it on disk -
+except for the few records the caller marks (CHECKPOINT lines for the timeline export).
+Queries work on whole columns (vectorized with NumPy when installed)
+"""
+
+import calendar
+import math
+import threading
+import time
+from array import array
+from log_record import VERBOSITIES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# '2025.12.18-11.05.00:728' (UE5 writes UTC)
+TIMESTAMP_FORMAT = '%Y.%m.%d-%H.%M.%S'
+ERROR_VERBOSITIES = ('Error', 'Fatal')
+
+
+class RecordStore:
+    """
+    Append-only columns of log records
+    
+    Usage:
+        store = RecordStore()
+        store.append(record)                       # per line (OutputMonitor.add_line)
+        store.append(record, keep_message=True)    # ... keeping its text (store.messages)
+        store.category_counts()                    # {'LogPython': 342, ...}
+        store.last('LogPython')                    # index of the last LogPython record
+        store.error_density(window=10)             # [(window_start_seconds, errors), ...]
+    """
+    
+    def __init__(self):
+        self.timestamps = array('d')   # Seconds since epoch, NaN = no timestamp
+        self.categories = array('H')   # Index into category_names (0 = no category)
+        self.verbosities = array('B')  # Index into VERBOSITIES
+        self.category_names = [None]
+        self._category_codes = {None: 0}
+        self._verbosity_codes = {name: code for code, name in enumerate(VERBOSITIES)}
+        self.messages = {}  # Record index -> message, only for records appended with keep_message
+        self._seconds = {}  # 'YYYY.MM.DD-HH.MM.SS' -> epoch seconds (consecutive lines share it)
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.categories)
+    
+    def append(self, record, keep_message=False):
+        """
+        Add one log_record.LogRecord
+        
+        Args:
+            keep_message: Also keep the message text (message() / messages)
+        """
+        with self._lock:
+            if keep_message:
+                self.messages[len(self.categories)] = record.message
+            self.timestamps.append(self._parse_timestamp(record.timestamp))
+            code = self._category_codes.get(record.category)
+            if code is None:
+                code = self._category_codes[record.category] = len(self.category_names)
+                self.category_names.append(record.category)
+            self.categories.append(code)
+            self.verbosities.append(self._verbosity_codes[record.verbosity])
+    
+    def _parse_timestamp(self, timestamp):
+        if timestamp is None:
+            return math.nan
+        second, _, millis = timestamp.partition(':')
+        seconds = self._seconds.get(second)
+        if seconds is None:
+            try:
+                seconds = calendar.timegm(time.strptime(second, TIMESTAMP_FORMAT))
+            except ValueError:
+                return math.nan
+            self._seconds[second] = seconds
+        return seconds + (int(millis) / 1000 if millis.isdigit() else 0)
+    
+    def message(self, index):
+        """Message text of one record (None unless it was appended with keep_message)"""
+        return self.messages.get(index)
+    
+    def _columns(self):
+        """Copies of the columns (NumPy arrays when available) - appends may continue meanwhile"""
+        with self._lock:
+            columns = (self.timestamps[:], self.categories[:], self.verbosities[:])
+        if np is not None:
+            return tuple(np.frombuffer(column, dtype=column.typecode) for column in columns)
+        return columns
+    
+    def start_time(self):
+        """Timestamp of the first timestamped record (None if there is none)"""
+        for timestamp in self.timestamps:
+            if not math.isnan(timestamp):
+                return timestamp
+        return None
+    
+    def time_offset(self, index):
+        """Seconds from the first timestamped record to record index (None if untimed)"""
+        start = self.start_time()
+        timestamp = self.timestamps[index]
+        if start is None or math.isnan(timestamp):
+            return None
+        return timestamp - start
+    
+    def category_counts(self, start=0):
+        """
+        Args:
+            start: First record index to count
+        
+        Returns:
+            dict: {category: records}, most frequent first (records without category excluded)
+        """
+        _, categories, _ = self._columns()
+        categories = categories[start:]
+        if np is not None:
+            counts = np.bincount(categories, minlength=len(self.category_names)).tolist()
+        else:
+            counts = [0] * len(self.category_names)
+            for code in categories:
+                counts[code] += 1
+        ranked = sorted(range(1, len(counts)), key=lambda code: counts[code], reverse=True)
+        return {self.category_names[code]: counts[code] for code in ranked if counts[code]}
+    
+    def indices(self, category):
+        """Indices of all records of a category"""
+        code = self._category_codes.get(category)
+        if code is None:
+            return []
+        _, categories, _ = self._columns()
+        if np is not None:
+            return np.flatnonzero(categories == code).tolist()
+        return [index for index, value in enumerate(categories) if value == code]
+    
+    def first(self, category):
+        """Index of the first record of a category (None if absent)"""
+        code = self._category_codes.get(category)
+        if code is None:
+            return None
+        _, categories, _ = self._columns()
+        if np is not None:
+            hits = np.flatnonzero(categories == code)
+            return int(hits[0]) if hits.size else None
+        try:
+            return categories.index(code)
+        except ValueError:
+            return None
+    
+    def last(self, category):
+        """Index of the last record of a category (None if absent)"""
+        code = self._category_codes.get(category)
+        if code is None:
+            return None
+        _, categories, _ = self._columns()
+        if np is not None:
+            hits = np.flatnonzero(categories == code)
+            return int(hits[-1]) if hits.size else None
+        for index in range(len(categories) - 1, -1, -1):
+            if categories[index] == code:
+                return index
+        return None
+    
+    def _histogram(self, window, mask_of=None):
+        """Records selected by mask_of(categories, verbosities) (None = all) per time window since the start"""
+        timestamps, categories, verbosities = self._columns()
+        start = self.start_time()
+        if start is None:
+            return []
+        if np is not None:
+            selected = ~np.isnan(timestamps)
+            if mask_of is not None:
+                selected &= mask_of(categories, verbosities)
+            # Lines from other threads can be slightly older than the first one
+            bins = np.maximum((timestamps[selected] - start) // window, 0).astype(np.int64)
+            counts = np.bincount(bins).tolist() if bins.size else []
+        else:
+            counts = []
+            for timestamp, category, verbosity in zip(timestamps, categories, verbosities):
+                if math.isnan(timestamp) or (mask_of is not None and not mask_of(category, verbosity)):
+                    continue
+                slot = max(int((timestamp - start) // window), 0)
+                counts.extend([0] * (slot + 1 - len(counts)))
+                counts[slot] += 1
+        return [(slot * window, count) for slot, count in enumerate(counts)]
+    
+    def lines_per_second(self, category=None):
+        """
+        Args:
+            category: Only records of this category (None = all records)
+        
+        Returns:
+            list: [(second_since_start, records), ...] for every second up to the last record
+        """
+        if category is None:
+            return self._histogram(1)
+        code = self._category_codes.get(category, -1)
+        return self._histogram(1, lambda categories, verbosities: categories == code)
+    
+    def error_density(self, window=10, verbosities=ERROR_VERBOSITIES):
+        """
+        Error records per time window
+        
+        Returns:
+            list: [(window_start_seconds, errors), ...]
+        """
+        codes = [self._verbosity_codes[name] for name in verbosities]
+        if np is not None:
+            return self._histogram(window, lambda categories, levels: np.isin(levels, codes))
+        return self._histogram(window, lambda category, level: level in codes)
+    
+    def peak_error_window(self, window=10, verbosities=ERROR_VERBOSITIES):
+        """
+        Returns:
+            tuple: (window_start_seconds, errors) of the densest window, None without errors
+        """
+        density = self.error_density(window, verbosities)
+        peak = max(density, key=lambda entry: entry[1], default=None)
+        return peak if peak and peak[1] else None
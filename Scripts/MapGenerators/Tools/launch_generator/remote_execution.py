@@ -0,0 +1,235 @@
+"""
+Remote execution module - client for the PythonScriptPlugin remote execution protocol
+
+Protocol (same as Engine/Plugins/Experimental/PythonScriptPlugin/Content/Python/remote_execution.py):
+    - Discovery: JSON "ping" messages on a UDP multicast group, editors answer with "pong"
+    - Connection: client listens on a TCP port and asks the editor (via "open_connection")
+      to connect back to it
+    - Commands: "command" messages over TCP, answered with "command_result"
+      (success flag, result string and the log output captured while the command ran)
+
+The editor must run with remote execution enabled (bRemoteExecution, see
+editor_daemon.remote_execution_args()).
+"""
+
+import codecs
+import json
+import socket
+import time
+import uuid
+
+
+PROTOCOL_VERSION = 1
+PROTOCOL_MAGIC = 'ue_py'
+
+# Execution modes understood by the editor
+MODE_EXEC_FILE = 'ExecuteFile'
+MODE_EXEC_STATEMENT = 'ExecuteStatement'
+MODE_EVAL_STATEMENT = 'EvaluateStatement'
+
+# Bytes per TCP recv() call
+RECV_SIZE = 64 * 1024
+
+
+class RemoteExecutionError(Exception):
+    """Raised when the editor cannot be reached or the connection breaks"""
+
+
+class RemoteExecutionClient:
+    """
+    Discovers one editor node and runs Python commands in it
+    
+    Usage:
+        client = RemoteExecutionClient(('239.0.0.1', 6767), ('127.0.0.1', 6777))
+        node = client.discover(timeout=30)
+        client.connect(node['node_id'])
+        result = client.run_command("print('hi')")
+        client.close()
+    """
+    
+    def __init__(self, multicast_group, command_endpoint, multicast_bind_address='127.0.0.1'):
+        self.multicast_group = multicast_group
+        self.command_endpoint = command_endpoint
+        self.multicast_bind_address = multicast_bind_address
+        self.node_id = str(uuid.uuid4())
+        self.remote_node_id = None
+        self._udp = None
+        self._command_socket = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._receive_buffer = ''
+    
+    def _message(self, message_type, dest=None, data=None):
+        """Encode one protocol message"""
+        message = {
+            'version': PROTOCOL_VERSION,
+            'magic': PROTOCOL_MAGIC,
+            'type': message_type,
+            'source': self.node_id,
+        }
+        if dest:
+            message['dest'] = dest
+        if data is not None:
+            message['data'] = data
+        return json.dumps(message, ensure_ascii=False).encode('utf-8')
+    
+    def _is_for_us(self, message):
+        """Valid protocol message that is not our own multicast echo"""
+        return (isinstance(message, dict)
+                and message.get('version') == PROTOCOL_VERSION
+                and message.get('magic') == PROTOCOL_MAGIC
+                and message.get('source') != self.node_id
+                and message.get('dest') in (None, self.node_id))
+    
+    def _open_udp(self):
+        """Join the multicast group used for ping/pong and open_connection"""
+        if self._udp is not None:
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        bind_address = socket.inet_aton(self.multicast_bind_address)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, bind_address)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 0)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                        socket.inet_aton(self.multicast_group[0]) + bind_address)
+        sock.bind(('', self.multicast_group[1]))
+        sock.settimeout(0.2)
+        self._udp = sock
+    
+    def discover(self, timeout, accept=None):
+        """
+        Ping until an editor node answers
+        
+        Args:
+            timeout: Seconds to keep pinging
+            accept: Optional predicate on the pong data (e.g. matching project_root)
+        
+        Returns:
+            dict: Pong data plus 'node_id', or None on timeout
+        """
+        self._open_udp()
+        deadline = time.time() + timeout
+        next_ping = 0
+        while time.time() < deadline:
+            if time.time() >= next_ping:
+                self._udp.sendto(self._message('ping'), self.multicast_group)
+                next_ping = time.time() + 1
+            try:
+                data, _ = self._udp.recvfrom(RECV_SIZE)
+            except socket.timeout:
+                continue
+            try:
+                message = json.loads(data.decode('utf-8'))
+            except ValueError:
+                continue
+            if not self._is_for_us(message) or message.get('type') != 'pong':
+                continue
+            node = dict(message.get('data') or {})
+            node['node_id'] = message['source']
+            if accept is None or accept(node):
+                return node
+        return None
+    
+    def connect(self, remote_node_id, timeout=10):
+        """Ask the editor to open the TCP command channel back to us"""
+        self._open_udp()
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            server.bind(self.command_endpoint)
+            server.listen(1)
+            server.settimeout(timeout)
+            self._udp.sendto(self._message('open_connection', remote_node_id, {
+                'command_ip': self.command_endpoint[0],
+                'command_port': self.command_endpoint[1],
+            }), self.multicast_group)
+            try:
+                self._command_socket, _ = server.accept()
+            except socket.timeout:
+                raise RemoteExecutionError(f"编辑器未在 {timeout} 秒内建立命令连接")
+        finally:
+            server.close()
+        self._command_socket.setblocking(True)
+        self.remote_node_id = remote_node_id
+        self._decoder.reset()
+        self._receive_buffer = ''
+    
+    def _receive_message(self, timeout):
+        """Read one JSON message from the command channel (messages are not length-prefixed)"""
+        decoder = json.JSONDecoder()
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            text = self._receive_buffer.lstrip()
+            if text:
+                try:
+                    message, end = decoder.raw_decode(text)
+                except ValueError:
+                    pass
+                else:
+                    self._receive_buffer = text[end:]
+                    return message
+            
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise socket.timeout()
+            self._command_socket.settimeout(remaining)
+            data = self._command_socket.recv(RECV_SIZE)
+            if not data:
+                raise RemoteExecutionError("编辑器关闭了命令连接")
+            self._receive_buffer += self._decoder.decode(data)
+    
+    def run_command(self, command, mode=MODE_EXEC_STATEMENT, timeout=None, unattended=True):
+        """
+        Run a Python command in the connected editor
+        
+        Args:
+            command: Python source, statement or file path (+ arguments) depending on mode
+            mode: One of MODE_EXEC_FILE, MODE_EXEC_STATEMENT, MODE_EVAL_STATEMENT
+            timeout: Seconds to wait for the result (None = forever)
+        
+        Returns:
+            dict: success, result, output ([{'type', 'output'}, ...])
+        
+        Raises:
+            socket.timeout: No result within timeout
+            RemoteExecutionError: Not connected or connection lost
+        """
+        if self._command_socket is None:
+            raise RemoteExecutionError("未连接到编辑器")
+        try:
+            self._command_socket.sendall(self._message('command', self.remote_node_id, {
+                'command': command,
+                'unattended': unattended,
+                'exec_mode': mode,
+            }))
+            while True:
+                message = self._receive_message(timeout)
+                if self._is_for_us(message) and message.get('type') == 'command_result':
+                    return message.get('data') or {}
+        except OSError as e:
+            if isinstance(e, socket.timeout):
+                raise
+            raise RemoteExecutionError(f"命令连接中断: {e}")
+    
+    def close(self):
+        """Close the command channel and leave the multicast group"""
+        if self._command_socket is not None:
+            try:
+                self._udp.sendto(self._message('close_connection', self.remote_node_id), self.multicast_group)
+            except OSError:
+                pass
+            self._command_socket.close()
+            self._command_socket = None
+        if self._udp is not None:
+            self._udp.close()
+            self._udp = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
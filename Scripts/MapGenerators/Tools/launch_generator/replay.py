@@ -0,0 +1,209 @@
+"""
+Replay module - streams a recorded UE5 log through the real launcher pipeline
+
+A child process ("player") writes the recorded lines into a fresh Saved/Logs file,
+with the original inter-line timing (scaled by --speed) or as fast as possible,
+while run_generation_attempt() follows it exactly as it follows UnrealEditor-Cmd.
+Reports end-to-end parse latency (line written -> line handled) and launcher CPU.
+
+Everything runs in a scratch working directory, so the real Saved/ state
+(phase budgets, run history, result manifests) is never touched.
+
+Usage:
+    python replay.py <recorded_log> [--speed 1.0] [--linger 0] [--workdir DIR]
+    
+    Example:
+        python replay.py ../../ue5_full_log.txt --speed 10
+        python replay.py ../../ue5_full_log.txt --speed 0    (no delays)
+"""
+
+import argparse
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+import process_runner
+from config import UE5_LOG_DIR, UE5_LOG_PATTERN
+from log_writer import open_full_log
+from phase_budget import percentile
+
+
+# [2025.12.18-11.05.00:728][  0]LogPython: ...
+UE_TIMESTAMP = re.compile(r'^\[(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}):(\d{3})\]')
+
+# Header written by log_saver.save_logs() in front of a saved full log
+SAVED_LOG_TITLE = "完整输出日志"
+
+# Log file the player writes (must match UE5_LOG_PATTERN so the launcher picks it up)
+REPLAY_LOG_NAME = UE5_LOG_PATTERN.replace('*', '_replay')
+
+
+def load_recording(path):
+    """
+    Read a recorded UE5 log
+    
+    Accepts a raw Saved/Logs file or a full log saved by the launcher (header skipped, .gz / .zst read directly).
+    Lines without a UE timestamp (continuations, startup banner) get the previous line's offset.
+    
+    Returns:
+        list: [(offset_seconds, line), ...]
+    """
+    with open_full_log(path) as f:
+        lines = f.readlines()
+    if len(lines) >= 3 and lines[1].strip() == SAVED_LOG_TITLE:
+        lines = lines[4:] if len(lines) > 3 and not lines[3].strip() else lines[3:]
+    
+    recording = []
+    first = None
+    offset = 0.0
+    for line in lines:
+        match = UE_TIMESTAMP.match(line)
+        if match:
+            moment = datetime.strptime(match.group(1), '%Y.%m.%d-%H.%M.%S').timestamp() + int(match.group(2)) / 1000
+            if first is None:
+                first = moment
+            # Clock never runs backwards (log lines from other threads can be slightly out of order)
+            offset = max(offset, moment - first)
+        recording.append((offset, line if line.endswith('\n') else line + '\n'))
+    return recording
+
+
+def play(recording, log_path, sent_path, speed, linger=0):
+    """
+    Player process: append the recording to log_path, recording the write time of every line
+    
+    Args:
+        speed: Playback speed factor (0 = no delays)
+        linger: Seconds to stay alive after the last line (an idle editor)
+    """
+    # terminate() from the launcher must still flush the send times
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    start = time.time()
+    with open(log_path, 'a', encoding='utf-8') as log, open(sent_path, 'w') as sent:
+        for offset, line in recording:
+            if speed > 0:
+                delay = start + offset / speed - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            # Time taken before the write: the launcher may read the line before write() returns
+            sent.write(f"{time.time():.6f}\n")
+            log.write(line)
+            log.flush()
+        sent.flush()
+        time.sleep(linger)
+
+
+def _load_sent_times(sent_path):
+    try:
+        with open(sent_path) as f:
+            return [float(value) for value in f if value.strip()]
+    except OSError:
+        return []
+
+
+def replay(recording_path, speed=1.0, linger=0, workdir=None):
+    """
+    Run one generation attempt against a replayed log
+    
+    Returns:
+        dict: result, lines_sent, lines_handled, wall_seconds, cpu_seconds, latency_ms (sorted)
+    """
+    recording_path = Path(recording_path).resolve()
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="replay_")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+    
+    log_path = (UE5_LOG_DIR / REPLAY_LOG_NAME).resolve()
+    sent_path = workdir / "replay_sent_times.txt"
+    player = [sys.executable, str(Path(__file__).resolve()), str(recording_path), '--play',
+              '--speed', str(speed), '--linger', str(linger), '--log', str(log_path), '--sent', str(sent_path)]
+    
+    # Launch the player instead of UnrealEditor-Cmd, time-stamp every handled line
+    received = []
+    handle_line = process_runner.handle_line
+    build_ue5_command = process_runner.build_ue5_command
+    
+    def timed_handle_line(line, monitor, trace_info, detector=None):
+        received.append(time.time())
+        handle_line(line, monitor, trace_info, detector)
+    
+    process_runner.build_ue5_command = lambda script_path, extra_args=(): player
+    process_runner.handle_line = timed_handle_line
+    
+    cpu_start = time.process_time()
+    wall_start = time.time()
+    try:
+        result = process_runner.run_generation_attempt(1, workdir / "last_run.log", workdir / "ue5_full_log.txt", 0, None)
+    finally:
+        process_runner.handle_line = handle_line
+        process_runner.build_ue5_command = build_ue5_command
+    
+    sent = _load_sent_times(sent_path)
+    return {
+        'result': result,
+        'lines_sent': len(sent),
+        'lines_handled': len(received),
+        'wall_seconds': time.time() - wall_start,
+        'cpu_seconds': time.process_time() - cpu_start,
+        'latency_ms': sorted((r - s) * 1000 for s, r in zip(sent, received)),
+        'workdir': workdir,
+    }
+
+
+def print_report(stats):
+    """Print the replay benchmark report"""
+    latency = stats['latency_ms']
+    handled = max(stats['lines_handled'], 1)
+    print("\n" + "="*60)
+    print("  回放报告")
+    print("="*60)
+    print(f"结果: {stats['result'][0]} ({stats['result'][1]})")
+    print(f"行数: 写入 {stats['lines_sent']}，处理 {stats['lines_handled']}")
+    print(f"墙钟时间: {stats['wall_seconds']:.2f}秒")
+    print(f"启动器CPU: {stats['cpu_seconds']:.3f}秒 "
+          f"({stats['cpu_seconds'] / max(stats['wall_seconds'], 1e-9) * 100:.1f}%，"
+          f"{stats['cpu_seconds'] / handled * 1e6:.1f}微秒/行)")
+    if latency:
+        print(f"解析延迟: p50 {percentile(latency, 50):.2f}ms, p95 {percentile(latency, 95):.2f}ms, "
+              f"p99 {percentile(latency, 99):.2f}ms, 最大 {latency[-1]:.2f}ms")
+    print(f"工作目录: {stats['workdir']}")
+    print("="*60)
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="回放录制的UE5日志，测量启动器解析延迟和CPU开销")
+    parser.add_argument('recording', help="录制的日志 (Saved/Logs/*.log 或 ue5_full_log.txt[.gz|.zst])")
+    parser.add_argument('--speed', type=float, default=1.0, help="回放速度倍数 (0=不等待，默认: 1)")
+    parser.add_argument('--linger', type=float, default=0, help="最后一行后保持运行的秒数 (模拟空闲编辑器)")
+    parser.add_argument('--workdir', help="临时工作目录 (默认: 新建临时目录)")
+    # Player process (internal)
+    parser.add_argument('--play', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--log', help=argparse.SUPPRESS)
+    parser.add_argument('--sent', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function - entry point"""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    recording = load_recording(args.recording)
+    
+    if args.play:
+        Path(args.log).parent.mkdir(parents=True, exist_ok=True)
+        play(recording, args.log, args.sent, args.speed, args.linger)
+        return 0
+    
+    duration = recording[-1][0] if recording else 0
+    print(f"回放: {args.recording} ({len(recording)} 行，原始时长 {duration:.1f}秒，速度 {args.speed or '不限'})")
+    print_report(replay(args.recording, args.speed, args.linger, args.workdir))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ Result analysis module - analyzes generation results
 from datetime import datetime
 from config import MAP_PATH
 from trace_parser import infer_status_from_context
+from result_manifest import verify_manifest, print_step_timings
+from fatal_detector import classify_fatal
 
 
 # Status icon mapping
@@ -29,20 +31,36 @@ def get_status_icon(status):
     return STATUS_ICONS.get(status, "ℹ️")  # Default to info icon
 
 
-def analyze_result(trace_info, old_size, old_mtime):
+def analyze_result(trace_info, old_size, old_mtime, map_path=MAP_PATH, manifest=None):
     """
     Analyze generation result
     
+    Args:
+        map_path: Expected .umap path (defaults to the configured map)
+        manifest: Result manifest written by the generator (exact check when present)
+    
     Returns:
         tuple: (result_code, reason_message)
             result_code: 0=success, 1=failure, 2=needs_retry
             reason_message: detailed reason
     """
-    map_exists = MAP_PATH.exists()
+    if manifest is not None:
+        result = verify_manifest(manifest, map_path)
+        if result[0] == 0:
+            _print_success_info(old_size, old_mtime, map_path)
+        print_step_timings(manifest)
+        return result
+    
+    # Stopped by the fatal detector: the matched signature is the reason
+    if trace_info.fatal_match:
+        return classify_fatal(trace_info.fatal_match)
+    
+    # No manifest (older generator or editor stopped early): infer from the map file
+    map_exists = map_path.exists()
     
     if map_exists:
         # Success: map file generated
-        _print_success_info(old_size, old_mtime)
+        _print_success_info(old_size, old_mtime, map_path)
         return (0, "地图生成成功")
     
     # Map not generated, analyze why
@@ -65,14 +83,60 @@ def analyze_result(trace_info, old_size, old_mtime):
     return (1, "未知错误：脚本启动但地图未生成，且无编译活动")
 
 
-def _print_success_info(old_size, old_mtime):
+def analyze_batch_result(trace_info, map_settings, old_stats, manifests=None):
+    """
+    Analyze a single-session batch run (Maps/batch_generate.py)
+    
+    Args:
+        trace_info: TraceInfo with batch_maps filled from BATCH_MAP_* checkpoints
+        map_settings: List of per-map settings from config.get_map_settings()
+        old_stats: {map_name: (old_size, old_mtime)} captured before the run
+        manifests: Optional {map_name: manifest} - exact result where present
+    
+    Returns:
+        dict: {map_name: (result_code, reason_message)} - same codes as analyze_result
+    """
+    results = {}
+    for settings in map_settings:
+        map_name = settings['map_name']
+        map_path = settings['map_path']
+        old_size, old_mtime = old_stats.get(map_name, (0, None))
+        batch_entry = trace_info.batch_maps.get(map_name)
+        manifest = (manifests or {}).get(map_name)
+        
+        if manifest is not None:
+            results[map_name] = verify_manifest(manifest, map_path)
+        elif trace_info.fatal_match and (batch_entry is None or batch_entry['status'] == 'running'):
+            # Session killed by a fatal signature before this map finished
+            results[map_name] = classify_fatal(trace_info.fatal_match)
+        elif batch_entry is None:
+            # Editor never reached this map
+            if trace_info.compilation_detected:
+                results[map_name] = (2, "批处理在该地图开始前结束，可能在编译完成前退出")
+            else:
+                results[map_name] = (1, "批处理未运行该地图")
+        elif batch_entry['status'] == 'success':
+            if map_path.exists() and (old_mtime is None or map_path.stat().st_mtime != old_mtime):
+                results[map_name] = (0, "地图生成成功")
+            else:
+                results[map_name] = (1, "脚本报告成功但地图文件未更新")
+        elif batch_entry['status'] == 'running':
+            # Started but never finished - editor stopped mid-map
+            results[map_name] = (2, "地图生成中途UE5退出") if trace_info.compilation_detected else (1, "地图生成中途UE5退出")
+        else:
+            results[map_name] = (1, "Python 脚本执行错误")
+    
+    return results
+
+
+def _print_success_info(old_size, old_mtime, map_path=MAP_PATH):
     """Print success information with file size comparison"""
-    stat = MAP_PATH.stat()
+    stat = map_path.stat()
     new_size = stat.st_size
     new_mtime = stat.st_mtime
     
     print(f"\n✓ 成功: 地图文件已生成")
-    print(f"  路径: {MAP_PATH}")
+    print(f"  路径: {map_path}")
     
     # Show file size comparison
     if old_size > 0:
@@ -137,6 +201,27 @@ def print_progress_stats(trace_info):
             print(f"    ✗ 失败: {trace_info.assets_failed} 个资源加载失败")
 
 
+def print_log_activity(record_store):
+    """Print when the script wrote output and what the engine logged after its last line"""
+    first = record_store.first('LogPython')
+    last = record_store.last('LogPython')
+    
+    print(f"\n日志活动:")
+    if last is None:
+        print(f"  LogPython: 无输出")
+        return
+    
+    start, end = record_store.time_offset(first), record_store.time_offset(last)
+    if start is not None and end is not None:
+        print(f"  LogPython: 第 {start:.1f}秒 - 第 {end:.1f}秒")
+    
+    trailing = len(record_store) - last - 1
+    if trailing:
+        categories = list(record_store.category_counts(last + 1).items())[:3]
+        top = " | ".join(f"{name}×{count}" for name, count in categories)
+        print(f"  脚本最后输出后: {trailing} 行引擎日志" + (f" ({top})" if top else ""))
+
+
 def print_trace_info(trace_info):
     """Print trace information"""
     print(f"\n📍 执行追踪:")
@@ -163,6 +248,9 @@ def print_trace_info(trace_info):
     
     # Show module execution history
     print_trace_history(trace_info)
+    
+    # Show time per generation phase (generator spans)
+    print_span_report(trace_info)
 
 
 def print_trace_history(trace_info):
@@ -175,8 +263,8 @@ def print_trace_history(trace_info):
     total_count = len(history)
     
     print(f"\n  📜 模块执行历史（共 {total_count} 条，按执行顺序）:")
-    print(f"      {'序号':<4}  {'模块':<20}  {'行号':<6}  {'说明':<25}  {'状态':<6}  {'耗时':<10}  {'总共':<10}")
-    print(f"      {'─'*105}")
+    print(f"      {'序号':<4}  {'模块':<20}  {'行号':<6}  {'说明':<25}  {'状态':<6}  {'耗时':<11}  {'总共':<13}")
+    print(f"      {'─'*110}")
     
     for i, entry in enumerate(history, 1):
         module = entry['module'] + '.py'
@@ -200,7 +288,7 @@ def print_trace_history(trace_info):
         else:
             elapsed = timestamp - history[i-2]['timestamp']
         
-        print(f"      {i:3d}.  {module:<20}  {line:<6}  {context:<25}  {status_icon:<6}  {elapsed:6d}ms  {timestamp:8d}ms")
+        print(f"      {i:3d}.  {module:<20}  {line:<6}  {context:<25}  {status_icon:<6}  {elapsed:9.3f}ms  {timestamp:11.3f}ms")
     
     # Performance analysis: find slowest 3 steps
     if len(history) > 1:
@@ -222,4 +310,80 @@ def print_trace_history(trace_info):
         print(f"      最慢的3个步骤:")
         for i, step in enumerate(slowest, 1):
             context = f"({step['context']})" if step['context'] else ""
-            print(f"        {i}. {step['module']}.py:L{step['line']} → {step['elapsed']}ms {context}")
+            print(f"        {i}. {step['module']}.py:L{step['line']} → {step['elapsed']:.3f}ms {context}")
+
+
+def summarize_spans(spans, end_ms=None):
+    """
+    Inclusive and exclusive time per span, in tree order
+    
+    Spans with the same path (e.g. one create_static_mesh per wall) are merged
+    into one row. Exclusive time is the span's own time: inclusive minus the
+    inclusive time of its direct children.
+    
+    Args:
+        spans: TraceInfo.spans
+        end_ms: End time for spans that never closed (default: latest span timestamp)
+    
+    Returns:
+        list: Dicts {'path', 'name', 'depth', 'count', 'inclusive', 'exclusive', 'errors', 'open', 'attributes'}
+    """
+    if end_ms is None:
+        end_ms = max((entry['end'] if entry['end'] is not None else entry['start']) for entry in spans) if spans else 0
+    
+    inclusive = [(entry['end'] if entry['end'] is not None else end_ms) - entry['start'] for entry in spans]
+    exclusive = list(inclusive)
+    for index, entry in enumerate(spans):
+        if entry['parent_index'] is not None:
+            exclusive[entry['parent_index']] -= inclusive[index]
+    
+    rows = {}
+    children = {}
+    for index, entry in enumerate(spans):
+        path = entry['path']
+        row = rows.get(path)
+        if row is None:
+            row = rows[path] = {'path': path, 'name': entry['name'], 'depth': len(path) - 1, 'count': 0,
+                                'inclusive': 0, 'exclusive': 0, 'errors': 0, 'open': 0, 'attributes': {}}
+            children.setdefault(path[:-1], []).append(path)
+        row['count'] += 1
+        row['inclusive'] += inclusive[index]
+        row['exclusive'] += max(exclusive[index], 0)  # Timestamp rounding
+        row['errors'] += entry['status'] == 'error'
+        row['open'] += entry['end'] is None
+        row['attributes'].update(entry['attributes'])
+    
+    # Depth-first: every row directly above its children
+    ordered = []
+    pending = list(reversed(children.get((), [])))
+    while pending:
+        path = pending.pop()
+        ordered.append(rows[path])
+        pending.extend(reversed(children.get(path, [])))
+    return ordered
+
+
+def print_span_report(trace_info):
+    """Print inclusive / exclusive time per generation phase (nothing for generators without spans)"""
+    if not trace_info.spans:
+        return
+    rows = summarize_spans(trace_info.spans)
+    
+    print(f"\n  ⏱️  阶段耗时（span，包含 = 含子阶段，独占 = 自身）:")
+    print(f"      {'阶段':<36}  {'次数':>4}  {'包含':>12}  {'独占':>12}  状态")
+    print(f"      {'─'*84}")
+    for row in rows:
+        name = "  " * row['depth'] + row['name']
+        if row['open']:
+            state = "⏳ 未结束"
+        elif row['errors']:
+            state = get_status_icon("error")
+        else:
+            state = get_status_icon("success")
+        attributes = " ".join(f"{key}={value}" for key, value in row['attributes'].items())
+        print(f"      {name:<36}  {row['count']:>4}  {row['inclusive']:>10.3f}ms  {row['exclusive']:>10.3f}ms  {state} {attributes}".rstrip())
+    
+    slowest = sorted(rows, key=lambda row: row['exclusive'], reverse=True)[:3]
+    print(f"\n      独占耗时最多的3个阶段:")
+    for i, row in enumerate(slowest, 1):
+        print(f"        {i}. {' > '.join(row['path'])} → {row['exclusive']:.3f}ms")
@@ -0,0 +1,84 @@
+"""
+Result manifest module - reads and verifies Saved/MapGenerators/<map>.result.json
+The generator writes the manifest (generate/result_writer.py) as its very last step
+"""
+
+import hashlib
+import json
+
+
+# Bytes per read when hashing the saved .umap
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def clear_result_files(result_files):
+    """Delete manifests left over from an earlier run"""
+    for result_file in result_files:
+        try:
+            result_file.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def results_ready(result_files):
+    """True once every expected manifest exists (written atomically by the generator)"""
+    return bool(result_files) and all(result_file.exists() for result_file in result_files)
+
+
+def read_manifest(result_file):
+    """
+    Load a result manifest
+    
+    Returns:
+        dict: Manifest content, or None if missing/unreadable
+    """
+    try:
+        with open(result_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def hash_file(path):
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_manifest(manifest, map_path):
+    """
+    Check a manifest against the .umap on disk
+    
+    Returns:
+        tuple: (result_code, reason_message) - 0=success, 1=failure
+    """
+    if manifest.get('status') != 'success':
+        return (1, f"生成脚本报告错误: {str(manifest.get('error') or '未知错误')[:100]}")
+    
+    if not map_path.exists():
+        return (1, f"结果清单报告成功，但地图文件不存在: {map_path}")
+    
+    size = map_path.stat().st_size
+    if manifest.get('size') is not None and size != manifest['size']:
+        return (1, f"地图文件大小与结果清单不一致 ({size} != {manifest['size']})")
+    
+    if manifest.get('sha256') and hash_file(map_path) != manifest['sha256']:
+        return (1, "地图文件哈希与结果清单不一致")
+    
+    return (0, "地图生成成功 (结果清单已校验)")
+
+
+def print_step_timings(manifest):
+    """Print per-step timings recorded in the manifest"""
+    steps = manifest.get('steps') or {}
+    if not steps:
+        return
+    print("\n⏱ 步骤耗时 (结果清单):")
+    for step, duration_ms in steps.items():
+        print(f"  {step:<20} {duration_ms / 1000:.2f}秒")
+    if manifest.get('total_ms') is not None:
+        print(f"  {'总计':<18} {manifest['total_ms'] / 1000:.2f}秒")
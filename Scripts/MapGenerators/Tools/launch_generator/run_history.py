@@ -0,0 +1,173 @@
+"""
+Run history module - persists every generation attempt to a local SQLite database
+Keeps per-attempt outcome, trace entries and checkpoint timestamps for trend/regression reports (history_cli.py)
+"""
+
+import sqlite3
+import time
+from config import HISTORY_DB
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    map_name TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    wall_seconds REAL NOT NULL,
+    result_code INTEGER NOT NULL,
+    reason TEXT,
+    line_count INTEGER NOT NULL,
+    error_count INTEGER NOT NULL,
+    trace_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_map ON runs (map_name, started_at);
+CREATE TABLE IF NOT EXISTS trace_entries (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    seq INTEGER NOT NULL,
+    module TEXT,
+    line INTEGER,
+    timestamp_ms INTEGER,
+    status TEXT,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trace_run ON trace_entries (run_id);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER,
+    timestamp_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_run ON checkpoints (run_id);
+"""
+
+
+def get_step_timings(checkpoints):
+    """
+    Pair BEFORE_<STEP>/AFTER_<STEP> checkpoints into step durations
+    
+    Args:
+        checkpoints: [(name, timestamp_ms), ...] in logging order
+    
+    Returns:
+        dict: {step_name: duration_ms} in execution order
+    """
+    started = {}
+    timings = {}
+    for name, timestamp_ms in checkpoints:
+        if name.startswith("BEFORE_"):
+            started[name[len("BEFORE_"):]] = timestamp_ms
+        elif name.startswith("AFTER_") and name[len("AFTER_"):] in started:
+            step = name[len("AFTER_"):]
+            timings[step] = timestamp_ms - started.pop(step)
+    return timings
+
+
+def _in_window(entries, window, key):
+    """Entries logged between a batch map's BATCH_MAP_START and BATCH_MAP_END (all of them without window)"""
+    if window is None:
+        return entries
+    start, end = window[key]
+    return entries[start:end]
+
+
+class RunHistory:
+    """
+    SQLite store of generation attempts
+    
+    Usage:
+        with RunHistory() as history:
+            history.record_run("cosmos_002_training_world", "single", 1, result, trace_info, monitor)
+    """
+    
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+    
+    def record_run(self, map_name, mode, attempt, result, trace_info, monitor, window=None):
+        """
+        Store one attempt
+        
+        Args:
+            mode: Launcher that ran it ("single", "parallel", "batch", "daemon")
+            result: (result_code, reason_message) from analyze_result
+            window: Optional TraceInfo.batch_maps entry - only the trace entries/checkpoints
+                    logged between its markers (batch mode: one editor session covers several maps)
+        
+        Returns:
+            int: Run id
+        """
+        trace_entries = _in_window(trace_info.module_history, window, 'traces')
+        checkpoints = _in_window(trace_info.checkpoints, window, 'checkpoints')
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (map_name, mode, attempt, started_at, wall_seconds, result_code, reason,"
+                " line_count, error_count, trace_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (map_name, mode, attempt, monitor.start_time, time.time() - monitor.start_time,
+                 result[0], result[1], len(monitor.lines), len(trace_info.error_messages), len(trace_entries))
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO trace_entries (run_id, seq, module, line, timestamp_ms, status, context)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, seq, e['module'], e['line'], e['timestamp'], e.get('status'), e.get('context'))
+                 for seq, e in enumerate(trace_entries)]
+            )
+            self.conn.executemany(
+                "INSERT INTO checkpoints (run_id, seq, name, line, timestamp_ms) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, seq, c['name'], c['line'], c['timestamp']) for seq, c in enumerate(checkpoints)]
+            )
+        return run_id
+    
+    def get_runs(self, map_name=None, limit=20, successful_only=False):
+        """Most recent runs first"""
+        query = "SELECT * FROM runs WHERE 1=1"
+        params = []
+        if map_name:
+            query += " AND map_name = ?"
+            params.append(map_name)
+        if successful_only:
+            query += " AND result_code = 0"
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+    
+    def get_checkpoints(self, run_id):
+        """[(name, timestamp_ms), ...] of one run in logging order"""
+        rows = self.conn.execute(
+            "SELECT name, timestamp_ms FROM checkpoints WHERE run_id = ? ORDER BY seq", (run_id,)
+        )
+        return [(row['name'], row['timestamp_ms']) for row in rows]
+    
+    def get_step_series(self, map_name, limit=20):
+        """
+        Step durations of the most recent successful runs, oldest first
+        
+        Returns:
+            list: [(run dict, {step_name: duration_ms}), ...]
+        """
+        runs = self.get_runs(map_name, limit, successful_only=True)
+        return [(run, get_step_timings(self.get_checkpoints(run['id']))) for run in reversed(runs)]
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def record_attempt(map_name, mode, attempt, result, trace_info, monitor, window=None):
+    """Store one attempt, never letting a history problem fail the generation"""
+    try:
+        with RunHistory() as history:
+            history.record_run(map_name, mode, attempt, result, trace_info, monitor, window)
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠ 保存运行历史失败: {e}")
@@ -0,0 +1,53 @@
+"""
+Stdout reader module - drains the UE5 child's stdout pipe in a dedicated thread
+Used when STREAM_STDOUT is enabled (UE5 runs with -stdout)
+"""
+
+import threading
+from log_tailer import LineSplitter
+
+
+# Bytes per pipe read - read1() returns as soon as any data is available
+PIPE_CHUNK_SIZE = 64 * 1024
+
+
+class StdoutReader(threading.Thread):
+    """
+    Reads a binary pipe until EOF and passes each complete line to on_line
+    
+    The pipe is drained continuously so UE5 never blocks on a full pipe buffer,
+    and lines reach the monitor without the Saved/Logs disk round-trip.
+    """
+    
+    def __init__(self, stream, on_line, chunk_size=PIPE_CHUNK_SIZE):
+        super().__init__(name="ue5-stdout-reader", daemon=True)
+        self.stream = stream
+        self.on_line = on_line
+        self.chunk_size = chunk_size
+        self.lines_read = 0
+        self.error = None
+        self._splitter = LineSplitter()
+    
+    def run(self):
+        """Thread body - read until the child closes its stdout"""
+        read = getattr(self.stream, 'read1', self.stream.read)
+        try:
+            while True:
+                data = read(self.chunk_size)
+                if not data:
+                    break
+                for line in self._splitter.feed(data):
+                    self._emit(line)
+            for line in self._splitter.flush():
+                self._emit(line)
+        except Exception as e:
+            self.error = e
+        finally:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+    
+    def _emit(self, line):
+        self.lines_read += 1
+        self.on_line(line)
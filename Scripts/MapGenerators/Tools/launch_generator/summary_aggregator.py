@@ -0,0 +1,130 @@
+"""
+Summary aggregator module - running aggregates behind the compressed summaries
+Updated once per line as it is added, so periodic and final summaries never rescan the log
+"""
+
+import threading
+from line_classifier import (
+    classify, KEYWORD_BITS, STEP_MARKERS, LOG_PYTHON, SCRIPT_START, PYTHON_ERROR_WORD, ERROR_WORD,
+    UPPER_ERROR, FAILED_TO_LOAD, GENERATOR_ACTOR, SUCCESS_WORD, SUCCESS_BANNER, PROGRESS_STEP, STEP_MARKER
+)
+
+
+# Periodic summary: first matching substring -> short progress message
+IMPORTANT_MESSAGES = [
+    ('STARTING MAP GENERATOR', '✓脚本启动'),
+    ('[1/6]', '✓准备Level'),
+    ('[2/6]', '✓放置TrainingRoom'),
+    ('[3/6]', '✓放置PlayerStart'),
+    ('[4/6]', '✓设置照明'),
+    ('[5/6]', '✓配置GameMode'),
+    ('[6/6]', '✓保存地图'),
+]
+
+# Lines that can produce a periodic summary message
+IMPORTANT_SIGNALS = SUCCESS_WORD | UPPER_ERROR | SCRIPT_START | PROGRESS_STEP
+
+# Errors kept with their text (only these are ever printed, the rest are counted)
+MAX_WINDOW_ERRORS = 3
+MAX_FINAL_ERRORS = 5
+
+
+class SummaryWindow:
+    """Aggregates of the lines since the last periodic summary"""
+    
+    def __init__(self):
+        self.line_count = 0
+        self.keyword_counts = {}
+        self.important_messages = []
+        self.error_details = {}  # Ordered set of the first MAX_WINDOW_ERRORS distinct errors
+
+
+class SummaryAggregator:
+    """
+    Running aggregates for get_new_lines_summary / get_compressed_summary
+    
+    Usage:
+        aggregator = SummaryAggregator()
+        aggregator.add(line)                # per line (OutputMonitor.add_line)
+        window = aggregator.take_window()   # periodic summary, starts a new window
+    """
+    
+    def __init__(self):
+        self.steps_completed = []
+        self.error_count = 0
+        self.errors = []  # First MAX_FINAL_ERRORS errors of the attempt
+        self._window = SummaryWindow()
+        self._lock = threading.Lock()
+    
+    def add(self, line, signals=None):
+        """
+        Update every aggregate with one line
+        
+        Args:
+            signals: line_classifier.classify(line), when the caller already has it
+        """
+        if signals is None:
+            signals = classify(line)
+        with self._lock:
+            window = self._window
+            window.line_count += 1
+            counts = window.keyword_counts
+            if signals >> 32:
+                for keyword, bit in KEYWORD_BITS.items():
+                    if signals & bit:
+                        counts[keyword] = counts.get(keyword, 0) + 1
+            
+            if signals & IMPORTANT_SIGNALS:
+                message = _important_message(line, signals)
+                if message:
+                    window.important_messages.append(message)
+            
+            if signals & ERROR_WORD:
+                counts['错误'] = counts.get('错误', 0) + 1
+                if len(window.error_details) < MAX_WINDOW_ERRORS:
+                    window.error_details.setdefault(line.strip()[:150])
+            
+            if signals & (STEP_MARKER | SUCCESS_BANNER):
+                step = _completed_step(line, signals)
+                if step:
+                    self.steps_completed.append(step)
+            
+            if signals & (PYTHON_ERROR_WORD | FAILED_TO_LOAD):
+                if signals & (LOG_PYTHON | GENERATOR_ACTOR):
+                    self.error_count += 1
+                    if len(self.errors) < MAX_FINAL_ERRORS:
+                        self.errors.append(line.strip())
+    
+    def take_window(self):
+        """
+        Return the current window and start a new one
+        
+        Returns:
+            SummaryWindow: None when no line arrived since the last call
+        """
+        with self._lock:
+            if not self._window.line_count:
+                return None
+            window, self._window = self._window, SummaryWindow()
+            return window
+
+
+def _important_message(line, signals):
+    if signals & SUCCESS_WORD:
+        return '✓成功'
+    if signals & UPPER_ERROR and signals & LOG_PYTHON:
+        return '✗错误'
+    for marker, message in IMPORTANT_MESSAGES:
+        if marker in line:
+            return message
+    return None
+
+
+def _completed_step(line, signals):
+    if signals & STEP_MARKER:
+        for marker, step in STEP_MARKERS:
+            if marker in line:
+                return step
+    if signals & SUCCESS_BANNER and signals & LOG_PYTHON:
+        return "✓ 脚本执行成功"
+    return None
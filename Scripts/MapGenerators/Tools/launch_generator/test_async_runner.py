@@ -0,0 +1,118 @@
+"""
+Unit tests for async_runner.py
+"""
+
+import sys
+import os
+import json
+import re
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+
+# Runs in a child interpreter: short silence timeout, one attempt, every editor process recorded
+DRIVER = """
+import asyncio, json, sys
+import config
+config.TIMEOUT_SECONDS = 2
+config.MAX_ATTEMPTS = 1
+import async_runner
+
+processes = []
+peak = [0]
+create_subprocess_exec = asyncio.create_subprocess_exec
+
+async def tracked(*args, **kwargs):
+    process = await create_subprocess_exec(*args, **kwargs)
+    processes.append(process)
+    peak[0] = max(peak[0], sum(1 for p in processes if p.returncode is None))
+    return process
+
+asyncio.create_subprocess_exec = tracked
+outcomes = asyncio.run(async_runner.run_maps_concurrently([config.get_map_settings(name) for name in sys.argv[1:]], 2))
+print("OUTCOMES", json.dumps({o['map_name']: [o['result'], o['reason']] for o in outcomes}, ensure_ascii=False))
+print("PROCESSES", json.dumps({'started': len(processes), 'peak': peak[0],
+                               'reaped': all(p.returncode is not None for p in processes),
+                               'pids': [p.pid for p in processes]}))
+"""
+
+
+def _pid_alive(pid):
+    """True while a process with this pid exists (and is not a zombie)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != 'Z'
+    except OSError:
+        return False
+
+
+def test_concurrent_maps():
+    """
+    Test three maps on two editor slots: success (manifest stop), hang (silence timeout), crash (fatal line)
+    """
+    print("Testing concurrent maps with the fake engine...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LAUNCH_GENERATOR_ENGINE=str(FAKE_ENGINE), PYTHONPATH=str(FAKE_ENGINE.parent),
+                   FAKE_ENGINE_SCENARIO='map_hang=hang,map_crash=crash', FAKE_ENGINE_SPEED='50',
+                   FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30')
+        started = time.time()
+        output = subprocess.run([sys.executable, '-c', DRIVER, 'map_ok', 'map_hang', 'map_crash'], cwd=tmp, env=env,
+                                capture_output=True, text=True, encoding='utf-8', timeout=120).stdout
+        elapsed = time.time() - started
+        ok_manifest = Path(tmp) / "Saved" / "MapGenerators" / "map_ok.result.json"
+        assert ok_manifest.exists(), "Successful map wrote no manifest"
+    
+    reports = {line.split(' ', 1)[0]: json.loads(line.split(' ', 1)[1])
+               for line in output.splitlines() if line.startswith(('OUTCOMES ', 'PROCESSES '))}
+    assert 'OUTCOMES' in reports, f"Driver failed:\n{output[-1000:]}"
+    outcomes = reports['OUTCOMES']
+    assert outcomes['map_ok'][0] == 0, outcomes
+    assert outcomes['map_hang'][0] != 0, outcomes
+    assert re.search(r"\[map_hang\].*无新输出", output), "Hung editor should be stopped by the silence timeout"
+    assert outcomes['map_crash'][0] == 1 and "致命" in outcomes['map_crash'][1], outcomes
+    assert "[map_crash] [致命]" in output, "Fatal line should be reported with the map label"
+    
+    processes = reports['PROCESSES']
+    assert processes['started'] == 3 and processes['reaped'], processes
+    assert processes['peak'] <= 2, "Semaphore should cap the live editors at 2"
+    assert not any(_pid_alive(pid) for pid in processes['pids']), "An editor process outlived the run"
+    assert elapsed < 60, f"Hung editor was not stopped by the silence timeout ({elapsed:.1f}s)"
+    
+    print("✓ Concurrent maps with the fake engine passed")
+
+
+def run_all_tests():
+    """Run all async_runner tests"""
+    print("\n" + "="*60)
+    print("Running async_runner Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_concurrent_maps()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
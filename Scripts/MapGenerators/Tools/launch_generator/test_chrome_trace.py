@@ -0,0 +1,222 @@
+"""
+Unit tests for chrome_trace.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chrome_trace import build_chrome_trace, checkpoint_anchors, clock_origins, engine_phases, export_timeline
+from log_record import LogRecordParser
+from record_store import RecordStore
+from trace_parser import TraceInfo, parse_line
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+SCRIPT = "D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/cosmos_002_training_world/generate.py"
+
+# Generator clock starts at 11.05.02:000 (SCRIPT_START at 5ms is logged at 02:005)
+LINES = [
+    "[2025.12.18-11.05.00:000][  0]LogInit: Display: Running engine for game: shijiewuxian\n",
+    "[2025.12.18-11.05.00:500][  0]LogPluginManager: Mounting Engine plugin Paper2D\n",
+    "[2025.12.18-11.05.01:000][  0]LogAssetRegistry: Display: Asset registry cache read as 38.1 MiB\n",
+    "[2025.12.18-11.05.02:005][  1]LogPython: [CHECKPOINT:13:5.000] SCRIPT_START\n",
+    "[2025.12.18-11.05.02:005][  1]LogPython: [CHECKPOINT:13:5.000] SCRIPT_START\n",
+    "[2025.12.18-11.05.02:010][  1]LogPython: [SPAN_BEGIN:1:0:10.000] generate_map\n",
+    "[2025.12.18-11.05.02:260][  2]LogPython: [TRACE:room_builder:25:250.500:success] 放置成功: Wall_1\n",
+    "[2025.12.18-11.05.03:000][  3]LogShaderCompilers: Display: Compiling 12 shaders\n",
+    "[2025.12.18-11.05.08:000][  4]LogShaderCompilers: Display: Compiling 3 shaders\n",
+    "[2025.12.18-11.05.08:500][  5]LogPython: [SPAN_BEGIN:2:1:6500.000] save_map\n",
+    "[2025.12.18-11.05.08:700][  5]LogSavePackage: Display: Moving 'Map.umap.tmp' to 'Map.umap'\n",
+    "[2025.12.18-11.05.09:000][  6]LogPython: [SPAN_END:2:7000.000:success] save_map {\"size\": 1024}\n",
+    "[2025.12.18-11.05.09:010][  6]LogPython: [CHECKPOINT:60:7010.000] GENERATION_COMPLETE\n",
+    "[2025.12.18-11.05.10:000][  7]LogExit: Preparing to exit.\n",
+]
+
+
+def _parse(lines):
+    records = LogRecordParser()
+    store = RecordStore()
+    trace_info = TraceInfo()
+    for line in lines:
+        record = records.parse(line)
+        store.append(record, keep_message='[CHECKPOINT:' in line)
+        parse_line(line, trace_info, record=record)
+    return trace_info, store
+
+
+def _events(document, **fields):
+    return [event for event in document['traceEvents'] if all(event.get(k) == v for k, v in fields.items())]
+
+
+def test_clock_alignment():
+    """
+    Test checkpoint anchors and clock origins (one generator run per clock reset)
+    """
+    print("Testing clock alignment...")
+    
+    trace_info, store = _parse(LINES)
+    anchors = checkpoint_anchors(store)
+    assert [name for name, _, _ in anchors] == ['SCRIPT_START', 'GENERATION_COMPLETE'], "Repeated marker dropped"
+    
+    origins, batch_origin = clock_origins(anchors)
+    assert len(origins) == 1 and batch_origin is None
+    assert abs(origins[0] - (store.start_time() + 2.0)) < 1e-6
+    
+    # Batch: map_job clock plus one generator clock per map
+    origins, batch_origin = clock_origins([
+        ('BATCH_MAP_START:a', 1.0, 100.001),
+        ('SCRIPT_START', 5.0, 100.010),
+        ('GENERATION_COMPLETE', 3000.0, 103.006),
+        ('BATCH_MAP_START:b', 3100.0, 103.101),
+        ('SCRIPT_START', 4.0, 103.200),
+    ])
+    assert [round(origin, 3) for origin in origins] == [100.005, 103.196]
+    assert round(batch_origin, 3) == 100.0
+    
+    print("✓ Clock alignment passed")
+
+
+def test_engine_phases():
+    """
+    Test phase slices from log categories (records more than PHASE_GAP apart split a phase)
+    """
+    print("Testing engine phases...")
+    
+    _, store = _parse(LINES)
+    start = store.start_time()
+    phases = [(phase, round(begin - start, 3), round(end - start, 3), records)
+              for phase, begin, end, records in engine_phases(store)]
+    assert phases == [
+        ('startup', 0.0, 0.5, 2),
+        ('asset_registry', 1.0, 1.0, 1),
+        ('shader_compile', 3.0, 3.0, 1),
+        ('shader_compile', 8.0, 8.0, 1),
+        ('python', 2.005, 2.26, 4),
+        ('python', 8.5, 9.01, 3),
+        ('save', 8.7, 8.7, 1),
+        ('shutdown', 10.0, 10.0, 1),
+    ], phases
+    
+    print("✓ Engine phases passed")
+
+
+def test_build_chrome_trace():
+    """
+    Test generator spans, markers and engine phases on one aligned timeline
+    """
+    print("Testing Chrome trace document...")
+    
+    trace_info, store = _parse(LINES[:-4])  # Session killed while save_map runs
+    trace_info_full, store_full = _parse(LINES)
+    
+    document = build_chrome_trace(trace_info_full, store_full)
+    assert document['displayTimeUnit'] == "ms"
+    spans = {event['name']: event for event in _events(document, ph='X', cat="span")}
+    assert spans['save_map']['ts'] == 8500000.0 and spans['save_map']['dur'] == 500000.0
+    assert spans['save_map']['args'] == {'size': 1024, 'status': "success"}
+    assert spans['generate_map']['ts'] == 2010000.0
+    assert spans['generate_map']['args']['status'] == "open"
+    
+    trace = _events(document, ph='i', cat="trace")
+    assert len(trace) == 1
+    assert trace[0]['ts'] == 2250500.0 and trace[0]['name'] == "room_builder:25"
+    assert [event['name'] for event in _events(document, cat="checkpoint")] == ['SCRIPT_START', 'GENERATION_COMPLETE']
+    
+    session = _events(document, cat="engine")[0]
+    assert session['ts'] == 0 and session['dur'] == 10000000.0
+    assert len(_events(document, cat="phase", name="shader_compile")) == 2
+    assert {event['args']['name'] for event in _events(document, ph='M', name='thread_name', pid=2)} >= {
+        'startup', 'asset_registry', 'shader_compile', 'python', 'save', 'shutdown'}
+    
+    # Open span ends with the last generator timestamp of its run
+    document = build_chrome_trace(trace_info, store)
+    spans = {event['name']: event for event in _events(document, ph='X', cat="span")}
+    assert spans['save_map']['args']['status'] == "open" and spans['save_map']['dur'] == 0
+    assert spans['generate_map']['dur'] == 6490000.0
+    
+    # No timestamps: generator ms are placed from 0
+    trace_info, store = _parse(["LogPython: [CHECKPOINT:13:5.000] SCRIPT_START\n"])
+    document = build_chrome_trace(trace_info, store)
+    assert _events(document, cat="checkpoint")[0]['ts'] == 5000.0
+    assert not _events(document, cat="engine")
+    json.dumps(document)
+    
+    print("✓ Chrome trace document passed")
+
+
+def test_fake_engine_timeline():
+    """
+    Test exporting the timeline of a fake engine run
+    """
+    print("Testing fake engine timeline export...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        env = dict(os.environ, FAKE_ENGINE_SPEED='50', FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30',
+                   FAKE_ENGINE_EXIT='quit')
+        subprocess.run(
+            [sys.executable, str(FAKE_ENGINE), r"D:\001xm\shijiewuxian\shijiewuxian.uproject", f"-ExecCmds=py {SCRIPT}",
+             '-stdout', '-unattended'],
+            cwd=project_dir, env=env, stdout=subprocess.DEVNULL, timeout=60
+        )
+        lines = (project_dir / "Saved" / "Logs" / "shijiewuxian.log").read_text(encoding='utf-8').splitlines(True)
+        trace_info, store = _parse(lines)
+        
+        path = project_dir / "Saved" / "MapGenerators" / "map.timeline.json"
+        assert export_timeline(trace_info, store, path)
+        document = json.loads(path.read_text(encoding='utf-8'))
+        assert not path.with_suffix('.tmp').exists()
+        
+        spans = _events(document, ph='X', cat="span")
+        assert len(spans) == 7 and all(event['args']['status'] == "success" for event in spans)
+        assert all(event['ts'] >= 0 for event in document['traceEvents'] if 'ts' in event)
+        phases = {event['name'] for event in _events(document, cat="phase")}
+        assert {'startup', 'shader_compile', 'python', 'save', 'shutdown'} <= phases, phases
+        
+        # Spans nest inside generate_map and lie inside the engine session
+        outer = next(event for event in spans if event['name'] == "generate_map")
+        session = _events(document, cat="engine")[0]
+        for event in spans:
+            assert outer['ts'] <= event['ts'] and event['ts'] + event['dur'] <= outer['ts'] + outer['dur'] + 1
+        assert outer['ts'] + outer['dur'] <= session['dur'] + 1000
+    
+    print("✓ Fake engine timeline export passed")
+
+
+def run_all_tests():
+    """Run all chrome_trace tests"""
+    print("\n" + "="*60)
+    print("Running chrome_trace Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_clock_alignment()
+        test_engine_phases()
+        test_build_chrome_trace()
+        test_fake_engine_timeline()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
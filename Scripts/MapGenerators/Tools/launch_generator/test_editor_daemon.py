@@ -0,0 +1,190 @@
+"""
+Unit tests for editor_daemon.py
+"""
+
+import sys
+import os
+import time
+import types
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import editor_daemon
+from config import SCRIPT_ROOT
+from editor_daemon import EditorDaemon, SETUP_COMMAND, QUIT_COMMAND
+from output_monitor import OutputMonitor
+from fatal_detector import FatalDetector
+from remote_execution import MODE_EXEC_FILE
+from trace_parser import TraceInfo
+from test_remote_execution import FakeEditorNode
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+MULTICAST_GROUP = ('239.0.0.1', 6797)
+COMMAND_ENDPOINT = ('127.0.0.1', 6796)
+
+# Module globals the daemon reads, replaced for the duration of a test
+PATCHED = ['build_ue5_command', 'DAEMON_MULTICAST_GROUP', 'DAEMON_COMMAND_ENDPOINT', 'DAEMON_UE5_LOG_FILE', 'SETUP_COMMAND']
+
+
+def _run_with_fake_editor(log_dir, test, setup_command=SETUP_COMMAND):
+    """
+    Run test(daemon, editor, quit_calls) against fake_engine.py (idle editor process) and a FakeEditorNode
+    that executes the daemon's commands in this process
+    """
+    saved = {name: getattr(editor_daemon, name) for name in PATCHED}
+    saved_unreal = sys.modules.get('unreal')
+    editor = FakeEditorNode([], execute=True, multicast_group=MULTICAST_GROUP)
+    daemon = EditorDaemon()
+    
+    # quit_editor() ends the fake engine like the real editor closes itself
+    quit_calls = []
+    def quit_editor():
+        quit_calls.append(True)
+        daemon.process.terminate()
+    sys.modules['unreal'] = types.SimpleNamespace(SystemLibrary=types.SimpleNamespace(quit_editor=quit_editor))
+    
+    editor_daemon.build_ue5_command = lambda script_path, extra_args=(): [
+        sys.executable, str(FAKE_ENGINE), str(log_dir / "shijiewuxian.uproject"), *extra_args]
+    editor_daemon.DAEMON_MULTICAST_GROUP = MULTICAST_GROUP
+    editor_daemon.DAEMON_COMMAND_ENDPOINT = COMMAND_ENDPOINT
+    editor_daemon.DAEMON_UE5_LOG_FILE = log_dir / "editor_daemon.log"
+    editor_daemon.SETUP_COMMAND = setup_command
+    editor.start()
+    try:
+        test(daemon, editor, quit_calls)
+    finally:
+        daemon.stop()
+        editor.stopped.set()
+        editor.join(timeout=2)
+        for name, value in saved.items():
+            setattr(editor_daemon, name, value)
+        if saved_unreal is None:
+            sys.modules.pop('unreal', None)
+        else:
+            sys.modules['unreal'] = saved_unreal
+        while SCRIPT_ROOT in sys.path:
+            sys.path.remove(SCRIPT_ROOT)
+
+
+def test_commands_compile_as_sent():
+    """
+    Test that setup and quit are multi-line code sent as ExecuteFile (one statement only in ExecuteStatement)
+    """
+    print("Testing daemon command modes...")
+    
+    for command in (SETUP_COMMAND, QUIT_COMMAND):
+        compile(command, '<remote>', 'exec')
+        try:
+            compile(command, '<remote>', 'single')
+        except SyntaxError:
+            pass
+        else:
+            assert False, f"Expected a multi-statement command: {command!r}"
+    
+    print("✓ Daemon command modes passed")
+
+
+def test_start_and_stop():
+    """
+    Test start(): setup runs in the editor (SCRIPT_ROOT on sys.path); stop(): the editor quits itself
+    """
+    print("Testing daemon start and stop...")
+    
+    def check(daemon, editor, quit_calls):
+        assert daemon.start(), "Daemon should connect to the fake editor"
+        assert SCRIPT_ROOT in sys.path, "Setup command did not run"
+        assert editor.commands[0]['exec_mode'] == MODE_EXEC_FILE
+        
+        process = daemon.process
+        started = time.time()
+        daemon.stop()
+        assert quit_calls, "quit_editor() was not called"
+        assert time.time() - started < 10, "stop() waited for the process instead of quitting it"
+        assert process.poll() is not None and daemon.process is None
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_with_fake_editor(Path(tmp), check)
+    
+    print("✓ Daemon start and stop passed")
+
+
+def test_failed_setup():
+    """
+    Test that a setup command the editor rejects fails start() and shuts the editor down
+    """
+    print("Testing daemon failed setup...")
+    
+    def check(daemon, editor, quit_calls):
+        process_holder = []
+        original_stop = daemon.stop
+        def stop():
+            process_holder.append(daemon.process)
+            original_stop()
+        daemon.stop = stop
+        
+        assert not daemon.start(), "start() must fail when the setup command fails"
+        assert daemon.process is None and daemon.client is None
+        assert process_holder and process_holder[0].poll() is not None, "Editor process was not stopped"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_with_fake_editor(Path(tmp), check, setup_command="raise RuntimeError('boom')")
+    
+    print("✓ Daemon failed setup passed")
+
+
+def test_collect_output_fatal():
+    """
+    Test that captured output goes through the fatal detector and is kept in full
+    """
+    print("Testing daemon output fatal detection...")
+    
+    monitor = OutputMonitor()
+    trace_info = TraceInfo()
+    output = [
+        {'type': 'Info', 'output': "[CHECKPOINT:13:5.000] SCRIPT_START"},
+        {'type': 'Error', 'output': "Fatal error: [File:D:\\UE\\Foo.cpp] [Line: 12]\nafter the fatal line"},
+    ]
+    EditorDaemon()._collect_output(output, monitor, trace_info, FatalDetector(include_per_map=False))
+    
+    assert trace_info.fatal_match is not None and trace_info.fatal_match['name'] == 'engine_fatal'
+    assert len(monitor.lines) == 3, "Lines after the fatal one are still collected"
+    assert monitor.lines[1].startswith("LogPython: Error: Fatal error:")
+    monitor.lines.close()
+    
+    print("✓ Daemon output fatal detection passed")
+
+
+def run_all_tests():
+    """Run all editor_daemon tests"""
+    print("\n" + "="*60)
+    print("Running editor_daemon Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_commands_compile_as_sent()
+        test_start_and_stop()
+        test_failed_setup()
+        test_collect_output_fatal()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
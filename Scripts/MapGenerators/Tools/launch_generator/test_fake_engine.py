@@ -0,0 +1,163 @@
+"""
+Unit tests for fake_engine.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trace_parser import TraceInfo, parse_line
+from log_writer import full_log_path, open_full_log
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+SCRIPT = "D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/cosmos_002_training_world/generate.py"
+
+
+def _run_fake_engine(project_dir, scenario, exec_cmds):
+    """Run the fake engine to completion in project_dir, return its log lines"""
+    env = dict(os.environ, FAKE_ENGINE_SCENARIO=scenario, FAKE_ENGINE_SPEED='50',
+               FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30', FAKE_ENGINE_EXIT='quit')
+    subprocess.run(
+        [sys.executable, str(FAKE_ENGINE), r"D:\001xm\shijiewuxian\shijiewuxian.uproject", f"-ExecCmds=py {exec_cmds}",
+         '-stdout', '-unattended'],
+        cwd=project_dir, env=env, stdout=subprocess.DEVNULL, timeout=60
+    )
+    return (project_dir / "Saved" / "Logs" / "shijiewuxian.log").read_text(encoding='utf-8').splitlines(keepends=True)
+
+
+def test_success_run():
+    """
+    Test the success scenario: markers, .umap and a verified manifest
+    """
+    print("Testing fake engine success run...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        lines = _run_fake_engine(project_dir, "success", SCRIPT)
+        trace_info = TraceInfo()
+        for line in lines:
+            parse_line(line, trace_info)
+        
+        names = [c['name'] for c in trace_info.checkpoints]
+        assert names[0] == "SCRIPT_START" and names[-1] == "SCRIPT_SUCCESS", f"Unexpected checkpoints: {names}"
+        assert trace_info.compilation_detected, "Shader burst should be detected"
+        
+        manifest = json.loads((project_dir / "Saved" / "MapGenerators" / "cosmos_002_training_world.result.json").read_text(encoding='utf-8'))
+        map_file = project_dir / "Content" / "Maps" / "Cosmos_002_Training_World.umap"
+        assert manifest['status'] == "success"
+        assert manifest['size'] == map_file.stat().st_size
+        assert 'SAVE_MAP' in manifest['steps']
+    
+    print("✓ Fake engine success run passed")
+
+
+def test_python_error_in_batch():
+    """
+    Test the python_error scenario with a batch script: per-map error markers and manifests
+    """
+    print("Testing fake engine batch python error...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        lines = _run_fake_engine(project_dir, "python_error", "D:/x/Maps/batch_generate.py map_a map_b")
+        trace_info = TraceInfo()
+        for line in lines:
+            parse_line(line, trace_info)
+        
+        assert trace_info.batch_maps['map_a']['status'] == 'error'
+        assert trace_info.batch_maps['map_b']['status'] == 'error'
+        assert any('Traceback' in line for line in lines)
+        manifest = json.loads((project_dir / "Saved" / "MapGenerators" / "map_b.result.json").read_text(encoding='utf-8'))
+        assert manifest['status'] == "error" and "SAVE_MAP" in manifest['error']
+        assert not (project_dir / "Content" / "Maps" / "Map_B.umap").exists()
+    
+    print("✓ Fake engine batch python error passed")
+
+
+def test_launcher_with_engine_override():
+    """
+    Test run_generation_attempt against the fake engine selected by LAUNCH_GENERATOR_ENGINE
+    """
+    print("Testing launcher with engine override...")
+    
+    code = (
+        "import sys; from pathlib import Path; import process_runner; "
+        "print('RESULT', process_runner.run_generation_attempt(1, Path('last_run.log'), Path('full.txt'), 0, None)[0])"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LAUNCH_GENERATOR_ENGINE=str(FAKE_ENGINE), PYTHONPATH=str(FAKE_ENGINE.parent),
+                   FAKE_ENGINE_SPEED='50', FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30')
+        output = subprocess.run([sys.executable, '-c', code], cwd=tmp, env=env, capture_output=True,
+                                text=True, encoding='utf-8', timeout=60).stdout
+        timeline = list(Path(tmp).glob("Saved/MapGenerators/*.timeline.json"))
+    
+    assert "RESULT 0" in output, f"Launcher did not succeed:\n{output[-500:]}"
+    assert len(timeline) == 1 and "时间线已导出" in output, "Attempt timeline exported"
+    
+    print("✓ Launcher with engine override passed")
+
+
+def test_python_error_attempt():
+    """
+    Test that a Python error run keeps the traceback (logged after SCRIPT_ERROR) in the saved full log
+    """
+    print("Testing launcher with a Python error...")
+    
+    code = (
+        "import sys; from pathlib import Path; import process_runner; "
+        "print('RESULT', process_runner.run_generation_attempt(1, Path('last_run.log'), Path('full.txt'), 0, None)[0])"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LAUNCH_GENERATOR_ENGINE=str(FAKE_ENGINE), PYTHONPATH=str(FAKE_ENGINE.parent),
+                   FAKE_ENGINE_SCENARIO='python_error', FAKE_ENGINE_SPEED='50', FAKE_ENGINE_NOISE='20',
+                   FAKE_ENGINE_SHADERS='30')
+        output = subprocess.run([sys.executable, '-c', code], cwd=tmp, env=env, capture_output=True,
+                                text=True, encoding='utf-8', timeout=60).stdout
+        with open_full_log(full_log_path(Path(tmp) / "full.txt")) as f:
+            full_log = f.read()
+    
+    assert "RESULT 1" in output, f"Python error should fail the attempt:\n{output[-500:]}"
+    assert "SCRIPT_ERROR" in full_log
+    assert "Error: Traceback (most recent call last):" in full_log, "Traceback missing from the full log"
+    assert "RuntimeError: SAVE_MAP failed" in full_log, "Exception line missing from the full log"
+    
+    print("✓ Launcher with a Python error passed")
+
+
+def run_all_tests():
+    """Run all fake_engine tests"""
+    print("\n" + "="*60)
+    print("Running fake_engine Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_success_run()
+        test_python_error_in_batch()
+        test_launcher_with_engine_override()
+        test_python_error_attempt()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,101 @@
+"""
+Unit tests for fatal_detector.py
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fatal_detector import FatalDetector, classify_fatal
+from trace_parser import TraceInfo
+
+
+def test_default_signatures():
+    """
+    Test that the configured signatures match real UE5 log lines and ignore normal output
+    """
+    print("Testing default fatal signatures...")
+    
+    detector = FatalDetector()
+    fatal_lines = {
+        "LogPython:   ERROR: Failed to load required assets": 'required_assets',
+        "LogPython: Error: Traceback (most recent call last):": 'python_traceback',
+        "Fatal error: [File:D:\\UnrealEngine570\\Engine\\Source\\Developer\\DerivedDataCache\\Private\\DerivedDataBackends.cpp] [Line: 208]": 'engine_fatal',
+    }
+    for line, expected in fatal_lines.items():
+        match = detector.check(line, TraceInfo())
+        assert match is not None, f"Should be fatal: {line}"
+        assert match['name'] == expected, f"Expected {expected}, got {match['name']}"
+    
+    normal_lines = [
+        "LogPython: [CHECKPOINT:48:5000] SCRIPT_SUCCESS",
+        # Logged before the traceback and the error manifest - those must still reach the log
+        "[2025.12.18-11.05.00:728][  0]LogPython: [CHECKPOINT:62:5120] SCRIPT_ERROR",
+        "LogPython:     ✗ Failed to load asset: SM_Cube",
+        "LogPython:   WARNING: Failed to load DirectionalLight class",
+        "LogShaderCompilers: Display: Compiling shader",
+    ]
+    for line in normal_lines:
+        assert detector.check(line, TraceInfo()) is None, f"Should not be fatal: {line}"
+    
+    print("✓ Default fatal signatures passed")
+
+
+def test_first_match_and_classification():
+    """
+    Test that the first fatal line is kept and classified, and per-map rules can be excluded
+    """
+    print("Testing first match and classification...")
+    
+    trace_info = TraceInfo()
+    detector = FatalDetector()
+    detector.check("LogPython:   ERROR: Failed to load required assets", trace_info)
+    detector.check("LogPython: Error: Traceback (most recent call last):", trace_info)
+    assert trace_info.fatal_match['name'] == 'required_assets', "First fatal line should be kept"
+    
+    result, reason = classify_fatal(trace_info.fatal_match)
+    assert result == 1, "Non-retryable rule should be a failure"
+    assert "必需资源加载失败" in reason
+    
+    retry_rule = [{'name': 'ddc', 'pattern': r'DDC unavailable', 'reason': "DDC不可用", 'retry': True}]
+    trace_info = TraceInfo()
+    FatalDetector(retry_rule).check("LogDerivedDataCache: DDC unavailable", trace_info)
+    assert classify_fatal(trace_info.fatal_match)[0] == 2, "Retryable rule should request a retry"
+    
+    batch_detector = FatalDetector(include_per_map=False)
+    assert batch_detector.check("LogPython: Error: Traceback (most recent call last):", TraceInfo()) is None
+    assert batch_detector.check("Fatal error: crash", TraceInfo()) is not None
+    
+    print("✓ First match and classification passed")
+
+
+def run_all_tests():
+    """Run all fatal_detector tests"""
+    print("\n" + "="*60)
+    print("Running fatal_detector Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_default_signatures()
+        test_first_match_and_classification()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,103 @@
+"""
+Unit tests for line_classifier.py
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from line_classifier import (
+    LineClassifier, classify, classify_naive, KEYWORD_BITS, LOG_PYTHON, TRACE_MARKER,
+    SUCCESS_WORD, SUCCESS_BANNER, COMPILING_NOCASE, SHADER_NOCASE, DONE_NOCASE
+)
+
+
+RECORDED_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'ue5_full_log.txt')
+
+
+def test_matches_naive_on_recorded_log():
+    """
+    Test the combined classifier against the per-pattern reference on a real UE5 log
+    """
+    print("Testing classifier on recorded log...")
+    
+    with open(RECORDED_LOG, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.readlines()
+    mismatches = [line for line in lines if classify(line) != classify_naive(line)]
+    assert not mismatches, f"{len(mismatches)} lines differ, first: {mismatches[0]!r}"
+    
+    print("✓ Recorded log classification passed")
+
+
+def test_overlapping_patterns():
+    """
+    Test patterns hidden inside or overlapping a longer match
+    """
+    print("Testing overlapping patterns...")
+    
+    # 'SUCCESS!' wins the alternation, 'SUCCESS' is contained in it
+    signals = classify("LogPython: SUCCESS!\n")
+    assert signals & SUCCESS_WORD and signals & SUCCESS_BANNER and signals & LOG_PYTHON
+    
+    # 'LogAudio' is matched, 'Audio' must still count
+    signals = classify("LogAudio: Display: Device initialized\n")
+    assert signals & KEYWORD_BITS['音频'] and signals & KEYWORD_BITS['设备']
+    
+    # 'Pak' starts inside 'LogPak' - both overlap-prone prefixes
+    assert classify("LogPakFile: mounted\n") & KEYWORD_BITS['挂载']
+    
+    # Pattern that starts inside a match and runs past its end
+    classifier = LineClassifier({1: (['abcd'], False), 2: (['cdef'], False)})
+    assert classifier.classify("xxabcdefxx") == 3
+    assert classifier.classify("xxabcdxx") == 1
+    
+    print("✓ Overlapping patterns passed")
+
+
+def test_case_insensitive_patterns():
+    """
+    Test the case-insensitive compile signals used by OutputMonitor
+    """
+    print("Testing case-insensitive patterns...")
+    
+    signals = classify("LogShaderCompilers: COMPILING 12 SHADERS\n")
+    assert signals & COMPILING_NOCASE and signals & SHADER_NOCASE
+    assert classify("Shaders Compiled\n") & DONE_NOCASE
+    assert not classify("nothing here\n") & (COMPILING_NOCASE | SHADER_NOCASE | DONE_NOCASE)
+    assert not classify("LogPython: x\n".lower()) & LOG_PYTHON, "LOG_PYTHON is case-sensitive"
+    assert classify("LogPython: [TRACE:m:1:2:info] x\n") & TRACE_MARKER
+    
+    print("✓ Case-insensitive patterns passed")
+
+
+def run_all_tests():
+    """Run all line_classifier tests"""
+    print("\n" + "="*60)
+    print("Running line_classifier Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_matches_naive_on_recorded_log()
+        test_overlapping_patterns()
+        test_case_insensitive_patterns()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
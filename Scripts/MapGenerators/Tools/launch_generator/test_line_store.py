@@ -0,0 +1,130 @@
+"""
+Unit tests for line_store.py
+"""
+
+import sys
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from line_store import LineStore
+from log_saver import save_logs
+from output_monitor import OutputMonitor
+
+
+def test_list_compatibility():
+    """
+    Test that indexing, slicing and iteration match a plain list across the spill boundary
+    """
+    print("Testing list compatibility...")
+    
+    expected = [f"[2025.12.18-11.05.00:{i:03d}][  0]LogPython: 第{i}行 ✓\n" for i in range(250)]
+    lines = LineStore(window=40)
+    for line in expected:
+        lines.append(line)
+    
+    assert len(lines) == 250
+    assert lines.spilled == 210, f"Expected 210 spilled lines, got {lines.spilled}"
+    assert lines[0] == expected[0] and lines[-1] == expected[-1] and lines[-2] == expected[-2]
+    assert lines[205:215] == expected[205:215], "Slice across disk/memory boundary"
+    assert lines[100:] == expected[100:]
+    assert lines[::-7] == expected[::-7]
+    assert list(lines) == expected
+    
+    try:
+        lines[250]
+        assert False, "Out of range index should raise IndexError"
+    except IndexError:
+        pass
+    
+    lines.close()
+    print("✓ List compatibility passed")
+
+
+def test_memory_stays_flat():
+    """
+    Test that resident memory does not grow with the number of lines
+    """
+    print("Testing bounded memory...")
+    
+    lines = LineStore(window=1000)
+    tracemalloc.start()
+    for i in range(50000):
+        lines.append(f"[2025.12.18-11.05.00:000][ 12]LogShaderCompilers: Display: Worker (1/8): shaders left to compile {i}\n")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    # ~5 MB as a plain list; the store keeps 1000 lines + an 8-byte offset per spilled line
+    assert peak < 2 * 1024 * 1024, f"Peak memory too high: {peak / 1024 / 1024:.1f} MB"
+    assert lines[25000].endswith("compile 25000\n")
+    
+    lines.close()
+    print(f"✓ Bounded memory passed (peak {peak / 1024:.0f} KB)")
+
+
+def test_without_spill():
+    """
+    Test dropping old lines when the full log has them (no spill file, length still counts them)
+    """
+    print("Testing window without spill file...")
+    
+    expected = [f"line {i}\n" for i in range(100)]
+    lines = LineStore(window=10, spill=False)
+    for line in expected:
+        lines.append(line)
+    
+    assert len(lines) == 100 and lines.dropped == 90 and lines.spilled == 0
+    assert lines._spill is None, "Nothing written to disk"
+    assert lines[-1] == expected[-1] and lines[90] == expected[90]
+    assert lines[85:95] == expected[90:95], "Slices start at the oldest line still held"
+    try:
+        lines[89]
+        assert False, "Dropped line should raise IndexError"
+    except IndexError:
+        pass
+    
+    # The monitor only spills without a full log and closes the store with the logs
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = OutputMonitor(full_log_file=Path(tmp) / "full.txt")
+        assert not monitor.lines.spill
+        monitor.lines._spill_line("opened\n")
+        save_logs(monitor)
+        assert monitor.lines._spill is None, "Spill file closed when monitoring ends"
+    assert OutputMonitor().lines.spill
+    
+    print("✓ Window without spill file passed")
+
+
+def run_all_tests():
+    """Run all line_store tests"""
+    print("\n" + "="*60)
+    print("Running line_store Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_list_compatibility()
+        test_memory_stays_flat()
+        test_without_spill()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,165 @@
+"""
+Unit tests for log_index.py
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import log_index
+import log_writer
+from log_index import LogIndex, index_path
+from log_writer import FullLogWriter, FULL_LOG_HEADER, FULL_LOG_TRAILER
+
+
+BODY = [
+    "[2025.12.18-11.05.00:001][  0]LogInit: Display: Engine starting\n",
+    "[2025.12.18-11.05.00:002][  0]LogPython: [CHECKPOINT:0:12] LEVEL_READY\n",
+    "[2025.12.18-11.05.00:003][  0]LogPython: [TRACE:generator:10:15:OK] spawn\n",
+    "[2025.12.18-11.05.00:004][  1]LogShaderCompilers: Display: Compiling 12 shaders\n",
+    "\tcontinuation of the shader message\n",
+    "[2025.12.18-11.05.00:005][  2]LogTexture: Error: Missing texture T_Ground 资源\n",
+    "[2025.12.18-11.05.00:006][  2]LogPython: ERROR: place_actors failed\n",
+    "Traceback line without prefix\n",
+    "[2025.12.18-11.05.00:007][  3]LogPython: [CHECKPOINT:0:30] MAP_SAVED\n",
+    "[2025.12.18-11.05.00:008][  3]LogExit: Exiting.\n",
+]
+
+
+def _write_plain(directory):
+    path = Path(directory) / "ue5_full_log.txt"
+    path.write_text(FULL_LOG_HEADER + ''.join(BODY) + FULL_LOG_TRAILER, encoding='utf-8')
+    return path
+
+
+def _write_streamed(directory, compression):
+    writer = FullLogWriter(Path(directory) / "ue5_full_log.txt", compression=compression, flush_bytes=200)
+    for line in BODY:
+        writer.write(line, flush='[CHECKPOINT:' in line)
+    writer.close()
+    return writer.path
+
+
+def _check_index(index):
+    header = len(FULL_LOG_HEADER.splitlines(True))
+    text = (FULL_LOG_HEADER + ''.join(BODY) + FULL_LOG_TRAILER).splitlines(True)
+    
+    assert len(index) == len(text)
+    assert index.lines(0, len(index)) == text
+    assert index.lines(header + 3, header + 6) == BODY[3:6]
+    assert index.line(len(index) - 1) == FULL_LOG_TRAILER
+    assert index.lines(len(index) - 2, len(index) + 10) == text[-2:]
+    
+    assert [name for _, name in index.checkpoints] == ['LEVEL_READY', 'MAP_SAVED']
+    assert index.between('LEVEL_READY', 'MAP_SAVED') == (header + 1, header + 9)
+    assert index.between('SAVED', 'READY') == (header + 1, header + 9), "Substring match, any order"
+    assert list(index.traces) == [header + 2]
+    
+    # Verbosity Error + LogPython ERROR (its continuation line is not another error)
+    assert list(index.errors) == [header + 5, header + 6]
+    assert index.around_error(1, context=2) == (header + 5, header + 3, header + 8)
+    assert index.around_error(-1, context=100)[0] == header + 6
+    assert index.around_error(3) is None
+    
+    assert index.category_lines('LogPython') == [header + 1, header + 2, header + 6, header + 7, header + 8]
+    assert index.category_lines('LogShaderCompilers') == [header + 3, header + 4], "Continuation line included"
+    assert index.category_lines('LogMissing') == []
+
+
+def test_plain_log():
+    """
+    Test a plain text log (memory-mapped), sidecar reuse and invalidation
+    """
+    print("Testing plain log index...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_plain(tmp)
+        with LogIndex.open(path) as index:
+            _check_index(index)
+        assert index_path(path).exists()
+        
+        loaded = LogIndex.load(path)
+        assert loaded is not None, "Fresh sidecar is reused"
+        with loaded:
+            _check_index(loaded)
+        
+        path.write_text(FULL_LOG_HEADER + "[2025.12.18-11.05.00:001][  0]LogInit: changed\n", encoding='utf-8')
+        assert LogIndex.load(path) is None, "Sidecar of a different log is ignored"
+        with LogIndex.open(path) as index:
+            assert len(index) == len(FULL_LOG_HEADER.splitlines()) + 1
+    
+    print("✓ Plain log index passed")
+
+
+def test_streamed_log():
+    """
+    Test logs written by FullLogWriter, with and without their member index
+    """
+    print("Testing streamed log index...")
+    
+    compressions = ['gzip'] + (['zstd'] if log_writer.zstandard is not None else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in compressions:
+            path = _write_streamed(tmp, compression)
+            with LogIndex.open(path) as index:
+                assert len(index.offsets) == 0, "Compressed logs are read through their members"
+                _check_index(index)
+            
+            os.remove(str(path) + log_writer.INDEX_SUFFIX)
+            with LogIndex.open(path) as index:
+                _check_index(index)
+    
+    print("✓ Streamed log index passed")
+
+
+def test_without_numpy():
+    """
+    Test the pure Python category query
+    """
+    print("Testing log index without NumPy...")
+    
+    saved = log_index.np
+    log_index.np = None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            with LogIndex.build(_write_plain(tmp)) as index:
+                _check_index(index)
+    finally:
+        log_index.np = saved
+    
+    print("✓ Log index without NumPy passed")
+
+
+def run_all_tests():
+    """Run all log_index tests"""
+    print("\n" + "="*60)
+    print("Running log_index Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_plain_log()
+        test_streamed_log()
+        test_without_numpy()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+"""
+Unit tests for log_record.py
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from log_record import LogRecordParser, RecordDispatcher, parse_record
+from output_monitor import OutputMonitor
+from trace_parser import TraceInfo, parse_line
+
+
+def test_parse_fields():
+    """
+    Test timestamp, frame, category, verbosity and message extraction
+    """
+    print("Testing record fields...")
+    
+    record = parse_record("[2025.12.18-11.05.00:728][ 12]LogPython: Warning: Map exists, loading\r\n")
+    assert record.timestamp == '2025.12.18-11.05.00:728'
+    assert record.frame == 12
+    assert record.category == 'LogPython'
+    assert record.verbosity == 'Warning'
+    assert record.message == 'Map exists, loading'
+    assert not record.continuation
+    
+    # No timestamp (engine start-up), no verbosity -> 'Log'
+    record = parse_record("LogInit: Build: ++UE5+Release-5.7\n")
+    assert record.timestamp is None and record.frame is None
+    assert record.category == 'LogInit' and record.verbosity == 'Log'
+    assert record.message == 'Build: ++UE5+Release-5.7'
+    
+    # Categories are interned - handlers can compare by identity
+    other = parse_record("[2025.12.18-11.05.01:000][ 13]" + "Log" + "Init: x\n")
+    assert other.category is record.category
+    
+    print("✓ Record fields passed")
+
+
+def test_continuation_lines():
+    """
+    Test lines without a prefix inheriting the previous record
+    """
+    print("Testing continuation lines...")
+    
+    records = LogRecordParser()
+    first = records.parse("[2025.12.18-11.05.00:728][ 12]LogPython: Error: Traceback (most recent call last):\n")
+    continued = records.parse("\t\tFile \"generator.py\", line 87\n")
+    assert continued.continuation
+    assert continued.category == 'LogPython' and continued.verbosity == 'Error'
+    assert continued.timestamp == first.timestamp and continued.frame == 12
+    assert continued.message == "\t\tFile \"generator.py\", line 87"
+    
+    # Nothing before it - no category
+    assert parse_record("\ufeffLog file open, 12/18/25 19:04:17\n").category is None
+    
+    print("✓ Continuation lines passed")
+
+
+def test_dispatch_by_category():
+    """
+    Test handlers only receiving records of their categories
+    """
+    print("Testing category dispatch...")
+    
+    seen = []
+    handlers = RecordDispatcher()
+    handlers.register('LogPython', lambda record, tag: seen.append((tag, record.message)))
+    handlers.register(['LogShaders', 'LogShaderCompilers'], lambda record, tag: seen.append((tag, record.category)))
+    
+    for line in ["LogPython: one\n", "LogConfig: Set CVar [[r.Shaders.Optimize:1]]\n",
+                 "LogShaderCompilers: Display: Compiling shader\n", "no prefix\n"]:
+        handlers.dispatch(parse_record(line), 'x')
+    assert seen == [('x', 'one'), ('x', 'LogShaderCompilers')], seen
+    
+    print("✓ Category dispatch passed")
+
+
+def test_consumers_see_their_categories():
+    """
+    Test trace parsing and the compile detector ignoring other categories
+    """
+    print("Testing consumer categories...")
+    
+    trace_info = TraceInfo()
+    parse_line("LogConfig: Set CVar [[r.Shaders.Optimize:1]]\n", trace_info)
+    parse_line("LogConfig: [CHECKPOINT:10:20] NOT_A_CHECKPOINT\n", trace_info)
+    assert not trace_info.compilation_detected, "Shader CVar is not compile activity"
+    assert not trace_info.checkpoints, "Markers only count in LogPython records"
+    
+    parse_line("LogShaderCompilers: Display: Compiling shader autogen file\n", trace_info)
+    parse_line("LogPython: [CHECKPOINT:10:20] LEVEL_READY\n", trace_info)
+    assert trace_info.compilation_detected
+    assert trace_info.last_checkpoint == 'LEVEL_READY'
+    
+    monitor = OutputMonitor()
+    monitor.add_line("LogConfig: Compiling shader settings\n")
+    assert not monitor.is_compiling
+    monitor.add_line("LogShaderCompilers: Display: Compiling 120 shaders\n")
+    assert monitor.is_compiling and monitor.get_silence_duration() == 0
+    monitor.add_line("LogPython: STARTING MAP GENERATOR\n")
+    assert not monitor.is_compiling
+    
+    print("✓ Consumer categories passed")
+
+
+def run_all_tests():
+    """Run all log_record tests"""
+    print("\n" + "="*60)
+    print("Running log_record Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_parse_fields()
+        test_continuation_lines()
+        test_dispatch_by_category()
+        test_consumers_see_their_categories()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+"""
+Unit tests for log_tailer.py
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from log_tailer import LogTailer
+
+
+def test_split_multibyte_and_partial_line():
+    """
+    Test that a UTF-8 character split across reads is decoded intact
+    and an unterminated line is held back until completed
+    """
+    print("Testing split multibyte character and partial line...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shijiewuxian.log")
+        data = "LogPython: [TRACE:main:24:123:success] 创建生成器实例\r\n".encode('utf-8')
+        split_at = data.index("创".encode('utf-8')) + 1  # Middle of a 3-byte character
+        
+        with open(path, 'wb') as f:
+            f.write(data[:split_at])
+        
+        tailer = LogTailer(path)
+        assert tailer.read_lines() == [], "Partial line should not be emitted"
+        
+        with open(path, 'ab') as f:
+            f.write(data[split_at:])
+        lines = tailer.read_lines()
+        assert lines == ["LogPython: [TRACE:main:24:123:success] 创建生成器实例\n"], f"Unexpected lines: {lines}"
+        
+        with open(path, 'ab') as f:
+            f.write("LogExit: 退出".encode('utf-8'))
+        assert tailer.read_lines() == [], "Unterminated line should be buffered"
+        assert tailer.flush() == ["LogExit: 退出"], "flush() should return buffered partial line"
+        tailer.close()
+    
+    print("✓ Split multibyte and partial line passed")
+
+
+def test_truncation_and_rotation():
+    """
+    Test that truncation restarts from offset 0 and rotation switches files
+    """
+    print("Testing truncation and rotation detection...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shijiewuxian.log")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("line 1\nline 2\n")
+        
+        tailer = LogTailer(path, chunk_size=4)  # Tiny chunks exercise the read loop
+        assert tailer.read_lines() == ["line 1\n", "line 2\n"]
+        
+        # Truncate in place and write shorter content
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("new\n")
+        assert tailer.read_lines() == ["new\n"], "Truncated file should be re-read from start"
+        assert tailer.truncations == 1
+        
+        # Rotate: old file moved away, new file created at the same path
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("old tail\n")
+        os.replace(path, path + ".bak")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("rotated 1\n")
+        lines = tailer.read_lines()
+        assert lines == ["old tail\n", "rotated 1\n"], f"Unexpected lines after rotation: {lines}"
+        assert tailer.rotations == 1
+        tailer.close()
+    
+    print("✓ Truncation and rotation passed")
+
+
+def run_all_tests():
+    """Run all log_tailer tests"""
+    print("\n" + "="*60)
+    print("Running log_tailer Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_split_multibyte_and_partial_line()
+        test_truncation_and_rotation()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,93 @@
+"""
+Unit tests for log_watcher.py
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from log_watcher import LogWatcher
+
+
+def _check_watcher_reports_changes(force_polling):
+    with tempfile.TemporaryDirectory() as tmp:
+        watcher = LogWatcher(tmp, "shijiewuxian*.log")
+        if force_polling:
+            watcher.close()
+            watcher.backend = 'polling'
+            watcher._snapshot = watcher._scan()
+        
+        try:
+            # Nothing happened yet: wait times out with no changes
+            assert watcher.wait(0.05) == set(), "Expected no changes before any write"
+            
+            # New log file is reported
+            log_path = os.path.join(tmp, "shijiewuxian.log")
+            with open(log_path, 'w', encoding='utf-8') as f:
+                f.write("LogInit: Display: Running engine\n")
+            assert "shijiewuxian.log" in watcher.wait(1.0), "New log file not reported"
+            watcher.wait(0.05)  # Drain remaining events (close_write etc.)
+            
+            # Appended bytes are reported
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write("LogPython: [CHECKPOINT:13:44] SCRIPT_START\n")
+            assert "shijiewuxian.log" in watcher.wait(1.0), "Appended bytes not reported"
+            watcher.wait(0.05)
+            
+            # Files not matching the pattern are ignored
+            with open(os.path.join(tmp, "other.txt"), 'w') as f:
+                f.write("noise\n")
+            assert watcher.wait(0.1) == set(), "Non-matching file should be ignored"
+        finally:
+            watcher.close()
+
+
+def test_watcher_default_backend():
+    """
+    Test change notification with the platform default backend (inotify on Linux)
+    """
+    print("Testing default watcher backend...")
+    _check_watcher_reports_changes(force_polling=False)
+    print("✓ Default backend passed")
+
+
+def test_watcher_polling_fallback():
+    """
+    Test change notification with the portable polling backend
+    """
+    print("Testing polling fallback backend...")
+    _check_watcher_reports_changes(force_polling=True)
+    print("✓ Polling fallback passed")
+
+
+def run_all_tests():
+    """Run all log_watcher tests"""
+    print("\n" + "="*60)
+    print("Running log_watcher Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_watcher_default_backend()
+        test_watcher_polling_fallback()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+"""
+Unit tests for log_writer.py
+"""
+
+import sys
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import log_writer
+from log_writer import FullLogWriter, FULL_LOG_HEADER, load_index, open_full_log, read_lines
+
+
+LINES = [f"[2025.12.18-11.05.00:{i % 1000:03d}][  0]LogPython: line {i} 资源\n" for i in range(500)]
+
+
+def _wait_for(writer, lines, timeout=5):
+    deadline = time.time() + timeout
+    while writer.lines < lines and time.time() < deadline:
+        time.sleep(0.01)
+    return writer.lines
+
+
+def test_round_trip():
+    """
+    Test every compression: same text as the old plain full log, indexed random access
+    """
+    print("Testing full log round trip...")
+    
+    compressions = ['gzip', None] + (['zstd'] if log_writer.zstandard is not None else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in compressions:
+            writer = FullLogWriter(Path(tmp) / "ue5_full_log.txt", compression=compression, flush_bytes=4096)
+            for i, line in enumerate(LINES):
+                writer.write(line, flush=(i == 100))
+            writer.write("no line ending")
+            writer.close()
+            writer.close()  # Second close is a no-op
+            
+            assert writer.error is None
+            assert writer.lines == len(LINES) + 1
+            with open_full_log(writer.path) as f:
+                assert f.read() == FULL_LOG_HEADER + ''.join(LINES) + "no line ending\n" + "\n"
+            
+            index = load_index(writer.path)
+            assert len(index) > 2, f"Checkpoint and size flushes should create several members ({compression})"
+            assert any(first + count == 101 for first, count, _, _ in index), "Flush after line 100 ends a member"
+            assert index[0][0] == 0 and all(a[0] + a[1] == b[0] for a, b in zip(index, index[1:]))
+            assert read_lines(writer.path, 99, 4) == LINES[99:103], "Range across a member boundary"
+            assert read_lines(writer.path, 499, 5) == [LINES[499], "no line ending\n"]
+    
+    print("✓ Full log round trip passed")
+
+
+def test_readable_before_close():
+    """
+    Test flushed lines being on disk while the writer is still open (launcher crash)
+    """
+    print("Testing readable before close...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = FullLogWriter(Path(tmp) / "ue5_full_log.txt", compression='gzip', flush_seconds=0.05)
+        for line in LINES[:10]:
+            writer.write(line)
+        assert _wait_for(writer, 10) == 10, "Time-based flush should write the lines"
+        
+        with open_full_log(writer.path) as f:
+            assert f.read() == FULL_LOG_HEADER + ''.join(LINES[:10])
+        assert read_lines(writer.path, 5, 2) == LINES[5:7]
+        writer.close()
+    
+    print("✓ Readable before close passed")
+
+
+def run_all_tests():
+    """Run all log_writer tests"""
+    print("\n" + "="*60)
+    print("Running log_writer Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_round_trip()
+        test_readable_before_close()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
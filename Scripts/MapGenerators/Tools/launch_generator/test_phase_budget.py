@@ -0,0 +1,111 @@
+"""
+Unit tests for phase_budget.py
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import TIMEOUT_SECONDS, PHASE_BUDGET_MIN_SECONDS, PHASE_BUDGET_MARGIN
+from phase_budget import PhaseBudgets, get_phase_durations, percentile
+from timeout_monitor import get_phase_timeout
+from trace_parser import TraceInfo
+
+
+def _checkpoints(save_ms):
+    """Checkpoints of one run where saving the map takes save_ms"""
+    return [
+        {'name': 'BEFORE_BUILD_ROOM', 'line': 56, 'timestamp': 1000},
+        {'name': 'AFTER_BUILD_ROOM', 'line': 60, 'timestamp': 1500},
+        {'name': 'BEFORE_SAVE_MAP', 'line': 83, 'timestamp': 1600},
+        {'name': 'AFTER_SAVE_MAP', 'line': 87, 'timestamp': 1600 + save_ms},
+        {'name': 'SCRIPT_SUCCESS', 'line': 55, 'timestamp': 1700 + save_ms},
+    ]
+
+
+def test_percentile_and_durations():
+    """
+    Test percentile interpolation and checkpoint -> phase duration pairing
+    """
+    print("Testing percentile and phase durations...")
+    
+    assert percentile([5], 95) == 5
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert abs(percentile([10, 20], 95) - 19.5) < 1e-9
+    
+    durations = dict(get_phase_durations(_checkpoints(30000)))
+    assert durations['BEFORE_BUILD_ROOM'] == 0.5
+    assert durations['BEFORE_SAVE_MAP'] == 30.0
+    assert 'SCRIPT_SUCCESS' not in durations, "Open-ended last phase must not be learned"
+    
+    print("✓ Percentile and phase durations passed")
+
+
+def test_budgets_learned_and_stored():
+    """
+    Test fallback without history, learned budgets, and per-map storage
+    """
+    print("Testing learned phase budgets...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "phase_budgets.json"
+        budgets = PhaseBudgets.load("map_a", path)
+        assert budgets.budget_for('BEFORE_SAVE_MAP') == TIMEOUT_SECONDS, "No history should use the fixed timeout"
+        
+        for save_ms in (20000, 25000, 30000):
+            budgets.record_run(_checkpoints(save_ms))
+        budgets.save()
+        
+        # Another map saved in between must survive
+        other = PhaseBudgets.load("map_b", path)
+        other.record_run(_checkpoints(1000))
+        other.save()
+        budgets.save()
+        
+        reloaded = PhaseBudgets.load("map_a", path)
+        save_budget = reloaded.budget_for('BEFORE_SAVE_MAP')
+        assert save_budget > TIMEOUT_SECONDS, f"Slow save should get a longer budget, got {save_budget}"
+        assert abs(save_budget - 29.5 * PHASE_BUDGET_MARGIN) < 1e-6
+        assert reloaded.budget_for('BEFORE_BUILD_ROOM') == PHASE_BUDGET_MIN_SECONDS, "Fast phase should get the floor"
+        assert PhaseBudgets.load("map_b", path).history, "Other map's history was overwritten"
+        
+        trace_info = TraceInfo()
+        assert get_phase_timeout(TIMEOUT_SECONDS, trace_info, reloaded) == (TIMEOUT_SECONDS, None)
+        trace_info.last_checkpoint = 'BEFORE_SAVE_MAP'
+        assert get_phase_timeout(TIMEOUT_SECONDS, trace_info, reloaded) == (save_budget, 'BEFORE_SAVE_MAP')
+    
+    print("✓ Learned phase budgets passed")
+
+
+def run_all_tests():
+    """Run all phase_budget tests"""
+    print("\n" + "="*60)
+    print("Running phase_budget Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_percentile_and_durations()
+        test_budgets_learned_and_stored()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
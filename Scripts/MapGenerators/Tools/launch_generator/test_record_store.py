@@ -0,0 +1,123 @@
+"""
+Unit tests for record_store.py
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import record_store
+from log_record import LogRecordParser
+from record_store import RecordStore
+
+
+LINES = [
+    "LogInit: Display: Running engine for game: shijiewuxian\n",
+    "[2025.12.18-11.05.00:100][  0]LogPython: STARTING MAP GENERATOR\n",
+    "[2025.12.18-11.05.00:900][  1]LogConfig: Set CVar [[r.Shaders.Optimize:1]]\n",
+    "[2025.12.18-11.05.01:200][  2]LogPython: Error: 资源加载失败\n",
+    "\tcontinued message\n",
+    "[2025.12.18-11.05.00:950][  2]LogConfig: older line from another thread\n",
+    "[2025.12.18-11.05.12:000][  9]LogPython: Error: second error\n",
+    "[2025.12.18-11.05.13:500][ 10]LogAudio: Warning: device lost\n",
+]
+
+
+def _build_store():
+    records = LogRecordParser()
+    store = RecordStore()
+    for index, line in enumerate(LINES):
+        store.append(records.parse(line), keep_message=index in (3, 4))
+    return store
+
+
+def _queries(store):
+    return (
+        store.category_counts(),
+        store.category_counts(start=4),
+        store.first('LogPython'), store.last('LogPython'), store.first('LogMissing'),
+        store.indices('LogConfig'),
+        store.lines_per_second('LogPython'),
+        store.lines_per_second()[:3],
+        store.error_density(window=10),
+        store.peak_error_window(window=10),
+    )
+
+
+def test_columns_and_queries():
+    """
+    Test column contents and category / time queries
+    """
+    print("Testing columns and queries...")
+    
+    store = _build_store()
+    assert len(store) == len(LINES)
+    assert store.message(3) == "资源加载失败", "Kept messages are returned"
+    assert store.message(4) == "\tcontinued message"
+    assert store.message(1) is None and len(store.messages) == 2, "Other messages are not kept"
+    assert store.time_offset(0) is None and abs(store.time_offset(3) - 1.1) < 1e-3
+    
+    counts, tail_counts, first, last, missing, config, python_rate, all_rate, density, peak = _queries(store)
+    assert counts == {'LogPython': 4, 'LogConfig': 2, 'LogInit': 1, 'LogAudio': 1}, counts
+    assert tail_counts == {'LogPython': 2, 'LogConfig': 1, 'LogAudio': 1}, tail_counts
+    assert (first, last, missing) == (1, 6, None)
+    assert config == [2, 5]
+    assert python_rate[:2] == [(0, 1), (1, 2)] and python_rate[11] == (11, 1) and len(python_rate) == 12
+    assert all_rate == [(0, 3), (1, 2), (2, 0)], "Out-of-order line counts in the first second"
+    assert density == [(0, 2), (10, 1)], density
+    assert peak == (0, 2)
+    
+    print("✓ Columns and queries passed")
+
+
+def test_without_numpy():
+    """
+    Test the pure-Python fallback returning the same results as NumPy
+    """
+    print("Testing pure-Python fallback...")
+    
+    store = _build_store()
+    expected = _queries(store)
+    numpy = record_store.np
+    record_store.np = None
+    try:
+        assert _queries(store) == expected
+    finally:
+        record_store.np = numpy
+    
+    assert RecordStore().peak_error_window() is None, "Empty store has no error window"
+    assert RecordStore().lines_per_second() == []
+    
+    print("✓ Pure-Python fallback passed")
+
+
+def run_all_tests():
+    """Run all record_store tests"""
+    print("\n" + "="*60)
+    print("Running record_store Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_columns_and_queries()
+        test_without_numpy()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
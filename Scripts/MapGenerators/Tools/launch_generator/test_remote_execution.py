@@ -0,0 +1,201 @@
+"""
+Unit tests for remote_execution.py
+"""
+
+import sys
+import os
+import json
+import socket
+import threading
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from remote_execution import RemoteExecutionClient, MODE_EXEC_FILE, MODE_EXEC_STATEMENT, MODE_EVAL_STATEMENT
+
+
+MULTICAST_GROUP = ('239.0.0.1', 6799)
+COMMAND_ENDPOINT = ('127.0.0.1', 6798)
+
+
+def run_like_editor(command, mode, namespace):
+    """
+    Run a command the way PythonScriptPlugin does for its exec mode
+    
+    ExecuteFile runs a file or literal code, ExecuteStatement exactly one statement
+    (Py_single_input), EvaluateStatement one expression
+    
+    Returns:
+        tuple: (success, result string)
+    """
+    try:
+        if mode == MODE_EVAL_STATEMENT:
+            return True, repr(eval(compile(command, '<remote>', 'eval'), namespace))
+        exec(compile(command, '<remote>', 'single' if mode == MODE_EXEC_STATEMENT else 'exec'), namespace)
+        return True, 'None'
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+class FakeEditorNode(threading.Thread):
+    """
+    Minimal editor side of the protocol: pong, open_connection, command_result
+    
+    execute=False answers every command with a canned result, execute=True runs it in
+    this process with run_like_editor()
+    """
+    
+    def __init__(self, output, execute=False, multicast_group=MULTICAST_GROUP):
+        super().__init__(daemon=True)
+        self.output = output
+        self.execute = execute
+        self.multicast_group = multicast_group
+        self.namespace = {}
+        self.commands = []
+        self.stopped = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        bind_address = socket.inet_aton('127.0.0.1')
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, bind_address)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                             socket.inet_aton(multicast_group[0]) + bind_address)
+        self.sock.bind(('', multicast_group[1]))
+        self.sock.settimeout(0.2)
+    
+    def _reply(self, message, message_type, data):
+        return json.dumps({
+            'version': 1, 'magic': 'ue_py', 'type': message_type,
+            'source': 'fake-editor', 'dest': message['source'], 'data': data
+        }, ensure_ascii=False).encode('utf-8')
+    
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                data, _ = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            message = json.loads(data.decode('utf-8'))
+            if message['source'] == 'fake-editor':
+                continue
+            if message['type'] == 'ping':
+                self.sock.sendto(self._reply(message, 'pong', {'project_name': 'shijiewuxian'}), self.multicast_group)
+            elif message['type'] == 'open_connection':
+                conn = socket.create_connection((message['data']['command_ip'], message['data']['command_port']))
+                self._serve(conn, message)
+        self.sock.close()
+    
+    def _serve(self, conn, message):
+        """Answer commands until the client closes the connection (one command per recv)"""
+        conn.settimeout(0.2)
+        while not self.stopped.is_set():
+            try:
+                data = conn.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if not data:
+                break
+            command = json.loads(data.decode('utf-8'))['data']
+            self.commands.append(command)
+            success, result = True, '0'
+            if self.execute:
+                success, result = run_like_editor(command['command'], command['exec_mode'], self.namespace)
+            payload = self._reply(message, 'command_result', {'success': success, 'result': result, 'output': self.output})
+            # Send the result in two pieces, split inside a multibyte character
+            split_at = payload.find("完".encode('utf-8')) + 1
+            try:
+                conn.sendall(payload[:split_at])
+                conn.sendall(payload[split_at:])
+            except OSError:
+                break
+        conn.close()
+
+
+def test_discover_connect_and_run_command():
+    """
+    Test ping/pong discovery, reverse TCP connection and a fragmented command_result
+    """
+    print("Testing discovery and command round trip...")
+    
+    output = [{'type': 'Info', 'output': '[CHECKPOINT:10:5] BATCH_MAP_END:map_a:success 完成'}]
+    editor = FakeEditorNode(output)
+    editor.start()
+    try:
+        with RemoteExecutionClient(MULTICAST_GROUP, COMMAND_ENDPOINT) as client:
+            node = client.discover(timeout=5)
+            assert node is not None, "Fake editor was not discovered"
+            assert node['node_id'] == 'fake-editor'
+            assert node['project_name'] == 'shijiewuxian'
+            
+            client.connect(node['node_id'], timeout=5)
+            result = client.run_command("__import__('map_job').run_job('map_a')", MODE_EVAL_STATEMENT, timeout=5)
+            assert result['success'] is True
+            assert result['output'] == output, f"Unexpected output: {result['output']}"
+            assert editor.commands[0]['exec_mode'] == MODE_EVAL_STATEMENT
+    finally:
+        editor.stopped.set()
+        editor.join(timeout=2)
+    
+    print("✓ Discovery and command round trip passed")
+
+
+def test_exec_modes():
+    """
+    Test several commands on one connection: multi-line code needs ExecuteFile
+    """
+    print("Testing exec modes...")
+    
+    editor = FakeEditorNode([], execute=True)
+    editor.start()
+    try:
+        with RemoteExecutionClient(MULTICAST_GROUP, COMMAND_ENDPOINT) as client:
+            client.connect(client.discover(timeout=5)['node_id'], timeout=5)
+            code = "x = 1\nif x:\n    y = x + 1"
+            
+            result = client.run_command(code, MODE_EXEC_STATEMENT, timeout=5)
+            assert result['success'] is False and "multiple statements" in result['result'], result
+            result = client.run_command(code, MODE_EXEC_FILE, timeout=5)
+            assert result['success'] is True, result
+            result = client.run_command("y * 10", MODE_EVAL_STATEMENT, timeout=5)
+            assert result['success'] is True and result['result'] == '20', result
+            assert [command['exec_mode'] for command in editor.commands] == [
+                MODE_EXEC_STATEMENT, MODE_EXEC_FILE, MODE_EVAL_STATEMENT]
+    finally:
+        editor.stopped.set()
+        editor.join(timeout=2)
+    
+    print("✓ Exec modes passed")
+
+
+def run_all_tests():
+    """Run all remote_execution tests"""
+    print("\n" + "="*60)
+    print("Running remote_execution Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_discover_connect_and_run_command()
+        test_exec_modes()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
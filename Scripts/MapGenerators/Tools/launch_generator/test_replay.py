@@ -0,0 +1,99 @@
+"""
+Unit tests for replay.py
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay import load_recording, replay
+
+
+RECORDED_LOG = (
+    "============================================================\n"
+    "  完整输出日志\n"
+    "============================================================\n"
+    "\n"
+    "Log file open, 12/18/25 19:04:17\n"
+    "[2025.12.18-11.05.00:728][  0]LogPython: [CHECKPOINT:13:44] SCRIPT_START\n"
+    "[2025.12.18-11.05.00:807][  0]LogPython: [TRACE:main:24:123:success] 创建生成器实例\n"
+    "  continuation line\n"
+    "[2025.12.18-11.05.00:800][  0]LogPython: out-of-order line\n"
+    "[2025.12.18-11.05.01:228][  1]LogPython: [CHECKPOINT:38:600] SCRIPT_SUCCESS"
+)
+
+
+def test_load_recording():
+    """
+    Test header skipping and per-line offsets
+    """
+    print("Testing recording loader...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ue5_full_log.txt"
+        path.write_text(RECORDED_LOG, encoding='utf-8')
+        recording = load_recording(path)
+    
+    assert recording[0] == (0.0, "Log file open, 12/18/25 19:04:17\n"), "Saved-log header must be skipped"
+    offsets = [round(offset, 3) for offset, _ in recording]
+    assert offsets == [0.0, 0.0, 0.079, 0.079, 0.079, 0.5], f"Unexpected offsets: {offsets}"
+    assert recording[-1][1].endswith("SCRIPT_SUCCESS\n"), "Last line must be newline-terminated"
+    
+    print("✓ Recording loader passed")
+
+
+def test_replay_end_to_end():
+    """
+    Test that every replayed line reaches the launcher pipeline
+    """
+    print("Testing replay through run_generation_attempt...")
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "recorded.log"
+        path.write_text(RECORDED_LOG, encoding='utf-8')
+        try:
+            stats = replay(path, speed=0, workdir=Path(tmp) / "work")
+        finally:
+            os.chdir(cwd)
+    
+    assert stats['lines_sent'] == 6, f"Expected 6 lines written, got {stats['lines_sent']}"
+    assert stats['lines_handled'] == 6, f"Expected 6 lines handled, got {stats['lines_handled']}"
+    assert len(stats['latency_ms']) == 6
+    assert all(latency >= 0 for latency in stats['latency_ms'])
+    
+    print("✓ Replay end to end passed")
+
+
+def run_all_tests():
+    """Run all replay tests"""
+    print("\n" + "="*60)
+    print("Running replay Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_load_recording()
+        test_replay_end_to_end()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -235,6 +235,76 @@ def test_print_trace_history_empty():
     print("✓ Empty history handling passed")
 
 
+def _span_trace_info():
+    """TraceInfo with a small span tree (parsed like a real log)"""
+    from trace_parser import parse_line
+    trace_info = TraceInfo()
+    for marker in [
+        "[SPAN_BEGIN:1:0:0] generate_map",
+        "[SPAN_BEGIN:2:1:100] build_room",
+        "[SPAN_BEGIN:3:2:150] create_static_mesh",
+        "[SPAN_END:3:250:success] create_static_mesh",
+        "[SPAN_BEGIN:4:2:300] create_static_mesh",
+        "[SPAN_END:4:350:success] create_static_mesh",
+        '[SPAN_END:2:600:success] build_room {"actors": 2}',
+        "[SPAN_BEGIN:5:1:600] save_map",
+    ]:
+        parse_line(f"LogPython: {marker}", trace_info)
+    return trace_info
+
+
+def test_summarize_spans():
+    """
+    Test inclusive / exclusive time per span path
+    """
+    print("Testing span summary...")
+    
+    from result_analyzer import summarize_spans
+    rows = summarize_spans(_span_trace_info().spans, end_ms=1000)
+    by_path = {' > '.join(row['path']): row for row in rows}
+    
+    assert [row['name'] for row in rows] == ['generate_map', 'build_room', 'create_static_mesh', 'save_map']
+    assert [row['depth'] for row in rows] == [0, 1, 2, 1]
+    
+    mesh = by_path['generate_map > build_room > create_static_mesh']
+    assert (mesh['count'], mesh['inclusive'], mesh['exclusive']) == (2, 150, 150)
+    room = by_path['generate_map > build_room']
+    assert (room['inclusive'], room['exclusive']) == (500, 350)
+    assert room['attributes'] == {'actors': 2}
+    save = by_path['generate_map > save_map']
+    assert save['open'] == 1 and save['inclusive'] == 400, "Open span runs to end_ms"
+    root = by_path['generate_map']
+    assert root['open'] == 1 and (root['inclusive'], root['exclusive']) == (1000, 100)
+    
+    assert summarize_spans([]) == []
+    
+    print("✓ Span summary passed")
+
+
+def test_print_span_report():
+    """
+    Test the span table (and that it stays silent without spans)
+    """
+    print("Testing span report...")
+    
+    from result_analyzer import print_span_report
+    f = io.StringIO()
+    with redirect_stdout(f):
+        print_span_report(TraceInfo())
+    assert f.getvalue() == ""
+    
+    with redirect_stdout(f):
+        print_span_report(_span_trace_info())
+    output = f.getvalue()
+    assert "独占" in output and "包含" in output
+    assert "    create_static_mesh" in output, "Children are indented under their parent"
+    assert "actors=2" in output
+    assert "未结束" in output
+    assert "generate_map > build_room > create_static_mesh → 150.000ms" in output
+    
+    print("✓ Span report passed")
+
+
 def run_table_tests():
     """Run all table display tests"""
     print("\n" + "="*60)
@@ -246,6 +316,8 @@ def run_table_tests():
         test_print_trace_history_header()
         test_print_trace_history_backward_compatibility()
         test_print_trace_history_empty()
+        test_summarize_spans()
+        test_print_span_report()
         
         print("\n" + "="*60)
         print("✓ ALL TABLE TESTS PASSED")
@@ -0,0 +1,107 @@
+"""
+Unit tests for result_manifest.py
+"""
+
+import sys
+import os
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from result_manifest import clear_result_files, results_ready, read_manifest, verify_manifest
+
+
+def _write_map(tmp, data):
+    map_path = Path(tmp) / "Cosmos_002_Training_World.umap"
+    map_path.write_bytes(data)
+    return map_path
+
+
+def test_verify_manifest():
+    """
+    Test exact success detection: size and hash must match the saved map
+    """
+    print("Testing manifest verification...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data = b"umap-content"
+        map_path = _write_map(tmp, data)
+        manifest = {'status': 'success', 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        
+        assert verify_manifest(manifest, map_path)[0] == 0, "Matching manifest should succeed"
+        
+        # Stale map from an earlier run: same name, different content
+        map_path.write_bytes(b"older-content")
+        result, reason = verify_manifest(manifest, map_path)
+        assert result == 1, "Size mismatch should fail"
+        
+        map_path.write_bytes(b"umap-CONTENT")
+        result, reason = verify_manifest(manifest, map_path)
+        assert result == 1 and "哈希" in reason, f"Hash mismatch should fail: {reason}"
+        
+        map_path.unlink()
+        assert verify_manifest(manifest, map_path)[0] == 1, "Missing map should fail"
+        
+        result, reason = verify_manifest({'status': 'error', 'error': "Failed to save map"}, map_path)
+        assert result == 1 and "Failed to save map" in reason, f"Error status should fail: {reason}"
+    
+    print("✓ Manifest verification passed")
+
+
+def test_read_and_clear_manifest():
+    """
+    Test reading, readiness and clearing of manifest files
+    """
+    print("Testing manifest read/clear...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp) / "cosmos_002_training_world.result.json"
+        assert not results_ready([result_file])
+        assert not results_ready([]), "No expected manifests should never count as ready"
+        assert read_manifest(result_file) is None
+        
+        result_file.write_text("{not json", encoding='utf-8')
+        assert read_manifest(result_file) is None, "Invalid JSON should read as None"
+        
+        result_file.write_text(json.dumps({'status': 'success', 'steps': {'SAVE_MAP': 120}}), encoding='utf-8')
+        assert results_ready([result_file])
+        assert read_manifest(result_file)['steps'] == {'SAVE_MAP': 120}
+        
+        clear_result_files([result_file, Path(tmp) / "missing.result.json"])
+        assert not result_file.exists()
+    
+    print("✓ Manifest read/clear passed")
+
+
+def run_all_tests():
+    """Run all result_manifest tests"""
+    print("\n" + "="*60)
+    print("Running result_manifest Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_verify_manifest()
+        test_read_and_clear_manifest()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
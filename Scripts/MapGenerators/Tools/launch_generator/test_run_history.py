@@ -0,0 +1,167 @@
+"""
+Unit tests for run_history.py and history_cli.py
+"""
+
+import sys
+import os
+import tempfile
+import time
+from argparse import Namespace
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from output_monitor import OutputMonitor
+from trace_parser import TraceInfo, parse_line
+from run_history import RunHistory, get_step_timings
+from history_cli import cmd_regression
+
+
+def _run(save_ms, batch_offset=0):
+    """Monitor + trace info of one run where saving the map takes save_ms"""
+    monitor = OutputMonitor()
+    monitor.lines = ["line\n"] * 10
+    monitor.start_time = time.time() - 60  # Stable wall time so TOTAL never looks like a regression
+    trace_info = TraceInfo()
+    trace_info.module_history.append({'module': 'main', 'line': 20, 'timestamp': batch_offset + 100, 'status': 'start', 'context': ''})
+    trace_info.checkpoints = [
+        {'name': 'BEFORE_BUILD_ROOM', 'line': 56, 'timestamp': batch_offset + 1000},
+        {'name': 'AFTER_BUILD_ROOM', 'line': 60, 'timestamp': batch_offset + 1500},
+        {'name': 'BEFORE_SAVE_MAP', 'line': 83, 'timestamp': batch_offset + 1600},
+        {'name': 'AFTER_SAVE_MAP', 'line': 87, 'timestamp': batch_offset + 1600 + save_ms},
+    ]
+    return monitor, trace_info
+
+
+def test_record_and_step_series():
+    """
+    Test storing runs, batch windows and the step series used by the reports
+    """
+    print("Testing run history storage...")
+    
+    assert get_step_timings([('BEFORE_A', 10), ('AFTER_A', 35), ('AFTER_B', 50)]) == {'A': 25}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunHistory(Path(tmp) / "run_history.db") as history:
+            for save_ms in (1000, 2000):
+                monitor, trace_info = _run(save_ms)
+                history.record_run("map_a", "single", 1, (0, "ok"), trace_info, monitor)
+            monitor, trace_info = _run(9000)
+            history.record_run("map_a", "single", 1, (1, "failed"), trace_info, monitor)
+            
+            # Batch session: only checkpoints between map_b's markers belong to it
+            monitor, trace_info = _run(500)
+            window = {'traces': (1, 1), 'checkpoints': (4, 8)}
+            trace_info.checkpoints += _run(700)[1].checkpoints
+            history.record_run("map_b", "batch", 1, (0, "ok"), trace_info, monitor, window=window)
+            
+            runs = history.get_runs("map_a")
+            assert len(runs) == 3
+            assert runs[0]['result_code'] == 1, "Most recent run should come first"
+            assert runs[0]['line_count'] == 10 and runs[0]['trace_count'] == 1
+            
+            series = history.get_step_series("map_a")
+            assert [steps['SAVE_MAP'] for _, steps in series] == [1000, 2000], "Only successful runs, oldest first"
+            assert series[0][1]['BUILD_ROOM'] == 500
+            
+            batch_series = history.get_step_series("map_b")
+            assert batch_series[0][1] == {'BUILD_ROOM': 500, 'SAVE_MAP': 700}
+            assert batch_series[0][0]['trace_count'] == 0, "Trace entries outside the window are not stored"
+    
+    print("✓ Run history storage passed")
+
+
+def test_batch_clock_restart():
+    """
+    Test splitting a batch session whose generator clock restarts with every map
+    """
+    print("Testing batch session with generator clock restarts...")
+    
+    # BATCH_MAP_* use map_job's session clock, the generator markers restart near 0 per map
+    lines = [
+        "LogPython: [CHECKPOINT:119:10.000] BATCH_MAP_START:a",
+        "LogPython: [CHECKPOINT:119:10.000] BATCH_MAP_START:a",
+        "LogPython: [TRACE:main:24:5.000:info] a-work",
+        "LogPython: [CHECKPOINT:55:50.000] SCRIPT_SUCCESS",
+        "LogPython: [CHECKPOINT:122:900.000] BATCH_MAP_END:a:success",
+        "LogPython: [CHECKPOINT:119:1000.000] BATCH_MAP_START:b",
+        "LogPython: [TRACE:main:24:6.000:info] b-work",
+        "LogPython: [CHECKPOINT:55:40.000] SCRIPT_SUCCESS",
+        "LogPython: [CHECKPOINT:122:2000.000] BATCH_MAP_END:b:success",
+        "LogPython: [CHECKPOINT:119:2100.000] BATCH_MAP_START:c",
+        "LogPython: [TRACE:main:24:3.000:info] c-work",
+    ]
+    trace_info = TraceInfo()
+    for line in lines:
+        parse_line(line, trace_info)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunHistory(Path(tmp) / "run_history.db") as history:
+            monitor = OutputMonitor()
+            stored = {}
+            for name in ("a", "b", "c"):
+                run_id = history.record_run(name, "batch", 1, (0, "ok"), trace_info, monitor,
+                                            trace_info.batch_maps[name])
+                contexts = [row[0] for row in history.conn.execute(
+                    "SELECT context FROM trace_entries WHERE run_id = ? ORDER BY seq", (run_id,))]
+                stored[name] = (contexts, [name for name, _ in history.get_checkpoints(run_id)])
+    
+    assert stored['a'] == (['a-work'], ['BATCH_MAP_START:a', 'SCRIPT_SUCCESS', 'BATCH_MAP_END:a:success']), stored['a']
+    assert stored['b'] == (['b-work'], ['BATCH_MAP_START:b', 'SCRIPT_SUCCESS', 'BATCH_MAP_END:b:success']), stored['b']
+    assert stored['c'] == (['c-work'], ['BATCH_MAP_START:c']), "Unfinished map keeps everything after its start"
+    
+    print("✓ Batch session with generator clock restarts passed")
+
+
+def test_regression_report():
+    """
+    Test that a slower recent median is flagged and a stable one is not
+    """
+    print("Testing regression report...")
+    
+    args = Namespace(map_name="map_a", baseline=4, recent=2, threshold=20)
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunHistory(Path(tmp) / "run_history.db") as history:
+            for save_ms in (1000, 1100, 1000, 1050, 1020, 1080):
+                monitor, trace_info = _run(save_ms)
+                history.record_run("map_a", "single", 1, (0, "ok"), trace_info, monitor)
+            assert cmd_regression(history, args) == 0, "Stable timings must not be flagged"
+            
+            for save_ms in (3000, 3200):
+                monitor, trace_info = _run(save_ms)
+                history.record_run("map_a", "single", 1, (0, "ok"), trace_info, monitor)
+            assert cmd_regression(history, args) == 1, "Tripled SAVE_MAP time must be flagged"
+    
+    print("✓ Regression report passed")
+
+
+def run_all_tests():
+    """Run all run_history tests"""
+    print("\n" + "="*60)
+    print("Running run_history Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_record_and_step_series()
+        test_batch_clock_restart()
+        test_regression_report()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
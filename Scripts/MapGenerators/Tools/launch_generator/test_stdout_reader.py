@@ -0,0 +1,126 @@
+"""
+Unit tests for stdout_reader.py (and process_runner's stdout follower)
+"""
+
+import sys
+import os
+import io
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stdout_reader import StdoutReader
+from fatal_detector import FatalDetector
+from output_monitor import OutputMonitor
+from process_runner import _follow_stdout
+from trace_parser import TraceInfo
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+SCRIPT = "D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/cosmos_002_training_world/generate.py"
+
+
+class ChunkedPipe(io.RawIOBase):
+    """Binary pipe that returns the given chunks one read at a time"""
+    
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+    
+    def readable(self):
+        return True
+    
+    def read1(self, size=-1):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_reader_lines():
+    """
+    Test line splitting across reads (multibyte characters, CRLF) and the trailing partial line
+    """
+    print("Testing stdout reader lines...")
+    
+    text = "LogInit: 启动\r\nLogPython: [CHECKPOINT:13:5.000] SCRIPT_START\nLogExit: 退出".encode('utf-8')
+    chunks = [text[:10], text[10:20], text[20:]]  # First read ends inside "启"
+    lines = []
+    reader = StdoutReader(ChunkedPipe(chunks), lines.append)
+    reader.start()
+    reader.join(timeout=5)
+    
+    assert not reader.is_alive() and reader.error is None
+    assert [line.rstrip() for line in lines] == [
+        "LogInit: 启动", "LogPython: [CHECKPOINT:13:5.000] SCRIPT_START", "LogExit: 退出"], lines
+    assert reader.lines_read == 3
+    
+    print("✓ Stdout reader lines passed")
+
+
+def test_follow_stdout_stops_editor():
+    """
+    Test that the follower stops an editor that stays open after its manifest before draining the pipe
+    """
+    print("Testing stdout follower early stop...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        result_file = project_dir / "Saved" / "MapGenerators" / "cosmos_002_training_world.result.json"
+        env = dict(os.environ, FAKE_ENGINE_SPEED='50', FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30',
+                   FAKE_ENGINE_EXIT='idle')
+        process = subprocess.Popen(
+            [sys.executable, str(FAKE_ENGINE), r"D:\001xm\shijiewuxian\shijiewuxian.uproject", f"-ExecCmds=py {SCRIPT}",
+             '-stdout', '-unattended'],
+            cwd=project_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        monitor = OutputMonitor()
+        trace_info = TraceInfo()
+        try:
+            started = time.time()
+            _follow_stdout(process, monitor, trace_info, [result_file], FatalDetector())
+            elapsed = time.time() - started
+            
+            assert result_file.exists()
+            assert process.poll() is not None, "Idle editor should be stopped once the manifest exists"
+            assert elapsed < 5, f"Follower waited for the pipe of a live editor ({elapsed:.1f}s)"
+            names = [c['name'] for c in trace_info.checkpoints]
+            assert names[-1] == "SCRIPT_SUCCESS", names
+            assert trace_info.fatal_match is None
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            monitor.lines.close()
+    
+    print("✓ Stdout follower early stop passed")
+
+
+def run_all_tests():
+    """Run all stdout_reader tests"""
+    print("\n" + "="*60)
+    print("Running stdout_reader Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_reader_lines()
+        test_follow_stdout_stops_editor()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,94 @@
+"""
+Unit tests for summary_aggregator.py
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from output_monitor import OutputMonitor
+from summary_aggregator import MAX_FINAL_ERRORS
+from summary_generator import get_new_lines_summary, get_compressed_summary
+
+
+def test_periodic_windows():
+    """
+    Test keyword counts, deduplicated errors and window reset between periodic summaries
+    """
+    print("Testing periodic summary windows...")
+    
+    monitor = OutputMonitor()
+    for line in [
+        "LogShaderCompilers: Display: Compiling shader\n",
+        "LogPython: STARTING MAP GENERATOR\n",
+        "LogPython: Error: Failed to spawn actor\n",
+        "LogPython: Error: Failed to spawn actor\n",
+        "LogStreaming: Loading package\n",
+    ]:
+        monitor.add_line(line)
+    
+    summary = get_new_lines_summary(monitor)
+    assert '✓脚本启动' in summary
+    assert '错误×2' in summary, f"Both error lines should be counted: {summary}"
+    assert summary.count('✗ LogPython: Error: Failed to spawn actor') == 1, "Error details must be deduplicated"
+    assert monitor.last_summarized_index == 5
+    assert get_new_lines_summary(monitor) is None, "No new lines -> no summary"
+    
+    monitor.add_line("LogSomething: nothing to report\n")
+    assert get_new_lines_summary(monitor) == "  1行日志", "New window must only count new lines"
+    
+    print("✓ Periodic summary windows passed")
+
+
+def test_final_summary():
+    """
+    Test completed steps and the capped error excerpt of the final summary
+    """
+    print("Testing final summary aggregates...")
+    
+    monitor = OutputMonitor()
+    monitor.add_line("LogPython: [1/6] Preparing level\n")
+    for i in range(8):
+        monitor.add_line(f"LogPython: ERROR: step {i} failed\n")
+    monitor.add_line("LogPython: SUCCESS!\n")
+    
+    summary = get_compressed_summary(monitor)
+    assert "总输出行数: 10" in summary
+    assert "✓ [1/6] 准备Level" in summary and "✓ 脚本执行成功" in summary
+    assert "检测到错误 (8):" in summary, "All errors are counted"
+    assert len(monitor.summary.errors) == MAX_FINAL_ERRORS, "Only the excerpt is kept in memory"
+    assert "step 4 failed" in summary and "step 5 failed" not in summary
+    
+    print("✓ Final summary aggregates passed")
+
+
+def run_all_tests():
+    """Run all summary_aggregator tests"""
+    print("\n" + "="*60)
+    print("Running summary_aggregator Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_periodic_windows()
+        test_final_summary()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
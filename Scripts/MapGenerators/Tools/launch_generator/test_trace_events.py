@@ -0,0 +1,168 @@
+"""
+Unit tests for trace_events.py
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trace_events import TraceEventReader, write_event, TRACE_EVENTS_ENV
+from trace_parser import TraceInfo, parse_line
+
+
+FAKE_ENGINE = Path(__file__).resolve().parent / "fake_engine.py"
+SCRIPT = "D:/001xm/shijiewuxian/Scripts/MapGenerators/Maps/cosmos_002_training_world/generate.py"
+
+
+def test_read_events():
+    """
+    Test applying events: contexts with marker delimiters, malformed lines, trailing line
+    """
+    print("Testing trace event reading...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "map.trace.jsonl"
+        reader = TraceEventReader(path)
+        trace_info = TraceInfo()
+        assert reader.read(trace_info) == 0, "Missing file reads nothing"
+        
+        write_event(path, {'type': 'checkpoint', 'line': 13, 'ms': 5, 'ns': 5000000, 'name': 'SCRIPT_START'})
+        write_event(path, {'type': 'trace', 'module': 'room_builder', 'line': 25, 'ms': 2450, 'ns': 2450113200,
+                           'status': 'success', 'context': '放置成功: Wall_1 [x:1]'})
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("not json\n")
+            f.write('{"type": "trace", "line": 3}\n')
+            f.write('{"type": "checkpoint", "line": 40, "ms": 2500, "ns": 2500000000, "name": "AFTER_BUILD_ROOM"}')
+        
+        assert reader.read(trace_info) == 2
+        assert reader.malformed == 2
+        assert trace_info.module_history[0]['context'] == '放置成功: Wall_1 [x:1]'
+        assert trace_info.module_history[0]['timestamp'] == 2450
+        assert trace_info.current_module == 'room_builder'
+        
+        assert reader.read(trace_info, final=True) == 1, "Trailing line applied once UE5 exited"
+        assert [c['name'] for c in trace_info.checkpoints] == ['SCRIPT_START', 'AFTER_BUILD_ROOM']
+        assert trace_info.last_checkpoint == 'AFTER_BUILD_ROOM'
+        assert reader.events == 3
+        reader.close()
+        
+        reader = TraceEventReader(path)
+        reader.clear()
+        assert not path.exists()
+        assert reader.environment() == {TRACE_EVENTS_ENV: str(path.absolute())}
+        reader.clear()  # Nothing left to remove
+        
+        # Windows: a handle still open elsewhere refuses unlink - the file is emptied instead
+        write_event(path, {'type': 'checkpoint', 'line': 13, 'ms': 5, 'ns': 5000000, 'name': 'SCRIPT_START'})
+        unlink = Path.unlink
+        def refuse(self, *args, **kwargs):
+            raise PermissionError(13, "in use", str(self))
+        Path.unlink = refuse
+        try:
+            reader.clear()
+        finally:
+            Path.unlink = unlink
+        assert path.exists() and path.stat().st_size == 0
+    
+    print("✓ Trace event reading passed")
+
+
+def test_text_markers_skipped():
+    """
+    Test that text markers are only parsed when the generator writes no events
+    """
+    print("Testing text markers with and without events...")
+    
+    line = "LogPython: [CHECKPOINT:13:5] SCRIPT_START\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "map.trace.jsonl"
+        
+        trace_info = TraceInfo()
+        trace_info.trace_events = TraceEventReader(path)
+        parse_line(line, trace_info)
+        assert [c['name'] for c in trace_info.checkpoints] == ['SCRIPT_START'], "No event file: text is parsed"
+        
+        path.touch()
+        parse_line("LogPython: [CHECKPOINT:20:9] LATER\n", trace_info)
+        assert len(trace_info.checkpoints) == 2, "Decision is made once, at the first marker"
+        
+        trace_info = TraceInfo()
+        trace_info.trace_events = TraceEventReader(path)
+        parse_line(line, trace_info)
+        parse_line("LogPython: [TRACE:main:24:6:info] 创建生成器实例\n", trace_info)
+        assert trace_info.checkpoints == [] and trace_info.module_history == [], "Events replace text markers"
+        assert trace_info.trace_events.active()
+    
+    print("✓ Text markers with and without events passed")
+
+
+def test_fake_engine_events():
+    """
+    Test that the fake engine's events give the same checkpoints, traces and spans as its text markers
+    """
+    print("Testing fake engine trace events...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        path = project_dir / "map.trace.jsonl"
+        env = dict(os.environ, FAKE_ENGINE_SPEED='50', FAKE_ENGINE_NOISE='20', FAKE_ENGINE_SHADERS='30',
+                   FAKE_ENGINE_EXIT='quit', **{TRACE_EVENTS_ENV: str(path)})
+        subprocess.run(
+            [sys.executable, str(FAKE_ENGINE), r"D:\001xm\shijiewuxian\shijiewuxian.uproject", f"-ExecCmds=py {SCRIPT}",
+             '-stdout', '-unattended'],
+            cwd=project_dir, env=env, stdout=subprocess.DEVNULL, timeout=60
+        )
+        
+        text_info = TraceInfo()
+        for line in (project_dir / "Saved" / "Logs" / "shijiewuxian.log").read_text(encoding='utf-8').splitlines(True):
+            parse_line(line, text_info)
+        
+        event_info = TraceInfo()
+        reader = TraceEventReader(path)
+        reader.read(event_info, final=True)
+        reader.close()
+        
+        assert reader.malformed == 0
+        assert event_info.checkpoints == text_info.checkpoints
+        # Each text TRACE marker is logged twice (unreal.log + print), each event once
+        assert event_info.module_history == text_info.module_history[::2]
+        assert event_info.spans == text_info.spans and len(event_info.spans) == 7
+        assert not event_info.open_spans
+    
+    print("✓ Fake engine trace events passed")
+
+
+def run_all_tests():
+    """Run all trace_events tests"""
+    print("\n" + "="*60)
+    print("Running trace_events Unit Tests")
+    print("="*60 + "\n")
+    
+    try:
+        test_read_events()
+        test_text_markers_skipped()
+        test_fake_engine_events()
+        
+        print("\n" + "="*60)
+        print("✓ ALL TESTS PASSED")
+        print("="*60 + "\n")
+        return True
+    
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}\n")
+        return False
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}\n")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -8,7 +8,7 @@ import os
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from trace_parser import TraceInfo, _parse_trace_marker, infer_status_from_context
+from trace_parser import TraceInfo, _parse_trace_marker, infer_status_from_context, parse_line
 
 
 def test_parse_new_format_with_status():
@@ -169,6 +169,105 @@ def test_mixed_old_and_new_formats():
     print("✓ Mixed format parsing passed")
 
 
+def test_parse_high_resolution_timestamps():
+    """
+    Test sub-millisecond timestamps next to older integer ones
+    """
+    print("Testing high-resolution timestamps...")
+    
+    trace_info = TraceInfo()
+    test_lines = [
+        "LogPython: [TRACE:room_builder:30:2450.113:success] 放置成功: Wall_1",
+        "LogPython: [TRACE:room_builder:30:2450.155:success] 放置成功: Wall_2",
+        "LogPython: [TRACE:room_builder:30:2451] 放置成功: Wall_3",
+        "LogPython: [CHECKPOINT:40:2500.042] AFTER_BUILD_ROOM",
+        "LogPython: [SPAN_BEGIN:1:0:2400.5] build_room",
+        "LogPython: [SPAN_END:1:2500.25:success] build_room",
+    ]
+    for line in test_lines:
+        parse_line(line, trace_info)
+    
+    timestamps = [entry['timestamp'] for entry in trace_info.module_history]
+    assert timestamps == [2450.113, 2450.155, 2451.0]
+    assert all(type(timestamp) is float for timestamp in timestamps), "Old integer format is stored as float too"
+    assert abs((timestamps[1] - timestamps[0]) - 0.042) < 1e-9, "Sub-millisecond spacing survives"
+    assert trace_info.checkpoints[0]['timestamp'] == 2500.042
+    assert (trace_info.spans[0]['start'], trace_info.spans[0]['end']) == (2400.5, 2500.25)
+    
+    print("✓ High-resolution timestamps passed")
+
+
+def test_parse_batch_checkpoints():
+    """
+    Test checkpoint and batch marker parsing through parse_line
+    """
+    print("Testing batch checkpoint parsing...")
+    
+    trace_info = TraceInfo()
+    
+    # Every marker appears twice in the UE log (unreal.log + print)
+    test_lines = [
+        "[2025.12.18-11.05.00:728][  0]LogPython: [CHECKPOINT:100:10] BATCH_MAP_START:map_a",
+        "[2025.12.18-11.05.00:728][  0]LogPython: [CHECKPOINT:100:10] BATCH_MAP_START:map_a",
+        "[2025.12.18-11.05.01:000][  0]LogPython: [CHECKPOINT:105:900] BATCH_MAP_END:map_a:success",
+        "[2025.12.18-11.05.01:100][  0]LogPython: [CHECKPOINT:100:1000] BATCH_MAP_START:map_b",
+        "[2025.12.18-11.05.02:100][  0]LogPython: [CHECKPOINT:105:2000] BATCH_MAP_END:map_b:error",
+        "[2025.12.18-11.05.02:200][  0]LogPython: [CHECKPOINT:100:2100] BATCH_MAP_START:map_c",
+    ]
+    
+    for line in test_lines:
+        parse_line(line, trace_info)
+    
+    assert len(trace_info.checkpoints) == 5, f"Expected 5 checkpoints, got {len(trace_info.checkpoints)}"
+    assert trace_info.last_checkpoint == "BATCH_MAP_START:map_c"
+    assert trace_info.batch_maps['map_a']['status'] == 'success'
+    assert trace_info.batch_maps['map_b']['status'] == 'error'
+    assert trace_info.batch_maps['map_c']['status'] == 'running'
+    assert trace_info.current_batch_map == 'map_c'
+    
+    print("✓ Batch checkpoint parsing passed")
+
+
+def test_parse_span_markers():
+    """
+    Test SPAN_BEGIN / SPAN_END parsing: nesting, duplicates, attributes, reused ids
+    """
+    print("Testing span marker parsing...")
+    
+    trace_info = TraceInfo()
+    prefix = "[2025.12.18-11.05.00:728][  0]LogPython: "
+    test_lines = [
+        "[SPAN_BEGIN:1:0:100] generate_map",
+        "[SPAN_BEGIN:1:0:100] generate_map",
+        "[SPAN_BEGIN:2:1:110] build_room",
+        "[SPAN_BEGIN:3:2:120] create_static_mesh",
+        "[SPAN_END:3:150:success] create_static_mesh",
+        "[SPAN_END:3:150:success] create_static_mesh",
+        '[SPAN_END:2:400:success] build_room {"actors": 12, "note": "a {b}"}',
+        "[SPAN_END:1:500:error] generate_map",
+        # Next map in the same editor session: ids start again at 1
+        "[SPAN_BEGIN:1:0:600] generate_map",
+        "[SPAN_BEGIN:2:1:610] build_room",
+        "[SPAN_END:2:bad:success] build_room",
+    ]
+    for line in test_lines:
+        parse_line(prefix + line, trace_info)
+    
+    spans = trace_info.spans
+    assert [entry['name'] for entry in spans] == ['generate_map', 'build_room', 'create_static_mesh',
+                                                   'generate_map', 'build_room']
+    assert spans[2]['path'] == ('generate_map', 'build_room', 'create_static_mesh')
+    assert spans[2]['parent_index'] == 1 and spans[1]['parent_index'] == 0 and spans[0]['parent_index'] is None
+    assert (spans[2]['start'], spans[2]['end']) == (120, 150)
+    assert spans[1]['name'] == 'build_room' and spans[1]['attributes'] == {'actors': 12, 'note': 'a {b}'}
+    assert spans[0]['status'] == 'error'
+    assert spans[4]['parent_index'] == 3, "Reused id links to the open span"
+    assert spans[4]['end'] is None, "Malformed SPAN_END is ignored"
+    assert trace_info.open_spans == {1: 3, 2: 4}
+    
+    print("✓ Span marker parsing passed")
+
+
 def run_all_tests():
     """Run all trace_parser tests"""
     print("\n" + "="*60)
@@ -181,6 +280,9 @@ def run_all_tests():
         test_parse_invalid_format()
         test_infer_status_from_context()
         test_mixed_old_and_new_formats()
+        test_parse_high_resolution_timestamps()
+        test_parse_batch_checkpoints()
+        test_parse_span_markers()
         
         print("\n" + "="*60)
         print("✓ ALL TESTS PASSED")
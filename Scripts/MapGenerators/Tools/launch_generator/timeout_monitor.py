@@ -8,22 +8,51 @@ from config import DEBUG_MODE
 from summary_generator import get_new_lines_summary
 
 
-def monitor_timeout(monitor, timeout, check_interval, process=None):
-    """Monitor thread - checks for timeout every N seconds"""
+# Seconds between silence checks (summaries are still printed every check_interval)
+POLL_INTERVAL = 1
+
+
+def get_phase_timeout(timeout, trace_info=None, budgets=None):
+    """
+    Silence budget for the current phase
+    
+    Returns:
+        tuple: (timeout_seconds, phase_name) - phase_name is None when the fixed timeout applies
+    """
+    if budgets is None or trace_info is None or not trace_info.last_checkpoint:
+        return timeout, None
+    return budgets.budget_for(trace_info.last_checkpoint), trace_info.last_checkpoint
+
+
+def monitor_timeout(monitor, timeout, check_interval, process=None, trace_info=None, budgets=None):
+    """
+    Monitor thread - checks for timeout every second, prints summaries every check_interval
+    
+    Args:
+        timeout: Fixed silence timeout (used before the first checkpoint / without budgets)
+        trace_info: TraceInfo of the run - its last checkpoint selects the phase budget
+        budgets: Optional PhaseBudgets learned from past runs
+    """
+    last_summary = time.time()
     while monitor.is_running:
-        time.sleep(check_interval)
+        time.sleep(min(POLL_INTERVAL, check_interval))
         elapsed = monitor.get_silence_duration()
         
         # Show new output summary (silent mode)
-        if not DEBUG_MODE:
+        if not DEBUG_MODE and time.time() - last_summary >= check_interval:
+            last_summary = time.time()
             summary = get_new_lines_summary(monitor)
             if summary:
                 print(f"\n[{datetime.now().strftime('%H:%M:%S')}]")
                 print(summary)
         
         # Check timeout (only if we've received output)
-        if monitor.has_output and elapsed > timeout:
-            print(f"\n[监控] {timeout}秒无新输出，自动停止...")
+        phase_timeout, phase = get_phase_timeout(timeout, trace_info, budgets)
+        if monitor.has_output and elapsed > phase_timeout:
+            if phase:
+                print(f"\n[监控] 阶段 {phase} 已 {elapsed:.1f}秒无新输出 (预算 {phase_timeout:.1f}秒)，自动停止...")
+            else:
+                print(f"\n[监控] {timeout}秒无新输出，自动停止...")
             print(f"  总输出行数: {len(monitor.lines)}")
             
             # Show last lines
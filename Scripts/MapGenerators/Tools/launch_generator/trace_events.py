@@ -0,0 +1,117 @@
+"""
+Trace events module - structured TRACE / CHECKPOINT / SPAN events written by the generator
+generate/trace.py (and Maps/map_job.py for BATCH_* markers) append one JSON object
+per marker to the file named by the MAPGEN_TRACE_EVENTS environment variable:
+
+    {"type": "trace", "module": "room_builder", "line": 25, "ms": 2450, "ns": 2450113200, "status": "success", "context": "创建地板"}
+    {"type": "checkpoint", "line": 40, "ms": 2500, "ns": 2500402100, "name": "AFTER_BUILD_ROOM"}
+    {"type": "span_begin", "id": 2, "parent": 1, "ms": 2510, "ns": 2510000400, "name": "build_room"}
+    {"type": "span_end", "id": 2, "ms": 3900, "ns": 3900207300, "status": "success", "name": "build_room", "attributes": {"actors": 12}}
+
+ms is the value printed in the text marker, ns the generator's monotonic clock since
+its start. The launcher tails this file instead of scraping the markers out of the
+UE5 log: no string splitting on the hot path, and contexts with ':' or ']' survive.
+"""
+
+import json
+import os
+from pathlib import Path
+from log_tailer import LogTailer
+from trace_parser import apply_trace_event
+
+
+# Environment variable read by generate/trace.py and Maps/map_job.py
+TRACE_EVENTS_ENV = 'MAPGEN_TRACE_EVENTS'
+
+
+class TraceEventReader:
+    """
+    Follows one run's event file and applies its events to a TraceInfo
+
+    The generator opens the file before it logs its first marker, so the file
+    exists by the time the first text marker reaches the launcher: active() decides
+    once, at that marker, whether events or scraped text markers feed TraceInfo.
+
+    Usage:
+        events = TraceEventReader(settings['trace_events_file'])
+        events.clear()                          # before UE5 starts
+        trace_info.trace_events = events        # parse_line skips text markers when active
+        events.read(trace_info)                 # every monitoring tick
+        events.read(trace_info, final=True)     # after UE5 exited
+        events.close()
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.events = 0      # Events applied
+        self.malformed = 0   # Lines that were not valid events
+        self._active = None
+        self._tailer = LogTailer(self.path)
+
+    def clear(self):
+        """Remove the file of a previous run (and create its folder for the generator)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # Still open elsewhere (Windows: an editor holding a handle) - empty it instead
+            try:
+                self.path.write_bytes(b"")
+            except OSError as e:
+                print(f"[警告] 无法清除追踪事件文件 {self.path}: {e}")
+
+    def environment(self):
+        """{MAPGEN_TRACE_EVENTS: absolute path} for the UE5 process"""
+        return {TRACE_EVENTS_ENV: str(self.path.absolute())}
+
+    def active(self):
+        """True when the generator writes events (decided on the first call)"""
+        if self._active is None:
+            self._active = self.path.exists()
+        return self._active
+
+    def read(self, trace_info, final=False):
+        """
+        Apply the events appended since the last call
+
+        Args:
+            final: The generator has exited - also apply a trailing line without newline
+
+        Returns:
+            int: Events applied
+        """
+        try:
+            lines = self._tailer.read_lines()
+            if final:
+                lines.extend(self._tailer.flush())
+        except OSError:
+            return 0
+
+        applied = 0
+        for line in lines:
+            try:
+                event = json.loads(line)
+                apply_trace_event(event, trace_info)
+            except (ValueError, KeyError, TypeError):
+                self.malformed += 1
+                continue
+            applied += 1
+        self.events += applied
+        return applied
+
+    def close(self):
+        self._tailer.close()
+
+
+def write_event(path, event):
+    """Append one event (for launcher-side tools and tests; the generator has its own writer)"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def trace_events_path():
+    """Event file named by the environment (None outside a launcher-started editor)"""
+    path = os.environ.get(TRACE_EVENTS_ENV)
+    return Path(path) if path else None
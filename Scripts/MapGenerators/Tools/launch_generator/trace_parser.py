@@ -2,9 +2,20 @@
 Trace parsing module - extracts execution trace from logs
 Supports new auto-trace format: [TRACE:module:line:timestamp:status] context
 Also supports old format: [TRACE:module:line:timestamp] context (infers status)
+Timestamps are milliseconds since the generator started: 2450.113 (perf_counter based) or
+2450 (older generators) - both are stored as float.
+Spans (generate/trace.py span): [SPAN_BEGIN:id:parent_id:timestamp] name
+                                [SPAN_END:id:timestamp:status] name {attributes}
 """
 
+import json
 import time
+from config import COMPILE_CATEGORIES
+from line_classifier import (
+    classify, FUNCTION_MARKERS, TRACE_MARKER, CHECKPOINT_MARKER, SPAN_MARKER, SCRIPT_START, COMPILE_ACTIVITY,
+    PYTHON_ERROR_WORD, PROGRESS_STEP, FUNCTION_MARKER, ACTOR_MARKER
+)
+from log_record import RecordDispatcher, parse_record
 
 
 # Status keywords for automatic inference (for backward compatibility)
@@ -58,6 +69,7 @@ class TraceInfo:
         self.script_error = False
         self.compilation_detected = False
         self.error_messages = []
+        self.fatal_match = None  # First fatal signature hit (fatal_detector.py)
         self.actors_created = 0
         self.expected_actors = 0
         self.materials_created = 0
@@ -74,47 +86,92 @@ class TraceInfo:
         }
         
         # New: module execution history (complete record)
-        self.module_history = []  # Format: {'module': str, 'line': int, 'timestamp': int, 'context': str}
+        self.module_history = []  # Format: {'module': str, 'line': int, 'timestamp': float (ms), 'context': str}
         self.current_module = None
         self.current_module_line = None
         self.start_time = None
+        
+        # Checkpoint history: {'name': str, 'line': int, 'timestamp': float (ms)}
+        self.checkpoints = []
+        
+        # Spans in start order (nested: parent before its children)
+        # Format: {'id': int, 'parent': int, 'parent_index': int|None, 'name': str, 'path': tuple,
+        #          'start': float, 'end': float|None, 'status': str|None, 'attributes': dict}
+        self.spans = []
+        self.open_spans = {}  # Span id -> index in spans, until its SPAN_END
+        
+        # trace_events.TraceEventReader when the generator writes structured events
+        # (TRACE / CHECKPOINT / SPAN text markers are then not parsed)
+        self.trace_events = None
+        
+        # Batch mode (Maps/batch_generate.py): per-map status in start order
+        # Format: {map_name: {'status': 'running'|'success'|'error', 'start': float, 'end': float,
+        #                     'traces': [first, end], 'checkpoints': [first, end]}}
+        # start/end are on the map_job clock; traces/checkpoints are the index ranges of module_history
+        # and checkpoints logged between BATCH_MAP_START and BATCH_MAP_END (end None = still running) -
+        # the generator's own clock restarts with every map, so its timestamps cannot be compared
+        self.batch_maps = {}
+        self.current_batch_map = None
+
+
+def parse_line(line, trace_info, signals=None, record=None):
+    """
+    Parse a single line and update trace info
+    
+    Args:
+        signals: line_classifier.classify(line), when the caller already has it
+        record: log_record.LogRecord of the line (needed for continuation lines)
+    """
+    if record is None:
+        record = parse_record(line)
+    if signals is None:
+        signals = classify(line)
+    TRACE_HANDLERS.dispatch(record, trace_info, signals)
 
 
-def parse_line(line, trace_info):
-    """Parse a single line and update trace info"""
-    # Parse TRACE markers
-    if 'LogPython' in line and '[TRACE:' in line:
-        _parse_trace_marker(line, trace_info)
+def _handle_python(record, trace_info, signals):
+    """LogPython records: generator markers, progress and errors"""
+    line = record.line
+    
+    # Parse TRACE, CHECKPOINT and SPAN markers (structured events carry them instead when available)
+    if signals & (TRACE_MARKER | CHECKPOINT_MARKER | SPAN_MARKER):
+        events = trace_info.trace_events
+        if events is None or not events.active():
+            if signals & SPAN_MARKER:
+                _parse_span_marker(line, trace_info)
+            else:
+                _parse_trace_marker(line, trace_info)
     
     # Detect script start
-    if 'STARTING MAP GENERATOR' in line:
+    if signals & SCRIPT_START:
         trace_info.script_started = True
     
-    # Detect compilation
-    if 'Compiling' in line or 'Building' in line or 'Shader' in line:
-        trace_info.compilation_detected = True
-    
     # Detect script errors
-    if 'LogPython' in line and ('ERROR' in line or 'Exception' in line):
+    if signals & PYTHON_ERROR_WORD:
         trace_info.script_error = True
         trace_info.error_messages.append(line.strip())
     
-    # Track engine status
-    _track_engine_status(line, trace_info)
-    
     # Track progress steps
-    if 'LogPython' in line:
+    if signals & PROGRESS_STEP:
         _track_progress(line, trace_info)
+    if signals & FUNCTION_MARKER:
         _track_function(line, trace_info)
+    if signals & ACTOR_MARKER:
         _track_actors(line, trace_info)
 
 
+def _handle_compile(record, trace_info, signals):
+    """Shader / asset compile records"""
+    if signals & COMPILE_ACTIVITY:
+        trace_info.compilation_detected = True
+
+
 def _parse_trace_marker(line, trace_info):
     """Parse TRACE marker from line (supports new format with status and old format)"""
     try:
         # New format: [TRACE:module:line:timestamp:status] context
         # Old format: [TRACE:module:line:timestamp] context (backward compatible)
-        if '[TRACE:' in line and 'LogPython' in line:
+        if '[TRACE:' in line:
             marker_start = line.find('[TRACE:')
             marker_end = line.find(']', marker_start)
             
@@ -129,7 +186,7 @@ def _parse_trace_marker(line, trace_info):
                     # New format with status: [TRACE:module:line:timestamp:status]
                     module_name = parts[0]
                     line_num = int(parts[1])
-                    timestamp_ms = int(parts[2])
+                    timestamp_ms = float(parts[2])
                     status = parts[3]
                     
                 elif len(parts) >= 3:
@@ -137,30 +194,14 @@ def _parse_trace_marker(line, trace_info):
                     # Infer status from context for backward compatibility
                     module_name = parts[0]
                     line_num = int(parts[1])
-                    timestamp_ms = int(parts[2])
+                    timestamp_ms = float(parts[2])
                     status = infer_status_from_context(context)
                     
                 else:
                     # Invalid format, skip
                     return
                 
-                # Update current state
-                trace_info.current_module = module_name
-                trace_info.current_module_line = line_num
-                trace_info.last_trace_line = line_num
-                
-                # Record history with status
-                trace_info.module_history.append({
-                    'module': module_name,
-                    'line': line_num,
-                    'timestamp': timestamp_ms,
-                    'context': context,
-                    'status': status  # New field
-                })
-                
-                # Record start time (first record)
-                if trace_info.start_time is None:
-                    trace_info.start_time = timestamp_ms
+                _record_trace(trace_info, module_name, line_num, timestamp_ms, context, status)
         
         # Parse checkpoint: [CHECKPOINT:line:timestamp] name
         elif '[CHECKPOINT:' in line:
@@ -173,11 +214,9 @@ def _parse_trace_marker(line, trace_info):
                 
                 if len(parts) >= 2:
                     line_num = int(parts[0])
-                    timestamp_ms = int(parts[1])
+                    timestamp_ms = float(parts[1])
                     checkpoint_name = line[marker_end+1:].strip()
-                    
-                    trace_info.last_checkpoint = checkpoint_name
-                    trace_info.last_trace_line = line_num
+                    _record_checkpoint(trace_info, checkpoint_name, line_num, timestamp_ms)
         
         # Legacy format support (for backward compatibility)
         elif '[TRACE:LINE:' in line:
@@ -197,13 +236,161 @@ def _parse_trace_marker(line, trace_info):
         pass
 
 
-def _track_engine_status(line, trace_info):
+def _record_trace(trace_info, module_name, line_num, timestamp_ms, context, status):
+    """Update trace_info with one TRACE marker / event"""
+    # Update current state
+    trace_info.current_module = module_name
+    trace_info.current_module_line = line_num
+    trace_info.last_trace_line = line_num
+    
+    # Record history with status
+    trace_info.module_history.append({
+        'module': module_name,
+        'line': line_num,
+        'timestamp': timestamp_ms,
+        'context': context,
+        'status': status
+    })
+    
+    # Record start time (first record)
+    if trace_info.start_time is None:
+        trace_info.start_time = timestamp_ms
+
+
+def _record_checkpoint(trace_info, checkpoint_name, line_num, timestamp_ms):
+    """Update trace_info with one CHECKPOINT marker / event"""
+    trace_info.last_checkpoint = checkpoint_name
+    trace_info.last_trace_line = line_num
+    
+    # UE5 logs each marker twice (unreal.log + print) - record it once
+    entry = {'name': checkpoint_name, 'line': line_num, 'timestamp': timestamp_ms}
+    if not trace_info.checkpoints or trace_info.checkpoints[-1] != entry:
+        trace_info.checkpoints.append(entry)
+        if checkpoint_name.startswith('BATCH_'):
+            _track_batch_marker(checkpoint_name, timestamp_ms, trace_info)
+
+
+def _parse_span_marker(line, trace_info):
+    """Parse SPAN_BEGIN / SPAN_END markers"""
+    for prefix in ('[SPAN_BEGIN:', '[SPAN_END:'):
+        marker_start = line.find(prefix)
+        if marker_start != -1:
+            break
+    else:
+        return
+    marker_end = line.find(']', marker_start)
+    if marker_end == -1:
+        return
+    parts = line[marker_start + len(prefix):marker_end].split(':')
+    rest = line[marker_end+1:].strip()
+    
+    try:
+        if prefix == '[SPAN_BEGIN:':
+            if len(parts) >= 3:
+                _record_span_begin(trace_info, int(parts[0]), int(parts[1]), rest, float(parts[2]))
+            return
+        
+        # SPAN_END: name optionally followed by its attributes as JSON
+        attributes = {}
+        name = rest
+        split = rest.find(' {')
+        if split != -1:
+            try:
+                attributes = json.loads(rest[split+1:])
+                name = rest[:split]
+            except ValueError:
+                pass
+        if len(parts) >= 3:
+            _record_span_end(trace_info, int(parts[0]), name, float(parts[1]), parts[2], attributes)
+    except ValueError:
+        pass
+
+
+def _record_span_begin(trace_info, span_id, parent_id, name, timestamp_ms):
+    """Open one span (ids restart with every generator run - only open spans are looked up)"""
+    index = trace_info.open_spans.get(span_id)
+    if index is not None:
+        entry = trace_info.spans[index]
+        if entry['name'] == name and entry['start'] == timestamp_ms:
+            return  # Same marker logged twice (unreal.log + print)
+    
+    parent_index = trace_info.open_spans.get(parent_id) if parent_id else None
+    parent_path = trace_info.spans[parent_index]['path'] if parent_index is not None else ()
+    trace_info.open_spans[span_id] = len(trace_info.spans)
+    trace_info.spans.append({
+        'id': span_id,
+        'parent': parent_id,
+        'parent_index': parent_index,
+        'name': name,
+        'path': parent_path + (name,),
+        'start': timestamp_ms,
+        'end': None,
+        'status': None,
+        'attributes': {},
+    })
+
+
+def _record_span_end(trace_info, span_id, name, timestamp_ms, status, attributes):
+    """Close one span (a repeated SPAN_END finds it already closed)"""
+    index = trace_info.open_spans.pop(span_id, None)
+    if index is None:
+        return
+    entry = trace_info.spans[index]
+    entry['end'] = timestamp_ms
+    entry['status'] = status
+    entry['attributes'] = attributes or {}
+
+
+def apply_trace_event(event, trace_info):
+    """
+    Update trace_info with one structured event (trace_events.py)
+    
+    Raises:
+        KeyError: Required field missing
+    """
+    if event['type'] == 'trace':
+        _record_trace(trace_info, event['module'], int(event['line']), float(event['ms']),
+                      event.get('context') or "", event.get('status') or infer_status_from_context(event.get('context')))
+    elif event['type'] == 'checkpoint':
+        _record_checkpoint(trace_info, event['name'], int(event['line']), float(event['ms']))
+    elif event['type'] == 'span_begin':
+        _record_span_begin(trace_info, int(event['id']), int(event['parent']), event['name'], float(event['ms']))
+    elif event['type'] == 'span_end':
+        _record_span_end(trace_info, int(event['id']), event['name'], float(event['ms']),
+                         event.get('status') or "success", event.get('attributes'))
+
+
+def _new_batch_entry(trace_info, timestamp_ms):
+    # BATCH_MAP_START is already the last checkpoint when this runs
+    return {'status': 'running', 'start': timestamp_ms, 'end': None,
+            'traces': [len(trace_info.module_history), None],
+            'checkpoints': [len(trace_info.checkpoints) - 1, None]}
+
+
+def _track_batch_marker(checkpoint_name, timestamp_ms, trace_info):
+    """Track per-map markers emitted by Maps/batch_generate.py"""
+    parts = checkpoint_name.split(':')
+    if parts[0] == 'BATCH_MAP_START' and len(parts) >= 2:
+        trace_info.current_batch_map = parts[1]
+        trace_info.batch_maps[parts[1]] = _new_batch_entry(trace_info, timestamp_ms)
+    elif parts[0] == 'BATCH_MAP_END' and len(parts) >= 3:
+        entry = trace_info.batch_maps.get(parts[1])
+        if entry is None:
+            entry = trace_info.batch_maps[parts[1]] = _new_batch_entry(trace_info, timestamp_ms)
+        entry['status'] = parts[2]
+        entry['end'] = timestamp_ms
+        entry['traces'][1] = len(trace_info.module_history)
+        entry['checkpoints'][1] = len(trace_info.checkpoints)
+        trace_info.current_batch_map = None
+
+
+def _track_engine_status(record, trace_info, signals):
     """Track UE5 engine status"""
-    if 'LogAssetRegistry' in line and 'cache written' in line:
+    if record.category == 'LogAssetRegistry' and 'cache written' in record.message:
         trace_info.last_function = "UE5引擎 - 保存资产注册表缓存（脚本已完成）"
-    elif 'LogContentValidation' in line and 'Starting to validate' in line:
+    elif record.category == 'LogContentValidation' and 'Starting to validate' in record.message:
         trace_info.last_function = "UE5引擎 - 验证资产（脚本已完成，正在清理）"
-    elif 'LogRenderer' in line and 'Warning' in line:
+    elif record.category == 'LogRenderer' and record.verbosity == 'Warning':
         trace_info.last_function = "UE5引擎 - 渲染器警告（脚本已完成，正在退出）"
 
 
@@ -216,29 +403,7 @@ def _track_progress(line, trace_info):
 
 def _track_function(line, trace_info):
     """Track last executed function"""
-    function_markers = {
-        'Preparing level': "create_new_level() - 准备Level",
-        'Map exists, loading': "create_new_level() - 加载现有地图",
-        'Getting world reference': "create_new_level() - 获取World引用",
-        'Map loaded, will regenerate': "create_new_level() - 地图加载完成",
-        'Level ready': "create_new_level() - Level准备完成",
-        'Creating training room': "place_training_room() - 开始创建训练室",
-        'Loading cube mesh': "place_training_room() - 加载Cube网格",
-        'Loading plane mesh': "place_training_room() - 加载Plane网格",
-        'Training room geometry created': "place_training_room() - 训练室创建完成",
-        'Placing PlayerStart': "place_player_start() - 放置PlayerStart",
-        'PlayerStart placed': "place_player_start() - PlayerStart放置完成",
-        'Setting up lighting': "setup_lighting() - 设置照明",
-        'Lighting system configured': "setup_lighting() - 照明系统配置完成",
-        'Configuring GameMode': "configure_game_mode() - 配置GameMode",
-        'GameMode set to': "configure_game_mode() - GameMode设置完成",
-        'Saving map': "save_map() - 保存地图",
-        'Map saved successfully': "save_map() - 地图保存成功",
-        'Map generation completed': "generate_map() - 地图生成完成",
-        'STARTING MAP GENERATOR': "main() - 脚本启动"
-    }
-    
-    for marker, function in function_markers.items():
+    for marker, function in FUNCTION_MARKERS.items():
         if marker in line:
             trace_info.last_function = function
             break
@@ -276,5 +441,12 @@ def _track_actors(line, trace_info):
         trace_info.assets_failed += 1
 
 
+# Category -> handlers: each record only reaches the handlers of its category
+TRACE_HANDLERS = RecordDispatcher()
+TRACE_HANDLERS.register('LogPython', _handle_python)
+TRACE_HANDLERS.register(COMPILE_CATEGORIES, _handle_compile)
+TRACE_HANDLERS.register(['LogAssetRegistry', 'LogContentValidation', 'LogRenderer'], _track_engine_status)
+
+
 # extract_detailed_trace() function removed - no longer needed!
 # All trace information is now captured in real-time by _parse_trace_marker()
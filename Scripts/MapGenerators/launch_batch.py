@@ -0,0 +1,28 @@
+"""
+Launch Generator (Batch) - Entry Point
+Regenerates several maps inside ONE UE5 editor session (editor startup is paid once)
+
+The batch launcher lives in Tools/launch_generator/batch_main.py,
+the in-editor side in Maps/batch_generate.py
+
+Usage:
+    python launch_batch.py [map_name ...]
+    
+    Example:
+        python launch_batch.py
+        python launch_batch.py cosmos_002_training_world other_map
+"""
+
+import sys
+from pathlib import Path
+
+# Add Tools/launch_generator to path
+tools_dir = Path(__file__).parent / "Tools" / "launch_generator"
+sys.path.insert(0, str(tools_dir))
+
+# Import and run main
+from batch_main import main
+
+# Run main
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Launch Generator (Daemon) - Entry Point
+Keeps one UE5 editor running and regenerates maps in it on request,
+so iterating on a generator module takes seconds instead of a full editor boot
+
+The daemon lives in Tools/launch_generator/editor_daemon.py,
+the in-editor job side in Maps/map_job.py
+
+Usage:
+    python launch_daemon.py [map_name ...] [--exit]
+    
+    Example:
+        python launch_daemon.py cosmos_002_training_world
+        (edit generator code, then press Enter to regenerate)
+"""
+
+import sys
+from pathlib import Path
+
+# Add Tools/launch_generator to path
+tools_dir = Path(__file__).parent / "Tools" / "launch_generator"
+sys.path.insert(0, str(tools_dir))
+
+# Import and run main
+from daemon_main import main
+
+# Run main
+if __name__ == "__main__":
+    sys.exit(main())
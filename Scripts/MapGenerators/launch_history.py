@@ -0,0 +1,30 @@
+"""
+Launch Generator (History) - Entry Point
+Reports over the run-history database every launcher mode writes to
+(Saved/MapGenerators/run_history.db): recent runs, step trends,
+percentiles and regressions against a baseline
+
+The reports live in Tools/launch_generator/history_cli.py
+
+Usage:
+    python launch_history.py list [map_name] [-n 20]
+    python launch_history.py trend|percentile map_name
+    python launch_history.py regression map_name [--baseline 10] [--recent 5] [--threshold 20]
+    
+    Example:
+        python launch_history.py regression cosmos_002_training_world
+"""
+
+import sys
+from pathlib import Path
+
+# Add Tools/launch_generator to path
+tools_dir = Path(__file__).parent / "Tools" / "launch_generator"
+sys.path.insert(0, str(tools_dir))
+
+# Import and run main
+from history_cli import main
+
+# Run main
+if __name__ == "__main__":
+    sys.exit(main())
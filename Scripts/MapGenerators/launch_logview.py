@@ -0,0 +1,32 @@
+"""
+Launch Generator (Log Viewer) - Entry Point
+Random access to the saved full UE5 log (ue5_full_log.txt[.zst|.gz]):
+context around an error, the lines between two checkpoints, one log category
+
+The viewer lives in Tools/launch_generator/log_viewer.py
+
+Usage:
+    python launch_logview.py error [-n 1] [-C 20]
+    python launch_logview.py between CHECKPOINT_A CHECKPOINT_B
+    python launch_logview.py category LogPython [--limit 200]
+    python launch_logview.py checkpoints | lines START [END]
+    
+    Options: --log path | --map map_name, --rebuild
+    
+    Example:
+        python launch_logview.py error -C 40 --map cosmos_002_training_world
+"""
+
+import sys
+from pathlib import Path
+
+# Add Tools/launch_generator to path
+tools_dir = Path(__file__).parent / "Tools" / "launch_generator"
+sys.path.insert(0, str(tools_dir))
+
+# Import and run main
+from log_viewer import main
+
+# Run main
+if __name__ == "__main__":
+    sys.exit(main())
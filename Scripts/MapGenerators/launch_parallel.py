@@ -0,0 +1,27 @@
+"""
+Launch Generator (Parallel) - Entry Point
+Regenerates several maps concurrently, each in its own UE5 instance
+
+The asyncio launcher core lives in Tools/launch_generator/async_runner.py
+
+Usage:
+    python launch_parallel.py [map_name ...] [-j N]
+    
+    Example:
+        python launch_parallel.py -j 4
+        python launch_parallel.py cosmos_002_training_world other_map -j 2
+"""
+
+import sys
+from pathlib import Path
+
+# Add Tools/launch_generator to path
+tools_dir = Path(__file__).parent / "Tools" / "launch_generator"
+sys.path.insert(0, str(tools_dir))
+
+# Import and run main
+from parallel_main import main
+
+# Run main
+if __name__ == "__main__":
+    sys.exit(main())